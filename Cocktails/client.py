@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Final, Iterable, List, Optional, Tuple, Union
+
+import requests
+from models.drink import Drink, DrinkList
+from pydantic import ValidationError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+API_KEY: Final = "1"  # dev API key
+DEFAULT_CACHE_TTL: Final = 60 * 60
+DEFAULT_MAX_ENTRIES: Final = 1024
+DEFAULT_CONCURRENCY: Final = 8
+
+
+def base_url(api_key: str = API_KEY) -> str:
+    return f"https://www.thecocktaildb.com/api/json/v1/{api_key}"
+
+
+class CocktailError(Exception):
+    """
+    thecocktaildb answered with something that isn't a drink list
+    """
+
+
+class CocktailClient:
+    """
+    thecocktaildb client over one pooled session. Idempotent GETs are retried on
+    connection errors and 5xx responses, and parsed results are kept in an LRU
+    cache for `cache_ttl` seconds (`None` keeps them until evicted).
+    """
+
+    def __init__(
+        self,
+        api_key: str = API_KEY,
+        cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        pool_size: int = 10,
+        retries: int = 3,
+        timeout: float = 10.0,
+    ):
+        self.base_url = base_url(api_key)
+        self.cache_ttl = cache_ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._cache: OrderedDict[Tuple[str, str, str], Tuple[float, DrinkList]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.2,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self) -> "CocktailClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def search_by_name(self, name: str) -> List[Drink]:
+        return self._get("search.php", "s", name).drinks
+
+    def search_by_first_letter(self, letter: str) -> List[Drink]:
+        return self._get("search.php", "f", letter).drinks
+
+    def filter_by_ingredient(self, ingredient: str) -> List[Drink]:
+        """
+        Drinks containing `ingredient`, with id and name only
+        """
+        return self._get("filter.php", "i", ingredient).drinks
+
+    def lookup(self, drink_id: str) -> Optional[Drink]:
+        """
+        Full details for one drink, or None if the id is unknown
+        """
+        drinks = self._get("lookup.php", "i", drink_id).drinks
+        return drinks[0] if drinks else None
+
+    def hydrate(
+        self,
+        drinks: Union[DrinkList, Iterable[Drink]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        failed: Optional[Dict[str, Exception]] = None,
+    ) -> List[Drink]:
+        """
+        Replaces partial drinks (e.g. from filter_by_ingredient) with their full
+        details, in the same order. Each distinct id is looked up once, at most
+        `concurrency` at a time, and through the cache. Drinks whose lookup finds
+        nothing are returned as they were.
+
+        A lookup that raises doesn't stop the others: its drinks are returned as
+        they were too, and the error is stored under the id in `failed` if given.
+        """
+        if isinstance(drinks, DrinkList):
+            drinks = drinks.drinks
+        drinks = list(drinks)
+        ids = list(dict.fromkeys(drink.id for drink in drinks))
+
+        details: Dict[str, Optional[Drink]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {
+                drink_id: executor.submit(self.lookup, drink_id) for drink_id in ids
+            }
+            for drink_id, future in futures.items():
+                try:
+                    details[drink_id] = future.result()
+                except (requests.RequestException, CocktailError) as e:
+                    logger.warning("Lookup of drink %s failed: %s", drink_id, e)
+                    details[drink_id] = None
+                    if failed is not None:
+                        failed[drink_id] = e
+        return [details[drink.id] or drink for drink in drinks]
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _get(self, endpoint: str, param: str, value: str) -> DrinkList:
+        key = (endpoint, param, value.strip().casefold())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                stored_at, drinks = cached
+                if self.cache_ttl is None or time.time() - stored_at < self.cache_ttl:
+                    self._cache.move_to_end(key)
+                    return drinks
+                del self._cache[key]
+
+        response = self.session.get(
+            f"{self.base_url}/{endpoint}",
+            params={param: value},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        # Unknown ingredients come back as an empty body rather than JSON
+        if not response.content.strip():
+            drinks = DrinkList(drinks=[])
+        else:
+            try:
+                drinks = DrinkList.model_validate_json(response.content)
+            except ValidationError as e:
+                raise CocktailError(f"Unexpected response from {endpoint}") from e
+
+        with self._lock:
+            self._cache[key] = (time.time(), drinks)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return drinks
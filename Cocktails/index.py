@@ -0,0 +1,119 @@
+import argparse
+import json
+import string
+from bisect import bisect_left, insort
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Final, Iterable, List, Optional, Set, Tuple
+
+from client import CocktailClient
+from models.drink import Drink
+
+# search.php?f= accepts letters and digits; together they cover the whole catalog
+CRAWL_KEYS: Final = string.ascii_lowercase + string.digits
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class DrinkIndex:
+    """
+    Local inverted index over full drink records: ingredient -> drink ids, plus
+    drink names kept sorted so a name prefix is a binary search. Lookups never
+    touch the network, and multi-ingredient queries are set intersections.
+    """
+
+    def __init__(self, drinks: Iterable[Drink] = ()):
+        self.drinks: Dict[str, Drink] = {}
+        self._by_ingredient: Dict[str, Set[str]] = {}
+        self._names: List[Tuple[str, str]] = []
+        for drink in drinks:
+            self.add(drink)
+
+    def __len__(self) -> int:
+        return len(self.drinks)
+
+    def __contains__(self, drink_id: str) -> bool:
+        return drink_id in self.drinks
+
+    def add(self, drink: Drink) -> None:
+        if drink.id in self.drinks:
+            self.remove(drink.id)
+        self.drinks[drink.id] = drink
+        for ingredient in drink.ingredients:
+            self._by_ingredient.setdefault(normalize(ingredient), set()).add(drink.id)
+        insort(self._names, (normalize(drink.name), drink.id))
+
+    def remove(self, drink_id: str) -> None:
+        drink = self.drinks.pop(drink_id)
+        for ingredient in drink.ingredients:
+            ids = self._by_ingredient[normalize(ingredient)]
+            ids.discard(drink_id)
+            if not ids:
+                del self._by_ingredient[normalize(ingredient)]
+        self._names.remove((normalize(drink.name), drink_id))
+
+    @property
+    def ingredients(self) -> List[str]:
+        return sorted(self._by_ingredient)
+
+    def by_ingredients(self, *ingredients: str) -> List[Drink]:
+        """
+        Drinks containing every one of `ingredients` ("gin" AND "lime"), by name
+        """
+        if not ingredients:
+            return []
+        matches = sorted(
+            (self._by_ingredient.get(normalize(i), set()) for i in ingredients),
+            key=len,
+        )
+        ids = set.intersection(*matches)
+        return sorted((self.drinks[i] for i in ids), key=lambda d: normalize(d.name))
+
+    def by_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Drink]:
+        """
+        Drinks whose name starts with `prefix`, in name order
+        """
+        prefix = normalize(prefix)
+        start = bisect_left(self._names, (prefix, ""))
+        results = []
+        for name, drink_id in islice(self._names, start, None):
+            if not name.startswith(prefix) or len(results) == limit:
+                break
+            results.append(self.drinks[drink_id])
+        return results
+
+    def save(self, path: str | Path) -> None:
+        records = [drink.model_dump(by_alias=True) for drink in self.drinks.values()]
+        Path(path).write_text(json.dumps(records), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "DrinkIndex":
+        records = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(Drink.model_validate(record) for record in records)
+
+
+def crawl(client: CocktailClient, keys: Iterable[str] = CRAWL_KEYS) -> DrinkIndex:
+    """
+    Builds a DrinkIndex of the full catalog with one search.php?f= request per
+    first letter (36 requests), instead of one request per later query
+    """
+    index = DrinkIndex()
+    for key in keys:
+        for drink in client.search_by_first_letter(key):
+            index.add(drink)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Crawl thecocktaildb into a local drink index"
+    )
+    parser.add_argument("path", help="Where to write the index (JSON).")
+    args = parser.parse_args()
+
+    with CocktailClient() as client:
+        index = crawl(client)
+    index.save(args.path)
+    print(f"Indexed {len(index)} drinks and {len(index.ingredients)} ingredients")
@@ -1,27 +1,23 @@
-import requests
-from models.drink import DrinkList
+from client import CocktailClient
 
-API_KEY = "1"  # dev API key
-SEARCH_URL = f"https://www.thecocktaildb.com/api/json/v1/{API_KEY}/search.php"
-FILTER_URL = f"https://www.thecocktaildb.com/api/json/v1/{API_KEY}/filter.php"
 
-
-def search_cocktail_by_name(name):
-    response = requests.get(url=SEARCH_URL, params={"s": name})
-    r_dict = response.json()
-    d_list = DrinkList(**r_dict)
-    for d in d_list.drinks:
+def search_cocktail_by_name(name, client: CocktailClient = None):
+    if client is None:
+        with CocktailClient() as client:
+            return search_cocktail_by_name(name, client)
+    for d in client.search_by_name(name):
         print(f"Mmm... a tasty {d.name}.")
 
 
-def search_by_ingredient(ingredient_name):
-    response = requests.get(url=FILTER_URL, params={"i": ingredient_name})
-    r_dict = response.json()
-    d_list = DrinkList(**r_dict)
-    for d in d_list.drinks[:5]:
+def search_by_ingredient(ingredient_name, client: CocktailClient = None):
+    if client is None:
+        with CocktailClient() as client:
+            return search_by_ingredient(ingredient_name, client)
+    for d in client.filter_by_ingredient(ingredient_name)[:5]:
         print(f"I love me a {d.name}")
 
 
 if __name__ == "__main__":
-    # search_cocktail_by_name("manhattan")
-    search_by_ingredient("Gin")
+    with CocktailClient() as client:
+        # search_cocktail_by_name("manhattan", client)
+        search_by_ingredient("Gin", client)
@@ -1,6 +1,9 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# thecocktaildb spreads ingredients over strIngredient1 ... strIngredient15
+MAX_INGREDIENTS = 15
 
 
 class Drink(BaseModel):
@@ -8,7 +11,27 @@ class Drink(BaseModel):
     name: Annotated[str, Field(alias="strDrink")]
     tags: Annotated[Optional[str], Field(alias="strTags")] = None
     glass: Annotated[Optional[str], Field(alias="strGlass")] = None
+    # Only present in full drink details (search.php, lookup.php), not filter.php
+    ingredients: List[str] = []
+
+    @model_validator(mode="before")
+    @classmethod
+    def collect_ingredients(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or "ingredients" in data:
+            return data
+        ingredients = [
+            data[key].strip()
+            for key in (f"strIngredient{i}" for i in range(1, MAX_INGREDIENTS + 1))
+            if data.get(key) and data[key].strip()
+        ]
+        return {**data, "ingredients": ingredients}
 
 
 class DrinkList(BaseModel):
     drinks: List[Drink]
+
+    @field_validator("drinks", mode="before")
+    @classmethod
+    def no_results(cls, drinks: Any) -> Any:
+        # Empty searches come back as null, or as "None Found" from filter.php
+        return drinks if isinstance(drinks, list) else []
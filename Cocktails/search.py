@@ -0,0 +1,100 @@
+import heapq
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Final, FrozenSet, Iterable, List
+
+from index import DrinkIndex
+from models.drink import Drink
+
+DEFAULT_LIMIT: Final = 10
+# Below this Dice similarity a match is noise ("gin" vs "margarita")
+DEFAULT_MIN_SCORE: Final = 0.3
+# Names starting with the query rank first, which is what autocomplete expects
+PREFIX_BONUS: Final = 0.5
+
+
+def fold(text: str) -> str:
+    """
+    Lowercases and strips accents, so "Piña Colada" matches "pina colada"
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Trigrams of each word, padded so that word starts weigh more and one-letter
+    and two-letter queries still produce trigrams
+    """
+    grams = set()
+    for word in fold(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass(frozen=True)
+class Match:
+    drink: Drink
+    score: float
+
+
+class FuzzySearch:
+    """
+    Typo-tolerant name search over a local catalog. Names are broken into
+    trigrams once, up front; a query only touches the postings of its own
+    trigrams and ranks candidates by Dice similarity, with a bonus for names that
+    start with the query. "manhatan" finds Manhattan without any API traffic.
+    """
+
+    def __init__(self, drinks: Iterable[Drink] = ()):
+        self._drinks: List[Drink] = []
+        self._folded: List[str] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for drink in drinks:
+            self.add(drink)
+
+    @classmethod
+    def from_index(cls, index: DrinkIndex) -> "FuzzySearch":
+        return cls(index.drinks.values())
+
+    def __len__(self) -> int:
+        return len(self._drinks)
+
+    def add(self, drink: Drink) -> None:
+        doc = len(self._drinks)
+        grams = trigrams(drink.name)
+        self._drinks.append(drink)
+        self._folded.append(" ".join(fold(drink.name).split()))
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(doc)
+
+    def search(
+        self,
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        min_score: float = DEFAULT_MIN_SCORE,
+    ) -> List[Match]:
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._postings.get(gram, ()))
+
+        prefix = " ".join(fold(query).split())
+        scored = []
+        for doc, shared in hits.items():
+            score = 2 * shared / (len(grams) + self._sizes[doc])
+            if self._folded[doc].startswith(prefix):
+                score += PREFIX_BONUS
+            if score >= min_score:
+                scored.append((score, -doc))
+
+        # Ties go to the drink added first
+        best = heapq.nlargest(limit, scored)
+        return [Match(drink=self._drinks[-neg], score=score) for score, neg in best]
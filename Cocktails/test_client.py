@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+import responses
+
+# Add the current directory to the path so we can import client
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from client import CocktailClient
+from models.drink import DrinkList
+from test_index import CATALOG, LOOKUP_URL, SEARCH_URL
+
+
+class TestCocktailClient(unittest.TestCase):
+    @responses.activate
+    def test_responses_are_cached(self):
+        responses.add(responses.GET, SEARCH_URL, json={"drinks": CATALOG[:1]})
+
+        with CocktailClient() as client:
+            first = client.search_by_name("Gimlet")
+            second = client.search_by_name(" gimlet")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_hydrate_dedups_and_keeps_order(self):
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def lookup_callback(request):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            drink_id = parse_qs(urlsplit(request.url).query)["i"][0]
+            drinks = [d for d in CATALOG if d["idDrink"] == drink_id]
+            return 200, {}, json.dumps({"drinks": drinks or None})
+
+        responses.add_callback(responses.GET, LOOKUP_URL, callback=lookup_callback)
+        partial = DrinkList(
+            drinks=[
+                {"idDrink": id, "strDrink": f"Drink {id}"}
+                for id in ["3", "1", "3", "2", "404", "5", "4"]
+            ]
+        )
+
+        with CocktailClient() as client:
+            drinks = client.hydrate(partial, concurrency=2)
+
+        self.assertEqual([d.id for d in drinks], ["3", "1", "3", "2", "404", "5", "4"])
+        self.assertEqual(drinks[0].name, "Margarita")
+        self.assertEqual(drinks[0].glass, "Cocktail glass")
+        # Unknown ids keep their partial record
+        self.assertEqual(drinks[4].name, "Drink 404")
+        self.assertEqual(len(responses.calls), 6)
+        self.assertEqual(max_in_flight, 2)
+
+    @responses.activate
+    def test_hydrate_reports_failed_lookups(self):
+        def lookup_callback(request):
+            drink_id = parse_qs(urlsplit(request.url).query)["i"][0]
+            if drink_id == "2":
+                raise requests.ConnectionError("connection reset")
+            drinks = [d for d in CATALOG if d["idDrink"] == drink_id]
+            return 200, {}, json.dumps({"drinks": drinks or None})
+
+        responses.add_callback(responses.GET, LOOKUP_URL, callback=lookup_callback)
+        partial = DrinkList(
+            drinks=[{"idDrink": id, "strDrink": f"Drink {id}"} for id in "123"]
+        )
+
+        failed = {}
+        with CocktailClient(retries=0) as client:
+            drinks = client.hydrate(partial, failed=failed)
+
+        self.assertEqual([d.name for d in drinks], ["Gimlet", "Drink 2", "Margarita"])
+        self.assertEqual(list(failed), ["2"])
+        self.assertIsInstance(failed["2"], requests.ConnectionError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+# Add the current directory to the path so we can import index
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from client import CocktailClient, base_url
+from index import DrinkIndex, crawl
+from models.drink import Drink, DrinkList
+
+SEARCH_URL = f"{base_url()}/search.php"
+LOOKUP_URL = f"{base_url()}/lookup.php"
+
+
+def make_drink(id, name, *ingredients):
+    drink = {"idDrink": id, "strDrink": name, "strGlass": "Cocktail glass"}
+    for i, ingredient in enumerate(ingredients, start=1):
+        drink[f"strIngredient{i}"] = ingredient
+    drink[f"strIngredient{len(ingredients) + 1}"] = None
+    return drink
+
+
+CATALOG = [
+    make_drink("1", "Gimlet", "Gin", "Lime juice", "Sugar syrup"),
+    make_drink("2", "Gin Fizz", "Gin", "Lemon", "Powdered sugar", "Carbonated water"),
+    make_drink("3", "Margarita", "Tequila", "Triple sec", "Lime juice", "Salt"),
+    make_drink("4", "Gin Sour", "Gin", "Lemon juice", "Sugar"),
+    make_drink("5", "Mojito", "Light rum", "Lime", "Sugar", "Mint", "Soda water"),
+]
+
+
+def first_letter_callback(request):
+    letter = parse_qs(urlsplit(request.url).query)["f"][0]
+    drinks = [d for d in CATALOG if d["strDrink"].lower().startswith(letter)]
+    # Like the real API, letters without drinks answer with null
+    return 200, {}, json.dumps({"drinks": drinks or None})
+
+
+class TestModels(unittest.TestCase):
+    def test_ingredients_are_collected(self):
+        drink = Drink(**CATALOG[0])
+        self.assertEqual(drink.ingredients, ["Gin", "Lime juice", "Sugar syrup"])
+
+    def test_empty_results(self):
+        self.assertEqual(DrinkList(drinks=None).drinks, [])
+        self.assertEqual(DrinkList(drinks="None Found").drinks, [])
+
+
+class TestDrinkIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = DrinkIndex(Drink(**drink) for drink in CATALOG)
+
+    def test_ingredient_intersection(self):
+        gin = [d.name for d in self.index.by_ingredients("gin")]
+        self.assertEqual(gin, ["Gimlet", "Gin Fizz", "Gin Sour"])
+        both = self.index.by_ingredients("GIN", "lime juice")
+        self.assertEqual([d.name for d in both], ["Gimlet"])
+        self.assertEqual(self.index.by_ingredients("gin", "mint"), [])
+
+    def test_name_prefix(self):
+        names = [d.name for d in self.index.by_prefix("gi")]
+        self.assertEqual(names, ["Gimlet", "Gin Fizz", "Gin Sour"])
+        self.assertEqual(
+            [d.name for d in self.index.by_prefix("Gin ", limit=1)], ["Gin Fizz"]
+        )
+        self.assertEqual(self.index.by_prefix("x"), [])
+
+    def test_readding_a_drink_replaces_it(self):
+        self.index.add(Drink(**make_drink("1", "Gimlet", "Vodka", "Lime juice")))
+        self.assertEqual(len(self.index), 5)
+        self.assertNotIn("1", {d.id for d in self.index.by_ingredients("gin")})
+        self.assertEqual(len(self.index.by_prefix("gimlet")), 1)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "drinks.json")
+            self.index.save(path)
+            loaded = DrinkIndex.load(path)
+        self.assertEqual(loaded.drinks, self.index.drinks)
+        self.assertEqual(loaded.ingredients, self.index.ingredients)
+
+
+class TestCrawl(unittest.TestCase):
+    @responses.activate
+    def test_crawl_builds_full_index(self):
+        responses.add_callback(
+            responses.GET, SEARCH_URL, callback=first_letter_callback
+        )
+
+        with CocktailClient() as client:
+            index = crawl(client)
+
+        self.assertEqual(len(index), len(CATALOG))
+        self.assertEqual(len(responses.calls), 36)
+        self.assertEqual(
+            [d.name for d in index.by_ingredients("lime juice")],
+            ["Gimlet", "Margarita"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import unittest
+
+# Add the current directory to the path so we can import search
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.drink import Drink
+from search import FuzzySearch, trigrams
+
+NAMES = [
+    "Manhattan",
+    "Margarita",
+    "Martini",
+    "Gin Fizz",
+    "Gin Sour",
+    "Piña Colada",
+    "Old Fashioned",
+    "Mojito",
+    "Moscow Mule",
+]
+
+
+def make_catalog(names):
+    return [Drink(idDrink=str(i), strDrink=name) for i, name in enumerate(names)]
+
+
+class TestFuzzySearch(unittest.TestCase):
+    def setUp(self):
+        self.search = FuzzySearch(make_catalog(NAMES))
+
+    def names(self, query, **kwargs):
+        return [match.drink.name for match in self.search.search(query, **kwargs)]
+
+    def test_typos(self):
+        self.assertEqual(self.names("manhatan")[0], "Manhattan")
+        self.assertEqual(self.names("margeritta")[0], "Margarita")
+        self.assertEqual(self.names("old fashoned")[0], "Old Fashioned")
+
+    def test_autocomplete_prefers_prefixes(self):
+        # Shorter names are closer to a short query, but any prefix beats Manhattan
+        self.assertEqual(self.names("mar", limit=2), ["Martini", "Margarita"])
+        self.assertEqual(set(self.names("gin", limit=2)), {"Gin Fizz", "Gin Sour"})
+
+    def test_word_and_accent_matches(self):
+        self.assertEqual(self.names("fizz")[0], "Gin Fizz")
+        self.assertEqual(self.names("pina colada")[0], "Piña Colada")
+
+    def test_no_match(self):
+        self.assertEqual(self.names("zzzz"), [])
+        self.assertEqual(self.names("   "), [])
+
+    def test_trigrams_are_padded(self):
+        self.assertEqual(trigrams("Ab"), {"  a", " ab", "ab "})
+
+    # Wall-clock budgets depend on the machine, so only check them on request
+    @unittest.skipUnless(os.getenv("COCKTAILS_TIMING_TESTS"), "timing tests are off")
+    def test_interactive_latency(self):
+        words = ["Blue", "Red", "Spiced", "Frozen", "Classic", "Royal", "Dirty"]
+        names = [f"{w} {n} {i}" for i in range(10) for w in words for n in NAMES]
+        search = FuzzySearch(make_catalog(names))
+        self.assertEqual(len(search), 630)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            search.search("manhatan")
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+
+if __name__ == "__main__":
+    unittest.main()
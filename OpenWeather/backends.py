@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Final, Optional
+
+import requests
+from cache import canonical_location_key
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Loaded here rather than in main, so importing any client reads the .env file
+load_dotenv()
+
+DEFAULT_BASE_URL: Final = "http://api.weatherstack.com/current"
+# Overridable so the CLI and batch jobs can be pointed at a stub server
+BASE_URL: Final = os.getenv("WEATHERSTACK_BASE_URL", DEFAULT_BASE_URL)
+
+
+class WeatherBackend(ABC):
+    """
+    Source of current weather. Backends answer a Weatherstack query string
+    ("London" or "London;48.85,2.35") with a Weatherstack-shaped JSON body, so
+    callers parse every provider's answers the same way.
+    """
+
+    def __enter__(self) -> "WeatherBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @abstractmethod
+    def request(self, query: str) -> bytes:
+        """
+        Returns the raw response body. HTTP failures raise
+        requests.RequestException; API errors are returned in the body.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class WeatherstackBackend(WeatherBackend):
+    """
+    The Weatherstack API (or anything that speaks its protocol at `base_url`,
+    such as stub_server.StubServer), over one pooled session
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: float = 10.0,
+        pool_size: int = 10,
+    ):
+        self.api_key = api_key or os.getenv("WEATHERSTACK_API_KEY")
+        if not self.api_key:
+            raise ValueError("Missing WEATHERSTACK_API_KEY in .env file.")
+
+        # Read per instance, so an override set after import still applies
+        self.base_url = base_url or os.getenv("WEATHERSTACK_BASE_URL", DEFAULT_BASE_URL)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, query: str) -> bytes:
+        response = self.session.get(
+            self.base_url,
+            params={"access_key": self.api_key, "query": query},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.content
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class RecordingBackend(WeatherBackend):
+    """
+    Passes requests through to `backend` and appends every successful answer to a
+    JSON lines file, one line per location, for stub_server to replay later
+    """
+
+    def __init__(self, backend: WeatherBackend, path: str | Path):
+        self.backend = backend
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def request(self, query: str) -> bytes:
+        body = self.backend.request(query)
+        data = json.loads(body)
+        if data.get("success", True) is False:
+            return body
+
+        locations, currents = data["location"], data["current"]
+        if not isinstance(locations, list):
+            locations, currents = [locations], [currents]
+        lines = [
+            json.dumps({"query": part, "location": location, "current": current})
+            for part, location, current in zip(query.split(";"), locations, currents)
+        ]
+        with self._lock, self.path.open("a", encoding="utf-8") as recording:
+            recording.write("".join(f"{line}\n" for line in lines))
+        return body
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def load_recordings(path: str | Path) -> Dict[str, dict]:
+    """
+    Reads a RecordingBackend file into {canonical location key: response}.
+    Later recordings of the same location win.
+    """
+    recordings = {}
+    with Path(path).open(encoding="utf-8") as lines:
+        for line in lines:
+            if line.strip():
+                record = json.loads(line)
+                recordings[canonical_location_key(record.pop("query"))] = record
+    return recordings
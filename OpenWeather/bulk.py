@@ -0,0 +1,272 @@
+import json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Dict, Final, Iterable, Iterator, List, Optional
+
+import requests
+from backends import WeatherBackend, WeatherstackBackend
+from cache import WeatherCache, canonical_location_key
+from locations import LocationIndex
+from models.current_weather import WeatherstackError, WeatherstackResponse
+from pydantic import ValidationError
+from unidecode import unidecode
+
+# Weatherstack caps bulk queries at 50 locations on the plans that allow them
+DEFAULT_BATCH_SIZE: Final = 50
+DEFAULT_CONCURRENCY: Final = 8
+BULK_NOT_SUPPORTED: Final = 604
+# Errors caused by one bad location, which would otherwise fail the whole batch
+LOCATION_ERRORS: Final = frozenset({601, 615})
+
+
+@dataclass
+class LocationResult:
+    """
+    Outcome for one requested location: exactly one of `response` or `error`
+    """
+
+    query: str
+    response: Optional[WeatherstackResponse] = None
+    error: Optional[WeatherstackError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None
+
+
+def _client_error(info: str) -> WeatherstackError:
+    # Not a Weatherstack error code; marks failures that happened on our side
+    return WeatherstackError(code=0, type="client_error", info=info)
+
+
+def _as_list(value) -> List:
+    return value if isinstance(value, list) else [value]
+
+
+def split_response(queries: List[str], data: dict) -> List[LocationResult]:
+    """
+    Splits a (possibly multi-location) response into one result per query.
+    Weatherstack answers a bulk query with parallel lists in query order. A body
+    of any other shape becomes a client error for every query.
+    """
+    try:
+        if data.get("success", True) is False:
+            error = WeatherstackError.model_validate(data["error"])
+            return [LocationResult(query=q, error=error) for q in queries]
+
+        locations = _as_list(data["location"])
+        currents = _as_list(data["current"])
+        requests_ = _as_list(data.get("request"))
+    except (AttributeError, KeyError, TypeError, ValidationError) as e:
+        error = _client_error(f"Unexpected response: {e!r}")
+        return [LocationResult(query=q, error=error) for q in queries]
+    requests_ += [None] * (len(queries) - len(requests_))
+
+    results = []
+    for i, query in enumerate(queries):
+        if i >= len(locations) or i >= len(currents):
+            results.append(
+                LocationResult(query=query, error=_client_error("Missing in response"))
+            )
+            continue
+        try:
+            response = WeatherstackResponse(
+                request=requests_[i], location=locations[i], current=currents[i]
+            )
+        except ValidationError as e:
+            results.append(LocationResult(query=query, error=_client_error(str(e))))
+        else:
+            results.append(LocationResult(query=query, response=response))
+    return results
+
+
+class BulkWeatherClient:
+    """
+    Fetches current weather for many locations. Locations are grouped into
+    provider-sized batches that are sent concurrently over one pooled session.
+    If the plan rejects bulk queries, the client falls back to one location
+    per request for the rest of its lifetime.
+
+    With a `cache`, locations are looked up by canonical key first and only misses
+    are sent upstream. Stale hits are served immediately and refreshed together in
+    one background batch.
+
+    With a `locations` index, locations resolved before are sent by coordinates,
+    so differently spelled inputs for one place are fetched (and cached) once.
+
+    Requests go to Weatherstack unless another `backend` is given, e.g. a
+    WeatherstackBackend pointed at a stub_server.StubServer.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = 10.0,
+        cache: Optional[WeatherCache] = None,
+        locations: Optional[LocationIndex] = None,
+        backend: Optional[WeatherBackend] = None,
+    ):
+        # A backend passed in is left open for its owner to close
+        self._owns_backend = backend is None
+        if backend is None:
+            backend = WeatherstackBackend(
+                api_key=api_key, timeout=timeout, pool_size=concurrency
+            )
+        self.backend = backend
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.cache = cache
+        self.locations = locations
+
+    def __enter__(self) -> "BulkWeatherClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_backend:
+            self.backend.close()
+
+    def get_weather(self, locations: Iterable[str]) -> Iterator[LocationResult]:
+        """
+        Yields a LocationResult per location as soon as its batch completes, so
+        results arrive in completion order rather than input order. At most
+        `concurrency` batches are in flight, so `locations` may be a lazy stream.
+        """
+        queries = (unidecode(location).strip() for location in locations)
+        batches = self._batches(q for q in queries if q)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending: Dict[Future, List[str]] = {}
+
+            def submit(batch: List[str]) -> None:
+                pending[executor.submit(self._fetch_batch, batch)] = batch
+
+            for batch in islice(batches, self.concurrency):
+                submit(batch)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    yield from future.result()
+                    for batch in islice(batches, 1):
+                        submit(batch)
+
+    def fetch_batch(self, locations: List[str]) -> List[LocationResult]:
+        """
+        Fetches one batch (at most `batch_size` locations) on the calling thread,
+        for callers that schedule batches themselves
+        """
+        return self._fetch_batch(
+            [unidecode(location).strip() for location in locations]
+        )
+
+    def _batches(self, queries: Iterable[str]) -> Iterator[List[str]]:
+        queries = iter(queries)
+        while batch := list(islice(queries, self.batch_size)):
+            yield batch
+
+    def _fetch_batch(self, queries: List[str]) -> List[LocationResult]:
+        if self.locations is None:
+            return self._fetch_cached(queries)
+
+        # Spellings that resolve to the same place are sent upstream once
+        sent, upstream = {}, {}
+        for query, resolved in zip(queries, self.locations.resolve_all(queries)):
+            key = canonical_location_key(resolved)
+            sent[query] = upstream.setdefault(key, resolved)
+        fetched = {
+            result.query: result
+            for result in self._fetch_cached(list(dict.fromkeys(sent.values())))
+        }
+        results = []
+        for query in queries:
+            result = replace(fetched[sent[query]], query=query)
+            if result.ok:
+                self.locations.learn(query, result.response.location)
+            results.append(result)
+        return results
+
+    def _fetch_cached(self, queries: List[str]) -> List[LocationResult]:
+        if self.cache is None:
+            return self._fetch_uncached(queries)
+
+        results, misses, stale = [], [], []
+        for query in queries:
+            entry = self.cache.get(canonical_location_key(query))
+            if entry is None:
+                misses.append(query)
+                continue
+            response = WeatherstackResponse.model_validate_json(entry.value)
+            results.append(LocationResult(query=query, response=response))
+            if not self.cache.is_fresh(entry):
+                stale.append(query)
+
+        if stale:
+            self.cache.revalidate(
+                (canonical_location_key(query) for query in stale),
+                lambda: self._refresh(stale),
+            )
+        if misses:
+            results += self._fetch_uncached(misses)
+        return results
+
+    def _refresh(self, queries: List[str]) -> None:
+        # Fetch errors come back as results; raise so the cache logs and counts them
+        failed = [r for r in self._fetch_uncached(queries) if not r.ok]
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} of {len(queries)} locations failed to refresh: "
+                + "; ".join(f"{r.query}: {r.error.info}" for r in failed)
+            )
+
+    def _fetch_uncached(self, queries: List[str]) -> List[LocationResult]:
+        try:
+            data = self._request(";".join(queries))
+        except (requests.RequestException, ValueError) as e:
+            return [
+                LocationResult(query=q, error=_client_error(str(e))) for q in queries
+            ]
+
+        if (
+            len(queries) > 1
+            and isinstance(data, dict)
+            and data.get("success", True) is False
+        ):
+            error = data.get("error")
+            code = error.get("code") if isinstance(error, dict) else None
+            if code == BULK_NOT_SUPPORTED:
+                self.batch_size = 1
+            if code == BULK_NOT_SUPPORTED or code in LOCATION_ERRORS:
+                # Retry one by one so the error lands on the right location(s)
+                return [result for q in queries for result in self._fetch_uncached([q])]
+
+        results = split_response(queries, data)
+        if self.cache is not None:
+            for result in results:
+                if result.ok:
+                    self.cache.set(
+                        canonical_location_key(result.query),
+                        result.response.model_dump_json().encode(),
+                    )
+        return results
+
+    def _request(self, query: str) -> dict:
+        return json.loads(self.backend.request(query))
+
+
+def get_weather_bulk(
+    locations: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[LocationResult]:
+    """
+    Convenience wrapper around BulkWeatherClient for one-off runs
+    """
+    with BulkWeatherClient(batch_size=batch_size, concurrency=concurrency) as client:
+        yield from client.get_weather(locations)
@@ -0,0 +1,213 @@
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Final, Iterable, Optional
+
+from unidecode import unidecode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL: Final = 10 * 60  # Weatherstack observations update every ~15 minutes
+DEFAULT_STALE_TTL: Final = 5 * 60
+DEFAULT_MAX_ENTRIES: Final = 10_000
+# Expired SQLite rows are deleted once every this many writes
+PRUNE_EVERY: Final = 100
+COORDINATE_PRECISION: Final = 2  # ~1km, finer than any weather station grid
+
+COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def canonical_location_key(query: str, precision: int = COORDINATE_PRECISION) -> str:
+    """
+    Maps equivalent spellings of a location onto one key: "Köln", " koln " and
+    "KOLN" share a key, as do "40.7128,-74.0060" and "40.71,-74.01".
+    """
+    match = COORDINATES.match(query)
+    if match:
+        lat, lon = (round(float(value), precision) for value in match.groups())
+        return f"{lat:.{precision}f},{lon:.{precision}f}"
+    return " ".join(unidecode(query).casefold().split())
+
+
+@dataclass(frozen=True)
+class CachedWeather:
+    value: bytes
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class WeatherCache:
+    """
+    TTL cache for serialized weather results, keyed by canonical_location_key.
+
+    Entries younger than `ttl` are served as-is. For a further `stale_ttl` seconds
+    they are still served, but a background refresh is triggered
+    (stale-while-revalidate). Older entries are treated as missing. An in-memory
+    LRU sits in front of an optional SQLite file that survives restarts; expired
+    rows are pruned from it on open and periodically on write.
+
+    Failed background refreshes are logged and counted in `refresh_failures`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        path: Optional[str | Path] = None,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedWeather] = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._refresher = ThreadPoolExecutor(max_workers=2)
+        self._writes = 0
+        self.refresh_failures = 0
+
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS weather"
+                    " (key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS weather_stored_at"
+                    " ON weather (stored_at)"
+                )
+            self.prune()
+
+    def __enter__(self) -> "WeatherCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._refresher.shutdown(wait=True)
+        if self._conn is not None:
+            self._conn.close()
+
+    def is_fresh(self, entry: CachedWeather) -> bool:
+        return entry.age < self.ttl
+
+    def get(self, key: str) -> Optional[CachedWeather]:
+        """
+        Returns the entry if it is fresh or still servable while stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, stored_at FROM weather WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = CachedWeather(value=row[0], stored_at=row[1])
+                    self._remember(key, entry)
+
+        if entry is None or entry.age >= self.ttl + self.stale_ttl:
+            return None
+        return entry
+
+    def set(self, key: str, value: bytes) -> None:
+        entry = CachedWeather(value=value, stored_at=time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO weather VALUES (?, ?, ?)",
+                        (key, entry.value, entry.stored_at),
+                    )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune()
+
+    def prune(self) -> int:
+        """
+        Deletes SQLite rows too old to be served, returning how many were removed
+        """
+        with self._lock:
+            return self._prune()
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], bytes],
+        cacheable: Callable[[bytes], bool] = lambda value: True,
+    ) -> bytes:
+        """
+        Serves `key` from the cache, calling `fetch` on a miss (synchronously) or
+        for a stale entry (in the background). Only values passing `cacheable`
+        are stored, so error responses are never replayed.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            if not self.is_fresh(entry):
+                self.revalidate([key], lambda: self._store(key, fetch(), cacheable))
+            return entry.value
+
+        value = fetch()
+        self._store(key, value, cacheable)
+        return value
+
+    def revalidate(self, keys: Iterable[str], refresh: Callable[[], object]) -> None:
+        """
+        Runs `refresh` in the background unless any of `keys` is already being
+        refreshed, so a burst of stale hits triggers one upstream request
+        """
+        keys = frozenset(keys)
+        with self._lock:
+            if keys & self._refreshing:
+                return
+            self._refreshing |= keys
+
+        def run() -> None:
+            try:
+                refresh()
+            except Exception:
+                # The stale entry keeps being served; make the failure visible
+                logger.exception("Background refresh failed for %s", sorted(keys))
+                with self._lock:
+                    self.refresh_failures += 1
+            finally:
+                with self._lock:
+                    self._refreshing -= keys
+
+        self._refresher.submit(run)
+
+    def _store(
+        self, key: str, value: bytes, cacheable: Callable[[bytes], bool]
+    ) -> None:
+        if cacheable(value):
+            self.set(key, value)
+
+    def _prune(self) -> int:
+        if self._conn is None:
+            return 0
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM weather WHERE stored_at < ?",
+                (time.time() - self.ttl - self.stale_ttl,),
+            )
+        return cursor.rowcount
+
+    def _remember(self, key: str, entry: CachedWeather) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
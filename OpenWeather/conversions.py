@@ -0,0 +1,133 @@
+from typing import Dict, Final, Mapping
+
+import numpy as np
+from models.current_weather import Units
+
+KMH_PER_MPH: Final = 1.609344
+MM_PER_INCH: Final = 25.4
+KM_PER_MILE: Final = KMH_PER_MPH
+
+# Magnus formula coefficients (Alduchov & Eskridge), valid from -40°C to 50°C
+MAGNUS_B: Final = 17.625
+MAGNUS_C: Final = 243.04
+
+
+def celsius_to_fahrenheit(celsius: np.ndarray) -> np.ndarray:
+    return np.asarray(celsius, dtype=np.float64) * 1.8 + 32
+
+
+def fahrenheit_to_celsius(fahrenheit: np.ndarray) -> np.ndarray:
+    return (np.asarray(fahrenheit, dtype=np.float64) - 32) / 1.8
+
+
+def celsius_to_kelvin(celsius: np.ndarray) -> np.ndarray:
+    return np.asarray(celsius, dtype=np.float64) + 273.15
+
+
+def kmh_to_ms(kmh: np.ndarray) -> np.ndarray:
+    return np.asarray(kmh, dtype=np.float64) / 3.6
+
+
+def kmh_to_mph(kmh: np.ndarray) -> np.ndarray:
+    return np.asarray(kmh, dtype=np.float64) / KMH_PER_MPH
+
+
+def dew_point(temperature: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """
+    Dew point in °C from temperature in °C and relative humidity in %
+    """
+    temperature = np.asarray(temperature, dtype=np.float64)
+    # Humidity 0 would be log(0); clamp to the smallest value stations report
+    humidity = np.clip(np.asarray(humidity, dtype=np.float64), 1, 100)
+    gamma = np.log(humidity / 100) + MAGNUS_B * temperature / (MAGNUS_C + temperature)
+    return MAGNUS_C * gamma / (MAGNUS_B - gamma)
+
+
+def heat_index(temperature: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """
+    NWS heat index in °C from temperature in °C and relative humidity in %.
+    Uses Steadman's simple formula below 80°F and the Rothfusz regression (with
+    the NWS low/high humidity adjustments) above it.
+    """
+    t = celsius_to_fahrenheit(temperature)
+    rh = np.asarray(humidity, dtype=np.float64)
+
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    regression = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 6.83783e-3 * t * t
+        - 5.481717e-2 * rh * rh
+        + 1.22874e-3 * t * t * rh
+        + 8.5282e-4 * t * rh * rh
+        - 1.99e-6 * t * t * rh * rh
+    )
+    dry = (rh < 13) & (t >= 80) & (t <= 112)
+    regression -= np.where(
+        dry,
+        (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17),
+        0.0,
+    )
+    humid = (rh > 85) & (t >= 80) & (t <= 87)
+    regression += np.where(humid, (rh - 85) / 10 * (87 - t) / 5, 0.0)
+
+    # NWS: use the regression once the simple average reaches 80°F
+    index = np.where((simple + t) / 2 >= 80, regression, simple)
+    return fahrenheit_to_celsius(index)
+
+
+def wind_chill(temperature: np.ndarray, wind_speed: np.ndarray) -> np.ndarray:
+    """
+    Wind chill in °C from temperature in °C and wind speed in km/h (the
+    Environment Canada / NWS 2001 formula). Outside its validity range, at or
+    above 10°C or with wind under 4.8 km/h, the air temperature is returned.
+    """
+    t = np.asarray(temperature, dtype=np.float64)
+    v = np.asarray(wind_speed, dtype=np.float64)
+    v16 = np.power(np.maximum(v, 0), 0.16)
+    chill = 13.12 + 0.6215 * t - 11.37 * v16 + 0.3965 * t * v16
+    return np.where((t < 10) & (v >= 4.8), chill, t)
+
+
+def derive(columns: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Derived metrics for metric columns (as written by ColumnarWriter), all in °C
+    """
+    temperature, humidity = columns["temperature"], columns["humidity"]
+    return {
+        "dew_point": dew_point(temperature, humidity),
+        "heat_index": heat_index(temperature, humidity),
+        "wind_chill": wind_chill(temperature, columns["wind_speed"]),
+        "wind_speed_ms": kmh_to_ms(columns["wind_speed"]),
+    }
+
+
+def convert(columns: Mapping[str, np.ndarray], units: Units) -> Dict[str, np.ndarray]:
+    """
+    Converts metric columns into the unit system Weatherstack would have answered
+    with for `units`, so one metric request serves every Units value. Columns that
+    don't depend on the unit system are passed through unchanged.
+    """
+    converted = dict(columns)
+    if units is Units.metric:
+        return converted
+
+    temperatures = [name for name in ("temperature", "feelslike") if name in columns]
+    if units is Units.scientific:
+        for name in temperatures:
+            converted[name] = celsius_to_kelvin(columns[name])
+        return converted
+
+    for name in temperatures:
+        converted[name] = celsius_to_fahrenheit(columns[name])
+    if "wind_speed" in columns:
+        converted["wind_speed"] = kmh_to_mph(columns["wind_speed"])
+    if "precip" in columns:
+        converted["precip"] = np.asarray(columns["precip"], np.float64) / MM_PER_INCH
+    if "visibility" in columns:
+        converted["visibility"] = (
+            np.asarray(columns["visibility"], np.float64) / KM_PER_MILE
+        )
+    return converted
@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Callable, Dict, Final, Iterable, Iterator, List, Optional
+
+import numpy as np
+from bulk import BulkWeatherClient, LocationResult
+from models.current_weather import WeatherstackResponse, observed_at
+
+# Arrow IPC and Parquet output need the optional `pyarrow` package
+ARROW_AVAILABLE: Final = find_spec("pyarrow") is not None
+FORMATS: Final = ("npy", "npz", "arrow", "parquet")
+DEFAULT_CHUNK_SIZE: Final = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    dtype: np.dtype
+    value: Callable[[WeatherstackResponse], object]
+
+
+def _observed_at(response: WeatherstackResponse) -> int:
+    return int(observed_at(response).timestamp())
+
+
+COLUMNS: Final = (
+    Column("observed_at", np.dtype(np.int64), _observed_at),
+    Column("lat", np.dtype(np.float64), lambda r: float(r.location.lat)),
+    Column("lon", np.dtype(np.float64), lambda r: float(r.location.lon)),
+    Column("temperature", np.dtype(np.int16), lambda r: r.current.temperature),
+    Column("feelslike", np.dtype(np.int16), lambda r: r.current.feelslike),
+    Column("humidity", np.dtype(np.uint8), lambda r: r.current.humidity),
+    Column("wind_speed", np.dtype(np.int16), lambda r: r.current.wind_speed),
+    Column("wind_degree", np.dtype(np.int16), lambda r: r.current.wind_degree),
+    Column("pressure", np.dtype(np.int16), lambda r: r.current.pressure),
+    Column("precip", np.dtype(np.float32), lambda r: r.current.precip),
+    Column("cloudcover", np.dtype(np.uint8), lambda r: r.current.cloudcover),
+    Column("uv_index", np.dtype(np.uint8), lambda r: r.current.uv_index),
+    Column("visibility", np.dtype(np.int16), lambda r: r.current.visibility),
+    Column("weather_code", np.dtype(np.int16), lambda r: r.current.weather_code),
+)
+
+
+class ColumnarWriter:
+    """
+    Accumulates WeatherstackResponses into preallocated typed column buffers and
+    writes them out every `chunk_size` rows, so memory stays bounded however many
+    observations are exported.
+
+    - "npy" (default): a part-NNNNN directory per chunk in `path`, holding one
+      .npy file per column, which read_npy memory-maps without copying
+    - "npz": one uncompressed part-NNNNN.npz per chunk in the `path` directory;
+      smaller file count, but zip members can't be mapped so reads copy
+    - "arrow": a single Arrow IPC file with one record batch per chunk, which
+      readers can memory-map without copying
+    - "parquet": a single Parquet file with one row group per chunk
+
+    The location name is stored alongside the numeric COLUMNS as a string column.
+
+    Chunk directories are read back as a whole, so "npy" and "npz" refuse a
+    `path` that already has files in it rather than mixing in an older export.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        format: str = "npy",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        if format in ("arrow", "parquet") and not ARROW_AVAILABLE:
+            raise ValueError(f"{format} output requires pyarrow")
+
+        self.path = Path(path)
+        self.format = format
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self.chunks_written = 0
+
+        self._buffers: Dict[str, np.ndarray] = {
+            column.name: np.empty(chunk_size, dtype=column.dtype) for column in COLUMNS
+        }
+        self._locations: List[str] = []
+        self._writer = None
+        if format in ("npy", "npz"):
+            if self.path.is_dir() and any(self.path.iterdir()):
+                raise FileExistsError(f"{self.path} is not empty")
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows_written + len(self._locations)
+
+    def append(self, response: WeatherstackResponse) -> None:
+        row = len(self._locations)
+        for column in COLUMNS:
+            self._buffers[column.name][row] = column.value(response)
+        self._locations.append(response.location.name)
+        if row + 1 == self.chunk_size:
+            self.flush()
+
+    def extend(self, results: Iterable[LocationResult]) -> int:
+        """
+        Appends every successful result and returns how many were appended
+        """
+        appended = 0
+        for result in results:
+            if result.ok:
+                self.append(result.response)
+                appended += 1
+        return appended
+
+    def flush(self) -> None:
+        rows = len(self._locations)
+        if not rows:
+            return
+
+        columns = {name: buffer[:rows] for name, buffer in self._buffers.items()}
+        columns["location"] = np.array(self._locations, dtype=np.str_)
+        part = self.path / f"part-{self.chunks_written:05d}"
+        if self.format == "npy":
+            part.mkdir(exist_ok=True)
+            for name, values in columns.items():
+                np.save(part / f"{name}.npy", values)
+        elif self.format == "npz":
+            np.savez(part.with_suffix(".npz"), **columns)
+        else:
+            self._write_batch(columns)
+
+        self.rows_written += rows
+        self.chunks_written += 1
+        self._locations.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _write_batch(self, columns: Dict[str, np.ndarray]) -> None:
+        import pyarrow as pa
+
+        batch = pa.RecordBatch.from_pydict(columns)
+        if self._writer is None:
+            if self.format == "arrow":
+                self._writer = pa.ipc.new_file(self.path, batch.schema)
+            else:
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+        if self.format == "arrow":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_table(pa.Table.from_batches([batch]))
+
+
+def iter_npy(path: str | Path) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yields the chunks written by a "npy" ColumnarWriter in order, each column
+    memory-mapped read-only, so nothing is copied until it is touched
+    """
+    for part in sorted(Path(path).glob("part-*")):
+        if part.is_dir():
+            yield {
+                column.stem: np.load(column, mmap_mode="r")
+                for column in part.glob("*.npy")
+            }
+
+
+def read_npy(path: str | Path) -> Dict[str, np.ndarray]:
+    """
+    Every chunk written by a "npy" ColumnarWriter, per column. A single chunk
+    stays memory-mapped; several are concatenated into memory.
+    """
+    return _concatenate(list(iter_npy(path)))
+
+
+def read_npz(path: str | Path) -> Dict[str, np.ndarray]:
+    """
+    Loads every chunk written by a "npz" ColumnarWriter, concatenated per column
+    """
+    parts = []
+    for part in sorted(Path(path).glob("part-*.npz")):
+        with np.load(part) as data:
+            parts.append({name: data[name] for name in data.files})
+    return _concatenate(parts)
+
+
+def _concatenate(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    if not parts:
+        return {}
+    if len(parts) == 1:
+        return parts[0]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def export_weather(
+    locations: Iterable[str],
+    path: str | Path,
+    format: str = "npy",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    client: Optional[BulkWeatherClient] = None,
+) -> int:
+    """
+    Fetches current weather for `locations` and streams it to `path`. Returns the
+    number of rows written; locations that failed are skipped.
+    """
+    with ColumnarWriter(path, format=format, chunk_size=chunk_size) as writer:
+        if client is not None:
+            writer.extend(client.get_weather(locations))
+        else:
+            with BulkWeatherClient() as owned:
+                writer.extend(owned.get_weather(locations))
+    return writer.rows_written
@@ -0,0 +1,102 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cache import COORDINATES, canonical_location_key
+from models.current_weather import WeatherstackLocation
+
+
+def coordinates_query(location: WeatherstackLocation) -> str:
+    return f"{location.lat},{location.lon}"
+
+
+class LocationIndex:
+    """
+    Remembers which WeatherstackLocation a free-text query resolved to, keyed by
+    canonical_location_key, so later lookups are sent by coordinates instead of
+    being re-resolved (and possibly resolved differently) by the provider.
+
+    The first resolution is pinned: "Köln" keeps meaning whatever it meant the
+    first time, and `add` can be used to correct a bad resolution by hand. With a
+    `path`, the index is stored in SQLite and survives restarts.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        self._locations: Dict[str, WeatherstackLocation] = {}
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS locations"
+                    " (key TEXT PRIMARY KEY, location TEXT NOT NULL)"
+                )
+
+    def __enter__(self) -> "LocationIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is not None:
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM locations"
+                ).fetchone()
+                return count
+            return len(self._locations)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+    def get(self, query: str) -> Optional[WeatherstackLocation]:
+        key = canonical_location_key(query)
+        with self._lock:
+            location = self._locations.get(key)
+            if location is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT location FROM locations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    location = WeatherstackLocation.model_validate_json(row[0])
+                    self._locations[key] = location
+        return location
+
+    def add(self, query: str, location: WeatherstackLocation) -> None:
+        """
+        Pins `query` (and every spelling with the same canonical key) to `location`
+        """
+        key = canonical_location_key(query)
+        with self._lock:
+            self._locations[key] = location
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO locations VALUES (?, ?)",
+                        (key, location.model_dump_json()),
+                    )
+
+    def learn(self, query: str, location: WeatherstackLocation) -> None:
+        """
+        Records the provider's resolution of `query` unless it is already pinned.
+        Coordinate queries are not recorded, they need no resolving.
+        """
+        if COORDINATES.match(query) or self.get(query) is not None:
+            return
+        self.add(query, location)
+
+    def resolve(self, query: str) -> str:
+        """
+        Returns the query to send upstream: coordinates for a known location,
+        otherwise `query` unchanged
+        """
+        location = self.get(query)
+        return query if location is None else coordinates_query(location)
+
+    def resolve_all(self, queries: List[str]) -> List[str]:
+        return [self.resolve(query) for query in queries]
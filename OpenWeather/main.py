@@ -1,12 +1,22 @@
 import argparse
-import os
+import json
+from functools import partial
+from typing import Annotated, List, Union
 
 import requests
+from backends import WeatherBackend, WeatherstackBackend
+from cache import WeatherCache, canonical_location_key
 from dotenv import load_dotenv
+from locations import LocationIndex
+from models.current_weather import (
+    WeatherstackErrorResponse,
+    WeatherstackMultiResponse,
+    WeatherstackResponse,
+)
+from pydantic import Field, TypeAdapter
 from unidecode import unidecode
 
 load_dotenv()
-BASE_URL = "http://api.weatherstack.com/current"
 
 
 # Helper to build the query parameter
@@ -33,54 +43,116 @@ def build_query_param(city, lat, lon):
     return ";".join(query_parts)
 
 
-def print_weather_result(data):
-    # If multiple locations, Weatherstack returns a list for location/current
-    locations = (
-        data["location"] if isinstance(data["location"], list) else [data["location"]]
-    )
-    currents = (
-        data["current"] if isinstance(data["current"], list) else [data["current"]]
-    )
-    for location, current in zip(locations, currents):
-        print(f"Location: {location['name']}, {location['country']}")
-        print(f"Local Time: {location['localtime']}")
-        print(f"Temperature: {current['temperature']}°C")
-        print(f"Weather: {', '.join(current['weather_descriptions'])}")
-        print(f"Humidity: {current['humidity']}%")
-        print(f"Wind: {current['wind_speed']} km/h {current['wind_dir']}")
-        print(f"Feels Like: {current['feelslike']}°C")
-        print()
-
-
-def get_weather(city=None, lat=None, lon=None):
-    api_key = os.getenv("WEATHERSTACK_API_KEY")
-    if not api_key:
-        print("Missing WEATHERSTACK_API_KEY in .env file.")
-        return
-
+WeatherResult = Union[
+    WeatherstackResponse, List[WeatherstackResponse], WeatherstackErrorResponse
+]
+
+# Errors are tried first: they are recognisable by their required `error` field,
+# and a single-location response fails fast on a list before the multi model runs
+_RESPONSE = TypeAdapter(
+    Annotated[
+        Union[
+            WeatherstackErrorResponse, WeatherstackResponse, WeatherstackMultiResponse
+        ],
+        Field(union_mode="left_to_right"),
+    ]
+)
+
+
+def parse_response(body: bytes) -> WeatherResult:
+    """
+    Decodes a Weatherstack body straight into models. A multi-location query is
+    answered with a list, one response per location in query order.
+    """
+    parsed = _RESPONSE.validate_json(body)
+    if isinstance(parsed, WeatherstackMultiResponse):
+        return parsed.responses()
+    return parsed
+
+
+def format_weather_result(result: WeatherResult) -> str:
+    if isinstance(result, WeatherstackErrorResponse):
+        return f"Error: {result.error.info}"
+
+    blocks = []
+    for response in result if isinstance(result, list) else [result]:
+        location, current = response.location, response.current
+        blocks.append(
+            f"Location: {location.name}, {location.country}\n"
+            f"Local Time: {location.localtime}\n"
+            f"Temperature: {current.temperature}°C\n"
+            f"Weather: {', '.join(current.weather_descriptions)}\n"
+            f"Humidity: {current.humidity}%\n"
+            f"Wind: {current.wind_speed} km/h {current.wind_dir}\n"
+            f"Feels Like: {current.feelslike}°C\n"
+        )
+    return "\n".join(blocks)
+
+
+def is_success(body: bytes) -> bool:
+    return json.loads(body).get("success", True) is not False
+
+
+def get_weather(
+    city=None,
+    lat=None,
+    lon=None,
+    cache: WeatherCache = None,
+    locations: LocationIndex = None,
+    backend: WeatherBackend = None,
+) -> WeatherResult:
+    """
+    Fetches current weather for a city (or comma separated cities) and/or a
+    coordinate pair. API errors are returned as a WeatherstackErrorResponse;
+    a missing API key raises ValueError and HTTP failures raise
+    requests.RequestException.
+
+    Requests go to Weatherstack at backends.BASE_URL unless another `backend` is given.
+    """
+    # A backend passed in is left open for its owner to close
+    owned = WeatherstackBackend() if backend is None else None
+    try:
+        return _get_weather(city, lat, lon, cache, locations, backend or owned)
+    finally:
+        if owned is not None:
+            owned.close()
+
+
+def _get_weather(
+    city,
+    lat,
+    lon,
+    cache: WeatherCache,
+    locations: LocationIndex,
+    backend: WeatherBackend,
+) -> WeatherResult:
     # Build initial query
     if isinstance(city, list):
         city = [unidecode(c) for c in city]
     elif city:
         city = unidecode(city)
     query = build_query_param(city, lat, lon)
-
-    print(f"Query being sent to API: {query}")
-
-    print()
-    params = {"access_key": api_key, "query": query}
-    try:
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("success", True) is False:
-            print(f"Error: {data['error']['info']}")
-            return
-        print_weather_result(data)
-    except requests.RequestException as e:
-        print(f"HTTP error: {e}")
-    except Exception as e:
-        print(f"Error: {e}")
+    if locations is not None:
+        # Known locations are sent by coordinates so the provider can't re-resolve
+        # them differently, and differently spelled inputs share a cache entry
+        queries = query.split(";")
+        query = ";".join(locations.resolve_all(queries))
+
+    fetch = partial(backend.request, query)
+    if cache is None:
+        body = fetch()
+    else:
+        body = cache.get_or_fetch(
+            canonical_location_key(query), fetch, cacheable=is_success
+        )
+
+    result = parse_response(body)
+    if locations is not None and not isinstance(result, WeatherstackErrorResponse):
+        # Weatherstack answers a multi-location query in query order
+        responses = result if isinstance(result, list) else [result]
+        for part, response in zip(queries, responses):
+            locations.learn(part, response.location)
+    return result
 
 
 if __name__ == "__main__":
@@ -101,5 +173,23 @@ if __name__ == "__main__":
     parser.add_argument(
         "--lon", type=float, help="Longitude. Can be combined with city."
     )
+    parser.add_argument(
+        "--locations",
+        type=str,
+        help="SQLite file remembering resolved locations across runs.",
+    )
     args = parser.parse_args()
-    get_weather(city=args.city, lat=args.lat, lon=args.lon)
+    try:
+        if args.locations:
+            with LocationIndex(args.locations) as index:
+                result = get_weather(
+                    city=args.city, lat=args.lat, lon=args.lon, locations=index
+                )
+        else:
+            result = get_weather(city=args.city, lat=args.lat, lon=args.lon)
+    except requests.RequestException as e:
+        print(f"HTTP error: {e}")
+    except ValueError as e:
+        print(f"Error: {e}")
+    else:
+        print(format_weather_result(result))
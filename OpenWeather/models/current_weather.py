@@ -1,5 +1,6 @@
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -70,11 +71,68 @@ class WeatherstackCurrent(BaseModel):
 
 
 class WeatherstackResponse(BaseModel):
-    request: WeatherstackRequest
+    request: Optional[WeatherstackRequest] = None  # Omitted in some bulk responses
     location: WeatherstackLocation
     current: WeatherstackCurrent
 
 
+def requested_at(location: WeatherstackLocation) -> datetime:
+    """
+    When the provider answered for `location`. localtime_epoch encodes the
+    location's wall clock as if it were UTC (New York at 08:14 EDT gives 08:14Z),
+    so utc_offset is taken back out.
+    """
+    offset = round(float(location.utc_offset) * 3600)
+    return datetime.fromtimestamp(location.localtime_epoch - offset, tz=timezone.utc)
+
+
+def observed_at(response: WeatherstackResponse) -> datetime:
+    """
+    When the current conditions were observed. observation_time is a UTC
+    wall-clock time ("09:30 PM") without a date, so it is anchored to the
+    request's time in UTC.
+    """
+    requested = requested_at(response.location)
+    # Parsed by hand, strptime dominates the cost of bulk exports
+    clock, meridiem = response.current.observation_time.split()
+    hour, minute = (int(part) for part in clock.split(":"))
+    hour = hour % 12 + (12 if meridiem.upper() == "PM" else 0)
+    observed = requested.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if observed > requested:
+        observed -= timedelta(days=1)
+    return observed
+
+
+def observation_age(response: WeatherstackResponse) -> float:
+    """
+    Seconds between the observation and the request, both as seen by the provider
+    """
+    return (requested_at(response.location) - observed_at(response)).total_seconds()
+
+
+class WeatherstackMultiResponse(BaseModel):
+    """
+    Answer to a multi-location query: parallel lists in query order
+    """
+
+    request: Union[List[WeatherstackRequest], WeatherstackRequest, None] = None
+    location: List[WeatherstackLocation]
+    current: List[WeatherstackCurrent]
+
+    def responses(self) -> List[WeatherstackResponse]:
+        if isinstance(self.request, list):
+            requests = list(self.request)
+        else:
+            requests = [self.request]
+        requests += [None] * (len(self.location) - len(requests))
+        return [
+            WeatherstackResponse.model_construct(
+                request=request, location=location, current=current
+            )
+            for request, location, current in zip(requests, self.location, self.current)
+        ]
+
+
 class WeatherstackError(BaseModel):
     code: int
     type: str
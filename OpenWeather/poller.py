@@ -0,0 +1,225 @@
+import asyncio
+import heapq
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Final, List, Optional, Set, Union
+
+from bulk import BulkWeatherClient, LocationResult, _client_error
+from cache import canonical_location_key
+from models.current_weather import observation_age
+from unidecode import unidecode
+
+# Weatherstack publishes a new observation roughly every 15 minutes
+DEFAULT_INTERVAL: Final = 15 * 60
+DEFAULT_MIN_INTERVAL: Final = 60
+DEFAULT_MAX_INTERVAL: Final = 60 * 60
+# Refresh times are spread by up to this fraction so locations don't stay in lockstep
+JITTER: Final = 0.1
+
+Callback = Callable[[LocationResult], Union[None, Awaitable[None]]]
+
+
+@dataclass
+class _Location:
+    query: str
+    observation: Optional[str] = None
+    # Consecutive polls that failed or returned no new observation
+    misses: int = 0
+
+
+@dataclass(order=True)
+class _Due:
+    at: float
+    key: str = field(compare=False)
+
+
+class WeatherPoller:
+    """
+    Keeps current weather for a set of locations up to date on one event loop.
+
+    Each location is refreshed when its next observation is expected (the
+    observation time plus `interval`), falling back exponentially from
+    `min_interval` to `max_interval` while nothing new is published or the
+    request fails. Due locations are grouped into batches for `client` and sent
+    at most `requests_per_second`, so a large list is spread evenly over the
+    quota instead of bursting. Spellings of one location share a single entry.
+
+    New observations and errors are passed to `on_update` (a plain function or a
+    coroutine function) and/or put on `queue`. Unchanged observations are not
+    delivered.
+    """
+
+    def __init__(
+        self,
+        client: BulkWeatherClient,
+        requests_per_second: float = 1.0,
+        interval: float = DEFAULT_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        on_update: Optional[Callback] = None,
+        queue: Optional[asyncio.Queue] = None,
+    ):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+
+        self.client = client
+        self.requests_per_second = requests_per_second
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_update = on_update
+        self.queue = queue
+
+        self._locations: Dict[str, _Location] = {}
+        self._schedule: List[_Due] = []
+        self._due: Dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._next_request = 0.0
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def add(self, location: str, delay: float = 0.0) -> None:
+        """
+        Starts polling `location` after `delay` seconds. Adding a location that is
+        already polled (in any spelling) does nothing.
+        """
+        key = canonical_location_key(location)
+        if key in self._locations:
+            return
+        self._locations[key] = _Location(query=unidecode(location).strip())
+        self._schedule_at(key, self._now() + delay)
+
+    def remove(self, location: str) -> None:
+        key = canonical_location_key(location)
+        self._locations.pop(key, None)
+        self._due.pop(key, None)
+
+    def refresh_delay(self, result: LocationResult, state: _Location) -> float:
+        """
+        Seconds until `result`'s location should be polled again
+        """
+        if result.ok and result.response.current.observation_time != state.observation:
+            age = observation_age(result.response)
+            delay = self.interval - age
+        else:
+            delay = self.min_interval * 2 ** (state.misses - 1)
+        delay *= random.uniform(1, 1 + JITTER)
+        return min(self.max_interval, max(self.min_interval, delay))
+
+    async def run(self) -> None:
+        """
+        Polls until cancelled. At most `client.concurrency` batches are in flight.
+        """
+        slots = asyncio.Semaphore(self.client.concurrency)
+        in_flight: Set[asyncio.Task] = set()
+
+        def done(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            slots.release()
+
+        try:
+            while True:
+                batch = await self._next_batch()
+                await self._throttle()
+                await slots.acquire()
+                task = asyncio.create_task(self._poll(batch))
+                in_flight.add(task)
+                task.add_done_callback(done)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _next_batch(self) -> List[str]:
+        """
+        Waits until at least one location is due and takes up to a batch of them
+        """
+        while True:
+            self._wakeup.clear()
+            self._discard_cancelled()
+            timeout = None
+            if self._schedule:
+                timeout = self._schedule[0].at - self._now()
+                if timeout <= 0:
+                    break
+            # Not wait_for, which can swallow a cancellation racing with the wakeup
+            wakeup = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({wakeup}, timeout=timeout)
+            finally:
+                wakeup.cancel()
+
+        # Locations falling due before the next request slot would wait for it
+        # anyway, so they ride along now instead of costing a request of their own
+        horizon = max(self._now(), self._next_request) + 1 / self.requests_per_second
+        batch = []
+        while len(batch) < self.client.batch_size:
+            self._discard_cancelled()
+            if not self._schedule or self._schedule[0].at > horizon:
+                break
+            key = heapq.heappop(self._schedule).key
+            del self._due[key]
+            batch.append(key)
+        return batch
+
+    async def _throttle(self) -> None:
+        now = self._now()
+        wait = self._next_request - now
+        self._next_request = max(now, self._next_request) + 1 / self.requests_per_second
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _poll(self, keys: List[str]) -> None:
+        queries = {
+            self._locations[key].query: key for key in keys if key in self._locations
+        }
+        try:
+            results = await asyncio.to_thread(self.client.fetch_batch, list(queries))
+        except Exception as e:
+            # Keep the locations scheduled whatever goes wrong in the client
+            results = [
+                LocationResult(query=q, error=_client_error(str(e))) for q in queries
+            ]
+
+        for result in results:
+            key = queries[result.query]
+            state = self._locations.get(key)
+            if state is None:  # removed while in flight
+                continue
+            observation = (
+                result.response.current.observation_time if result.ok else None
+            )
+            fresh = result.ok and observation != state.observation
+            state.misses = 0 if fresh else state.misses + 1
+            self._schedule_at(key, self._now() + self.refresh_delay(result, state))
+            if fresh:
+                state.observation = observation
+            if fresh or not result.ok:
+                await self._deliver(result)
+
+    async def _deliver(self, result: LocationResult) -> None:
+        if self.on_update is not None:
+            outcome = self.on_update(result)
+            if inspect.isawaitable(outcome):
+                await outcome
+        if self.queue is not None:
+            await self.queue.put(result)
+
+    def _schedule_at(self, key: str, at: float) -> None:
+        self._due[key] = at
+        heapq.heappush(self._schedule, _Due(at=at, key=key))
+        self._wakeup.set()
+
+    def _discard_cancelled(self) -> None:
+        # Entries are left in the heap when rescheduled or removed and skipped here
+        while self._schedule and self._due.get(self._schedule[0].key) != (
+            self._schedule[0].at
+        ):
+            heapq.heappop(self._schedule)
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
@@ -0,0 +1,153 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from backends import load_recordings
+from cache import canonical_location_key
+
+NOT_FOUND = {
+    "success": False,
+    "error": {
+        "code": 615,
+        "type": "request_failed",
+        "info": "Your API request failed. Please try again or contact support.",
+    },
+}
+MISSING_QUERY = {
+    "success": False,
+    "error": {
+        "code": 601,
+        "type": "missing_query",
+        "info": "Please specify a valid location identifier using the query parameter.",
+    },
+}
+
+
+class Replayer:
+    """
+    Answers Weatherstack queries from recorded responses. Every request waits
+    `latency` seconds (plus up to `jitter` more) and fails with HTTP 503 at
+    `error_rate`. A multi-location query is answered with parallel lists, and
+    with error 615 if any of its locations was never recorded, like the real API.
+    """
+
+    def __init__(
+        self,
+        recordings: Dict[str, dict],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.recordings = recordings
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def answer(self, query: str) -> Tuple[int, dict]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return 503, {"message": "Service Unavailable"}
+
+        parts = [part for part in query.split(";") if part.strip()]
+        if not parts:
+            return 200, MISSING_QUERY
+        records = [self.recordings.get(canonical_location_key(p)) for p in parts]
+        if any(record is None for record in records):
+            return 200, NOT_FOUND
+        if len(records) == 1:
+            return 200, records[0]
+        return 200, {
+            "location": [record["location"] for record in records],
+            "current": [record["current"] for record in records],
+        }
+
+
+class StubServer:
+    """
+    Local Weatherstack stand-in on a background thread, for load tests and offline
+    benchmarks. Point a WeatherstackBackend at `url`; any access key is accepted.
+    """
+
+    def __init__(self, replayer: Replayer, host: str = "127.0.0.1", port: int = 0):
+        self.replayer = replayer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler) -> None:
+                params = parse_qs(urlsplit(handler.path).query)
+                status, data = replayer.answer(params.get("query", [""])[0])
+                body = json.dumps(data).encode()
+                handler.send_response(status)
+                handler.send_header("Content-Type", "application/json")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/current"
+
+    def __enter__(self) -> "StubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay recorded Weatherstack responses on a local port"
+    )
+    parser.add_argument("recordings", help="JSON lines file from RecordingBackend.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    replayer = Replayer(
+        load_recordings(args.recordings),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    server = StubServer(replayer, port=args.port)
+    print(f"Serving {len(replayer.recordings)} locations at {server.url}")
+    server.serve_forever()
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+import responses
+
+# Add the current directory to the path so we can import backends
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backends import BASE_URL, RecordingBackend, WeatherstackBackend, load_recordings
+from bulk import BulkWeatherClient
+from main import get_weather
+from stub_server import Replayer, StubServer
+from test_bulk import make_current, make_location, weather_callback
+
+RECORDINGS = {
+    "london": {"location": make_location("London"), "current": make_current(18)},
+    "paris": {"location": make_location("Paris"), "current": make_current(20)},
+}
+
+
+class TestWeatherstackBackend(unittest.TestCase):
+    def test_base_url_override_is_read_per_instance(self):
+        with patch.dict(os.environ, {"WEATHERSTACK_BASE_URL": "http://stub/current"}):
+            with WeatherstackBackend(api_key="test") as backend:
+                self.assertEqual(backend.base_url, "http://stub/current")
+
+    def test_get_weather_defaults_to_a_backend_with_timeout(self):
+        with StubServer(Replayer(RECORDINGS)) as server:
+            environ = {"WEATHERSTACK_BASE_URL": server.url, "WEATHERSTACK_API_KEY": "x"}
+            with patch.dict(os.environ, environ):
+                with patch.object(
+                    requests.Session, "get", wraps=requests.Session().get
+                ) as get:
+                    result = get_weather(city="London")
+
+        self.assertEqual(result.location.name, "London")
+        self.assertEqual(get.call_args.kwargs["timeout"], 10.0)
+
+
+class TestRecordingBackend(unittest.TestCase):
+    @responses.activate
+    def test_recordings_are_replayable(self):
+        responses.add_callback(responses.GET, BASE_URL, callback=weather_callback())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recordings.jsonl")
+            with RecordingBackend(WeatherstackBackend(api_key="test"), path) as backend:
+                backend.request("London;Paris")
+                backend.request("Köln")
+            recordings = load_recordings(path)
+
+        self.assertEqual(set(recordings), {"london", "paris", "koln"})
+        self.assertEqual(recordings["paris"]["location"]["name"], "Paris")
+
+
+class TestStubServer(unittest.TestCase):
+    def test_bulk_client_against_stub(self):
+        with StubServer(Replayer(RECORDINGS)) as server:
+            backend = WeatherstackBackend(api_key="any", base_url=server.url)
+            with BulkWeatherClient(backend=backend, batch_size=3) as client:
+                results = {
+                    r.query: r
+                    for r in client.get_weather(["London", "Paris", "Nowhere"])
+                }
+            backend.close()
+
+        self.assertEqual(results["Paris"].response.current.temperature, 20)
+        self.assertEqual(results["Nowhere"].error.code, 615)
+        # One bulk request, then one per location to isolate the unknown one
+        self.assertEqual(server.replayer.requests, 4)
+
+    def test_latency_and_errors_are_injected(self):
+        replayer = Replayer(RECORDINGS, latency=0.05, error_rate=1.0)
+        with StubServer(replayer) as server:
+            with WeatherstackBackend(api_key="any", base_url=server.url) as backend:
+                start = time.monotonic()
+                with self.assertRaises(requests.HTTPError) as raised:
+                    get_weather(city="London", backend=backend)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertIn("503", str(raised.exception))
+
+    def test_get_weather_against_stub(self):
+        with StubServer(Replayer(RECORDINGS)) as server:
+            with WeatherstackBackend(api_key="any", base_url=server.url) as backend:
+                result = get_weather(city="London,Paris", backend=backend)
+
+        self.assertEqual([r.location.name for r in result], ["London", "Paris"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import json
+import os
+import sys
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+# Add the current directory to the path so we can import bulk
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backends import BASE_URL
+from bulk import BulkWeatherClient, split_response
+from cache import WeatherCache, canonical_location_key
+from models.current_weather import WeatherstackMultiResponse
+
+
+def make_location(name):
+    return {
+        "name": name,
+        "country": "Somewhere",
+        "region": "",
+        "lat": "1.0",
+        "lon": "2.0",
+        "timezone_id": "UTC",
+        "localtime": "2025-06-23 22:30",
+        "localtime_epoch": 1719179400,
+        "utc_offset": "0.0",
+    }
+
+
+def make_current(temperature):
+    return {
+        "observation_time": "09:30 PM",
+        "temperature": temperature,
+        "weather_code": 113,
+        "weather_icons": [],
+        "weather_descriptions": ["Clear"],
+        "wind_speed": 15,
+        "wind_degree": 280,
+        "wind_dir": "W",
+        "pressure": 1015,
+        "precip": 0,
+        "humidity": 65,
+        "cloudcover": 0,
+        "feelslike": 18,
+        "uv_index": 5,
+        "visibility": 10,
+    }
+
+
+def weather_callback(unknown=(), bulk_supported=True):
+    """
+    Fake Weatherstack: every query is answered in order, except `unknown` ones
+    """
+
+    def callback(request):
+        query = parse_qs(urlsplit(request.url).query)["query"][0]
+        cities = query.split(";")
+        if len(cities) > 1 and not bulk_supported:
+            error = {"code": 604, "type": "bulk_queries_not_supported", "info": "x"}
+            return 200, {}, json.dumps({"success": False, "error": error})
+        if any(city in unknown for city in cities):
+            error = {"code": 615, "type": "request_failed", "info": "Not found"}
+            return 200, {}, json.dumps({"success": False, "error": error})
+
+        locations = [make_location(city) for city in cities]
+        currents = [make_current(i) for i, _ in enumerate(cities)]
+        if len(cities) == 1:
+            locations, currents = locations[0], currents[0]
+        return 200, {}, json.dumps({"location": locations, "current": currents})
+
+    return callback
+
+
+class TestSplitResponse(unittest.TestCase):
+    def test_single_location(self):
+        data = {"location": make_location("London"), "current": make_current(18)}
+        [result] = split_response(["London"], data)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.response.location.name, "London")
+
+    def test_error_applies_to_every_query(self):
+        data = {
+            "success": False,
+            "error": {"code": 101, "type": "invalid_access_key", "info": "Bad key"},
+        }
+        results = split_response(["London", "Paris"], data)
+        self.assertEqual([r.error.code for r in results], [101, 101])
+
+    def test_unexpected_shapes_become_client_errors(self):
+        for data in [
+            {"current": make_current(18)},
+            {"success": False, "error": "rate limited"},
+            {"success": False, "error": {"code": "x"}},
+            ["not", "an", "object"],
+        ]:
+            results = split_response(["London", "Paris"], data)
+            self.assertEqual([r.error.type for r in results], ["client_error"] * 2)
+
+
+class TestMultiResponse(unittest.TestCase):
+    def test_responses_leave_the_model_unchanged(self):
+        request = {"type": "City", "query": "London", "language": "en", "unit": "m"}
+        multi = WeatherstackMultiResponse(
+            request=[request],
+            location=[make_location("London"), make_location("Paris")],
+            current=[make_current(18), make_current(20)],
+        )
+
+        for _ in range(2):
+            responses = multi.responses()
+            self.assertEqual(responses[0].request.query, "London")
+            self.assertIsNone(responses[1].request)
+        self.assertEqual(len(multi.request), 1)
+
+
+class TestBulkWeatherClient(unittest.TestCase):
+    @responses.activate
+    def test_batches_and_per_location_errors(self):
+        responses.add_callback(
+            responses.GET, BASE_URL, callback=weather_callback(unknown={"Atlantis"})
+        )
+        cities = [f"City{i}" for i in range(7)] + ["Atlantis"]
+
+        with BulkWeatherClient(api_key="test", batch_size=3) as client:
+            results = {r.query: r for r in client.get_weather(cities)}
+
+        self.assertEqual(set(results), set(cities))
+        self.assertFalse(results["Atlantis"].ok)
+        self.assertEqual(results["Atlantis"].error.code, 615)
+        self.assertEqual(results["City4"].response.location.name, "City4")
+        # 3 batches, plus 2 single retries to isolate Atlantis in the last one
+        self.assertEqual(len(responses.calls), 5)
+
+    @responses.activate
+    def test_falls_back_when_bulk_is_not_supported(self):
+        responses.add_callback(
+            responses.GET, BASE_URL, callback=weather_callback(bulk_supported=False)
+        )
+
+        with BulkWeatherClient(api_key="test", batch_size=2, concurrency=1) as client:
+            results = list(client.get_weather(["Köln", "Paris", "Rome"]))
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual({r.query for r in results}, {"Koln", "Paris", "Rome"})
+        self.assertEqual(client.batch_size, 1)
+
+    @responses.activate
+    def test_malformed_batch_does_not_end_the_stream(self):
+        def callback(request):
+            query = parse_qs(urlsplit(request.url).query)["query"][0]
+            if "Broken" in query:
+                return 200, {}, json.dumps({"success": False, "error": []})
+            return weather_callback()(request)
+
+        responses.add_callback(responses.GET, BASE_URL, callback=callback)
+
+        with BulkWeatherClient(api_key="test", batch_size=2) as client:
+            results = {r.query: r for r in client.get_weather(["A", "Broken", "C"])}
+
+        self.assertTrue(results["C"].ok)
+        self.assertEqual(results["Broken"].error.type, "client_error")
+
+    @responses.activate
+    def test_failed_background_refresh_is_logged_and_counted(self):
+        responses.add_callback(
+            responses.GET, BASE_URL, callback=weather_callback(unknown={"Atlantis"})
+        )
+        cache = WeatherCache(ttl=0, stale_ttl=60)
+        cache.set(
+            canonical_location_key("Atlantis"),
+            json.dumps(
+                {"location": make_location("Atlantis"), "current": make_current(1)}
+            ).encode(),
+        )
+
+        with BulkWeatherClient(api_key="test", cache=cache) as client:
+            with self.assertLogs("cache", level="ERROR") as logs:
+                results = client.fetch_batch(["Atlantis"])
+                cache.close()
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(cache.refresh_failures, 1)
+        self.assertIn("Atlantis: Not found", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import responses
+
+# Add the current directory to the path so we can import cache
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backends import BASE_URL
+from bulk import BulkWeatherClient
+from cache import WeatherCache, canonical_location_key
+from main import get_weather
+from test_bulk import make_current, make_location, weather_callback
+
+
+class TestCanonicalLocationKey(unittest.TestCase):
+    def test_city_spellings_share_a_key(self):
+        self.assertEqual(canonical_location_key("Köln"), "koln")
+        self.assertEqual(canonical_location_key("  KOLN "), "koln")
+        self.assertEqual(canonical_location_key("New  York"), "new york")
+
+    def test_coordinates_are_rounded(self):
+        self.assertEqual(canonical_location_key("40.7128,-74.0060"), "40.71,-74.01")
+        self.assertEqual(canonical_location_key("40.71, -74.01"), "40.71,-74.01")
+
+
+class TestWeatherCache(unittest.TestCase):
+    def test_fresh_hit_skips_fetch(self):
+        cache = WeatherCache(ttl=60)
+        fetch = Mock(return_value=b"{}")
+        cache.get_or_fetch("london", fetch)
+        cache.get_or_fetch("london", fetch)
+        fetch.assert_called_once()
+        cache.close()
+
+    def test_stale_hit_is_served_and_refreshed_in_background(self):
+        cache = WeatherCache(ttl=0, stale_ttl=60)
+        cache.set("london", b"old")
+        refreshed = threading.Event()
+
+        def fetch():
+            refreshed.set()
+            return b"new"
+
+        self.assertEqual(cache.get_or_fetch("london", fetch), b"old")
+        self.assertTrue(refreshed.wait(1))
+        cache.close()
+        self.assertEqual(cache.get("london").value, b"new")
+
+    def test_expired_entry_is_refetched(self):
+        cache = WeatherCache(ttl=0, stale_ttl=0)
+        cache.set("london", b"old")
+        self.assertEqual(cache.get_or_fetch("london", lambda: b"new"), b"new")
+        cache.close()
+
+    def test_uncacheable_values_are_not_stored(self):
+        cache = WeatherCache()
+        cache.get_or_fetch("atlantis", lambda: b"error", cacheable=lambda v: False)
+        self.assertIsNone(cache.get("atlantis"))
+        cache.close()
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weather.sqlite")
+            with WeatherCache(path=path) as cache:
+                cache.set("london", b"{}")
+            with WeatherCache(path=path) as cache:
+                self.assertEqual(cache.get("london").value, b"{}")
+
+    def test_expired_rows_are_pruned(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weather.sqlite")
+            with WeatherCache(ttl=0, stale_ttl=0, path=path) as cache:
+                cache.set("london", b"{}")
+                cache.set("paris", b"{}")
+                self.assertEqual(cache.prune(), 2)
+                self.assertEqual(cache.prune(), 0)
+
+    def test_failed_refresh_is_logged_and_counted(self):
+        cache = WeatherCache(ttl=0, stale_ttl=60)
+        cache.set("london", b"old")
+
+        def fetch():
+            raise ConnectionError("upstream down")
+
+        with self.assertLogs("cache", level="ERROR"):
+            self.assertEqual(cache.get_or_fetch("london", fetch), b"old")
+            cache.close()
+        self.assertEqual(cache.refresh_failures, 1)
+
+
+class TestCachedGetWeather(unittest.TestCase):
+    def setUp(self):
+        os.environ["WEATHERSTACK_API_KEY"] = "test_api_key"
+
+    @patch("backends.requests.Session.get")
+    def test_equivalent_queries_share_one_request(self, mock_get):
+        mock_response = Mock()
+        mock_response.content = json.dumps(
+            {"success": False, "error": {"code": 615, "type": "x", "info": "Nope"}}
+        ).encode()
+        mock_get.return_value = mock_response
+
+        with WeatherCache() as cache:
+            get_weather(city="Atlantis", cache=cache)
+            get_weather(city="Atlantis", cache=cache)
+        # Errors are never cached
+        self.assertEqual(mock_get.call_count, 2)
+
+        mock_response.content = json.dumps(
+            {"location": make_location("Koln"), "current": make_current(12)}
+        ).encode()
+        with WeatherCache() as cache:
+            first = get_weather(city="Köln", cache=cache)
+            second = get_weather(city="koln", cache=cache)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(first, second)
+
+    @responses.activate
+    def test_bulk_client_serves_repeat_locations_from_cache(self):
+        responses.add_callback(responses.GET, BASE_URL, callback=weather_callback())
+
+        with WeatherCache() as cache:
+            with BulkWeatherClient(api_key="test", cache=cache) as client:
+                first = {r.query: r for r in client.get_weather(["London", "Paris"])}
+                second = {r.query: r for r in client.get_weather(["Paris", "London"])}
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(first["Paris"].response, second["Paris"].response)
+
+
+if __name__ == "__main__":
+    unittest.main()
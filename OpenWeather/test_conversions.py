@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the current directory to the path so we can import conversions
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from conversions import (
+    celsius_to_fahrenheit,
+    convert,
+    derive,
+    dew_point,
+    heat_index,
+    wind_chill,
+)
+from models.current_weather import Units
+
+COLUMNS = {
+    "temperature": np.array([20, 32, -10], dtype=np.int16),
+    "feelslike": np.array([20, 41, -18], dtype=np.int16),
+    "humidity": np.array([50, 70, 80], dtype=np.uint8),
+    "wind_speed": np.array([36, 0, 20], dtype=np.int16),
+    "precip": np.array([25.4, 0, 2.54], dtype=np.float32),
+    "pressure": np.array([1015, 1010, 1030], dtype=np.int16),
+}
+
+
+class TestConversions(unittest.TestCase):
+    def test_celsius_to_fahrenheit(self):
+        np.testing.assert_allclose(
+            celsius_to_fahrenheit(np.array([-40, 0, 100])), [-40, 32, 212]
+        )
+
+    def test_convert_matches_weatherstack_units(self):
+        fahrenheit = convert(COLUMNS, Units.fahrenheit)
+        np.testing.assert_allclose(fahrenheit["temperature"], [68, 89.6, 14])
+        np.testing.assert_allclose(fahrenheit["wind_speed"][0], 22.369, atol=1e-3)
+        np.testing.assert_allclose(fahrenheit["precip"], [1, 0, 0.1], atol=1e-6)
+        self.assertIs(fahrenheit["pressure"], COLUMNS["pressure"])
+
+        scientific = convert(COLUMNS, Units.scientific)
+        np.testing.assert_allclose(scientific["temperature"][0], 293.15)
+        self.assertIs(
+            convert(COLUMNS, Units.metric)["temperature"], COLUMNS["temperature"]
+        )
+
+
+class TestDerivedMetrics(unittest.TestCase):
+    def test_dew_point(self):
+        np.testing.assert_allclose(dew_point([20], [50]), [9.3], atol=0.1)
+        # Saturated air: the dew point is the temperature
+        np.testing.assert_allclose(dew_point([15], [100]), [15], atol=1e-9)
+
+    def test_heat_index_matches_nws_table(self):
+        # 90°F at 70% reads 106°F in the NWS table, 70°F at 50% stays ~69°F
+        fahrenheit = celsius_to_fahrenheit(heat_index([32.22, 21.11], [70, 50]))
+        np.testing.assert_allclose(fahrenheit, [106, 69], atol=1)
+
+    def test_wind_chill(self):
+        np.testing.assert_allclose(wind_chill([-10], [20]), [-17.9], atol=0.1)
+        # Outside the formula's range the air temperature is returned
+        np.testing.assert_array_equal(wind_chill([15, -5], [30, 2]), [15, -5])
+
+    def test_derive_returns_one_value_per_row(self):
+        derived = derive(COLUMNS)
+        self.assertEqual(
+            set(derived), {"dew_point", "heat_index", "wind_chill", "wind_speed_ms"}
+        )
+        self.assertTrue(all(len(values) == 3 for values in derived.values()))
+        np.testing.assert_allclose(derived["wind_speed_ms"][0], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import responses
+
+# Add the current directory to the path so we can import export
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from backends import BASE_URL
+from bulk import BulkWeatherClient
+from export import (
+    ARROW_AVAILABLE,
+    ColumnarWriter,
+    export_weather,
+    iter_npy,
+    read_npy,
+    read_npz,
+)
+from models.current_weather import WeatherstackResponse
+from test_bulk import make_current, make_location, weather_callback
+
+
+def make_response(name, temperature):
+    return WeatherstackResponse(
+        location=make_location(name), current=make_current(temperature)
+    )
+
+
+class TestColumnarWriter(unittest.TestCase):
+    def test_npy_chunks_are_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ColumnarWriter(directory, chunk_size=2) as writer:
+                for i in range(3):
+                    writer.append(make_response(f"City{i}", i))
+
+            chunks = list(iter_npy(directory))
+            self.assertIsInstance(chunks[0]["temperature"], np.memmap)
+            self.assertEqual(list(chunks[1]["location"]), ["City2"])
+            columns = read_npy(directory)
+            self.assertEqual(list(columns["temperature"]), [0, 1, 2])
+            del chunks, columns  # release the mappings before cleanup
+
+    def test_refuses_to_mix_with_an_earlier_export(self):
+        for format in ("npy", "npz"):
+            with self.subTest(format=format):
+                with tempfile.TemporaryDirectory() as directory:
+                    with ColumnarWriter(directory, format=format) as writer:
+                        for i in range(5):
+                            writer.append(make_response(f"City{i}", i))
+
+                    with self.assertRaises(FileExistsError):
+                        ColumnarWriter(directory, format=format)
+
+    def test_npz_chunks_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ColumnarWriter(directory, format="npz", chunk_size=2) as writer:
+                for i in range(5):
+                    writer.append(make_response(f"City{i}", i))
+                self.assertEqual(writer.chunks_written, 2)
+            self.assertEqual(writer.chunks_written, 3)
+
+            columns = read_npz(directory)
+
+        self.assertEqual(list(columns["temperature"]), [0, 1, 2, 3, 4])
+        self.assertEqual(columns["temperature"].dtype.name, "int16")
+        self.assertEqual(columns["location"][4], "City4")
+        # Requested at 21:50 UTC, observed at 09:30 PM UTC
+        self.assertEqual(columns["observed_at"][0], 1719179400 - 20 * 60)
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ColumnarWriter("weather.csv", format="csv")
+
+    @unittest.skipUnless(ARROW_AVAILABLE, "pyarrow is not installed")
+    def test_arrow_file_is_readable_zero_copy(self):
+        import pyarrow as pa
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weather.arrow")
+            with ColumnarWriter(path, format="arrow", chunk_size=2) as writer:
+                for i in range(3):
+                    writer.append(make_response(f"City{i}", i))
+
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+                self.assertEqual(table.column("temperature").to_pylist(), [0, 1, 2])
+
+    @unittest.skipUnless(ARROW_AVAILABLE, "pyarrow is not installed")
+    def test_parquet_has_a_row_group_per_chunk(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weather.parquet")
+            with ColumnarWriter(path, format="parquet", chunk_size=2) as writer:
+                for i in range(3):
+                    writer.append(make_response(f"City{i}", i))
+
+            parquet = pq.ParquetFile(path)
+            self.assertEqual(parquet.num_row_groups, 2)
+            table = parquet.read()
+            self.assertEqual(table.column("location").to_pylist()[2], "City2")
+            self.assertEqual(table.schema.field("humidity").type, "uint8")
+
+
+class TestExportWeather(unittest.TestCase):
+    @responses.activate
+    def test_exports_successful_locations(self):
+        responses.add_callback(
+            responses.GET, BASE_URL, callback=weather_callback(unknown={"Atlantis"})
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            with BulkWeatherClient(api_key="test") as client:
+                rows = export_weather(
+                    ["London", "Atlantis", "Paris"], directory, client=client
+                )
+            columns = read_npy(directory)
+            self.assertEqual(rows, 2)
+            self.assertEqual(sorted(columns["location"]), ["London", "Paris"])
+            del columns
+
+
+if __name__ == "__main__":
+    unittest.main()
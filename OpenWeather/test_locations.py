@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+# Add the current directory to the path so we can import locations
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backends import BASE_URL
+from bulk import BulkWeatherClient
+from locations import LocationIndex
+from main import get_weather
+from models.current_weather import WeatherstackLocation
+from test_bulk import make_current, make_location, weather_callback
+
+COLOGNE = WeatherstackLocation(
+    **{**make_location("Cologne"), "lat": "50.933", "lon": "6.950"}
+)
+
+
+class TestLocationIndex(unittest.TestCase):
+    def test_spellings_share_a_resolution(self):
+        index = LocationIndex()
+        index.add("Köln", COLOGNE)
+        self.assertEqual(index.resolve("  KOLN "), "50.933,6.950")
+        self.assertEqual(index.resolve("Paris"), "Paris")
+
+    def test_first_resolution_is_pinned(self):
+        index = LocationIndex()
+        index.learn("Koln", COLOGNE)
+        index.learn("Koln", WeatherstackLocation(**make_location("Kolno")))
+        index.learn("50.933,6.950", COLOGNE)
+        self.assertEqual(index.get("koln").name, "Cologne")
+        self.assertEqual(len(index), 1)
+
+    def test_index_survives_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "locations.sqlite")
+            with LocationIndex(path) as index:
+                index.add("Köln", COLOGNE)
+            with LocationIndex(path) as index:
+                self.assertEqual(index.get("Köln"), COLOGNE)
+
+
+class TestResolvedGetWeather(unittest.TestCase):
+    def setUp(self):
+        os.environ["WEATHERSTACK_API_KEY"] = "test_api_key"
+
+    @patch("backends.requests.Session.get")
+    def test_known_locations_are_sent_by_coordinates(self, mock_get):
+        mock_response = Mock()
+        mock_response.content = json.dumps(
+            {
+                "location": [COLOGNE.model_dump(), make_location("Paris")],
+                "current": [make_current(12), make_current(20)],
+            }
+        ).encode()
+        mock_get.return_value = mock_response
+
+        index = LocationIndex()
+        get_weather(city="Köln,Paris", locations=index)
+        get_weather(city="koln,paris", locations=index)
+
+        queries = [call[1]["params"]["query"] for call in mock_get.call_args_list]
+        self.assertEqual(queries, ["Koln;Paris", "50.933,6.950;1.0,2.0"])
+
+
+class TestResolvedBulkWeatherClient(unittest.TestCase):
+    @responses.activate
+    def test_spellings_of_one_place_are_fetched_once(self):
+        responses.add_callback(responses.GET, BASE_URL, callback=weather_callback())
+        index = LocationIndex()
+        index.add("Köln", COLOGNE)
+
+        with BulkWeatherClient(api_key="test", locations=index) as client:
+            results = {r.query: r for r in client.get_weather(["Köln", "Cologne"])}
+            results.update(
+                (r.query, r) for r in client.get_weather(["Koln", "Cologne"])
+            )
+
+        sent = [
+            parse_qs(urlsplit(call.request.url).query)["query"][0]
+            for call in responses.calls
+        ]
+        self.assertEqual(sent, ["50.933,6.950;Cologne", "50.933,6.950;1.0,2.0"])
+        self.assertEqual(set(results), {"Koln", "Cologne"})
+        self.assertTrue(all(result.ok for result in results.values()))
+        self.assertEqual(index.get("Cologne").lat, "1.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
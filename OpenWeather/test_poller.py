@@ -0,0 +1,135 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add the current directory to the path so we can import poller
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bulk import LocationResult
+from models.current_weather import WeatherstackResponse, observed_at
+from poller import WeatherPoller, _Location, observation_age
+from test_bulk import make_current, make_location
+
+# 2024-06-23 21:40 UTC
+REQUESTED_AT = 1719178800
+
+
+def make_result(query, observation_time="09:30 PM"):
+    location = {**make_location(query), "localtime_epoch": REQUESTED_AT}
+    current = {**make_current(18), "observation_time": observation_time}
+    response = WeatherstackResponse(location=location, current=current)
+    return LocationResult(query=query, response=response)
+
+
+class FakeClient:
+    batch_size = 4
+    concurrency = 2
+
+    def __init__(self):
+        self.batches = []
+
+    def fetch_batch(self, queries):
+        self.batches.append(queries)
+        return [make_result(query) for query in queries]
+
+
+def poll(poller, updates):
+    """
+    Runs `poller` until `updates` results have been put on its queue
+    """
+
+    async def run():
+        poller.queue = asyncio.Queue()
+        task = asyncio.create_task(poller.run())
+        results = [await poller.queue.get() for _ in range(updates)]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return results
+
+    return asyncio.run(run())
+
+
+class TestObservationAge(unittest.TestCase):
+    def test_same_day(self):
+        self.assertEqual(observation_age(make_result("x").response), 10 * 60)
+
+    def test_observation_before_midnight(self):
+        result = make_result("x", observation_time="11:50 PM")
+        self.assertEqual(observation_age(result.response), 21 * 3600 + 50 * 60)
+
+    def test_local_time_is_converted_to_utc(self):
+        # Weatherstack's documented New York sample: 08:14 EDT, observed 12:14 UTC
+        location = {
+            **make_location("New York"),
+            "localtime": "2019-09-07 08:14",
+            "localtime_epoch": 1567844040,
+            "utc_offset": "-4.0",
+        }
+        current = {**make_current(13), "observation_time": "12:14 PM"}
+        response = WeatherstackResponse(location=location, current=current)
+        self.assertEqual(observation_age(response), 0)
+        self.assertEqual(observed_at(response).timestamp(), 1567858440)
+
+        # Half-hour offsets east of UTC, observed 10 minutes earlier
+        location.update(localtime_epoch=1567844040 + 9 * 3600, utc_offset="5.5")
+        current["observation_time"] = "11:34 AM"
+        response = WeatherstackResponse(location=location, current=current)
+        self.assertEqual(observation_age(response), 10 * 60)
+
+
+class TestWeatherPoller(unittest.TestCase):
+    def test_spellings_are_polled_once(self):
+        client = FakeClient()
+        poller = WeatherPoller(client, requests_per_second=100)
+        for location in ["Köln", "koln", " KOLN", "Paris"]:
+            poller.add(location)
+        self.assertEqual(len(poller), 2)
+
+        results = poll(poller, updates=2)
+        self.assertEqual({r.query for r in results}, {"Koln", "Paris"})
+        self.assertEqual(client.batches, [["Koln", "Paris"]])
+
+    def test_requests_are_batched_and_spread(self):
+        client = FakeClient()
+        poller = WeatherPoller(client, requests_per_second=20)
+        for i in range(10):
+            poller.add(f"City{i}")
+
+        start = time.monotonic()
+        poll(poller, updates=10)
+        self.assertEqual([len(batch) for batch in client.batches], [4, 4, 2])
+        # The first request goes out immediately, the others 50ms apart
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_callbacks_may_be_coroutines(self):
+        seen = []
+
+        async def on_update(result):
+            seen.append(result.query)
+
+        poller = WeatherPoller(FakeClient(), on_update=on_update)
+        poller.add("London")
+        poll(poller, updates=1)
+        self.assertEqual(seen, ["London"])
+
+    def test_refresh_follows_observations_and_backs_off(self):
+        poller = WeatherPoller(FakeClient(), interval=900, min_interval=60)
+        state = _Location(query="x")
+
+        # Observed 10 minutes ago, so the next one is due in about 5 minutes
+        delay = poller.refresh_delay(make_result("x"), state)
+        self.assertGreaterEqual(delay, 300)
+        self.assertLessEqual(delay, 330)
+
+        # No new observation: back off exponentially from min_interval
+        state.observation = "09:30 PM"
+        state.misses = 3
+        delay = poller.refresh_delay(make_result("x"), state)
+        self.assertGreaterEqual(delay, 240)
+        self.assertLessEqual(delay, 264)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,16 @@
+import json
 import os
 import sys
 import unittest
 from unittest.mock import Mock, patch
 
+import requests
+
 # Add the current directory to the path so we can import main
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from main import build_query_param, get_weather
+from main import build_query_param, format_weather_result, get_weather
+from models.current_weather import WeatherstackErrorResponse, WeatherstackResponse
 
 
 class TestWeatherFunctions(unittest.TestCase):
@@ -73,55 +77,56 @@ class TestWeatherFunctions(unittest.TestCase):
             query.count(";"), 0
         )  # No separators for single coordinate pair
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_success_city(self, mock_get):
         """Test successful weather fetch for a city"""
         # Mock successful response
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "request": {
-                "type": "City",
-                "query": "London, United Kingdom",
-                "language": "en",
-                "unit": "m",
-            },
-            "location": {
-                "name": "London",
-                "country": "United Kingdom",
-                "region": "City of London, Greater London",
-                "lat": "51.517",
-                "lon": "-0.106",
-                "timezone_id": "Europe/London",
-                "localtime": "2025-06-23 22:30",
-                "localtime_epoch": 1719179400,
-                "utc_offset": "1.0",
-            },
-            "current": {
-                "observation_time": "09:30 PM",
-                "temperature": 18,
-                "weather_code": 113,
-                "weather_icons": [
-                    "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0001_sunny.png"
-                ],
-                "weather_descriptions": ["Clear"],
-                "wind_speed": 15,
-                "wind_degree": 280,
-                "wind_dir": "W",
-                "pressure": 1015,
-                "precip": 0,
-                "humidity": 65,
-                "cloudcover": 0,
-                "feelslike": 18,
-                "uv_index": 5,
-                "visibility": 10,
-            },
-        }
+        mock_response.content = json.dumps(
+            {
+                "request": {
+                    "type": "City",
+                    "query": "London, United Kingdom",
+                    "language": "en",
+                    "unit": "m",
+                },
+                "location": {
+                    "name": "London",
+                    "country": "United Kingdom",
+                    "region": "City of London, Greater London",
+                    "lat": "51.517",
+                    "lon": "-0.106",
+                    "timezone_id": "Europe/London",
+                    "localtime": "2025-06-23 22:30",
+                    "localtime_epoch": 1719179400,
+                    "utc_offset": "1.0",
+                },
+                "current": {
+                    "observation_time": "09:30 PM",
+                    "temperature": 18,
+                    "weather_code": 113,
+                    "weather_icons": [
+                        "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0001_sunny.png"
+                    ],
+                    "weather_descriptions": ["Clear"],
+                    "wind_speed": 15,
+                    "wind_degree": 280,
+                    "wind_dir": "W",
+                    "pressure": 1015,
+                    "precip": 0,
+                    "humidity": 65,
+                    "cloudcover": 0,
+                    "feelslike": 18,
+                    "uv_index": 5,
+                    "visibility": 10,
+                },
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
-        # Capture print output
         with patch("builtins.print") as mock_print:
-            get_weather(city="London")
+            result = get_weather(city="London")
 
             # Verify the API was called correctly
             mock_get.assert_called_once()
@@ -129,57 +134,62 @@ class TestWeatherFunctions(unittest.TestCase):
             self.assertEqual(call_args[1]["params"]["query"], "London")
             self.assertEqual(call_args[1]["params"]["access_key"], "test_api_key")
 
-            # Verify output was printed
-            mock_print.assert_called()
+            # Verify the parsed response was returned without printing
+            self.assertIsInstance(result, WeatherstackResponse)
+            self.assertEqual(result.location.name, "London")
+            self.assertEqual(result.current.temperature, 18)
+            mock_print.assert_not_called()
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_success_coordinates(self, mock_get):
         """Test successful weather fetch for coordinates"""
         # Mock successful response
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "request": {
-                "type": "LatLon",
-                "query": "Lat 40.71 and Lon -74.01",
-                "language": "en",
-                "unit": "m",
-            },
-            "location": {
-                "name": "New York",
-                "country": "United States of America",
-                "region": "New York",
-                "lat": "40.714",
-                "lon": "-74.006",
-                "timezone_id": "America/New_York",
-                "localtime": "2025-06-23 17:30",
-                "localtime_epoch": 1719161400,
-                "utc_offset": "-4.0",
-            },
-            "current": {
-                "observation_time": "09:30 PM",
-                "temperature": 25,
-                "weather_code": 116,
-                "weather_icons": [
-                    "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0002_sunny_intervals.png"
-                ],
-                "weather_descriptions": ["Partly cloudy"],
-                "wind_speed": 12,
-                "wind_degree": 270,
-                "wind_dir": "W",
-                "pressure": 1013,
-                "precip": 0,
-                "humidity": 60,
-                "cloudcover": 25,
-                "feelslike": 26,
-                "uv_index": 6,
-                "visibility": 16,
-            },
-        }
+        mock_response.content = json.dumps(
+            {
+                "request": {
+                    "type": "LatLon",
+                    "query": "Lat 40.71 and Lon -74.01",
+                    "language": "en",
+                    "unit": "m",
+                },
+                "location": {
+                    "name": "New York",
+                    "country": "United States of America",
+                    "region": "New York",
+                    "lat": "40.714",
+                    "lon": "-74.006",
+                    "timezone_id": "America/New_York",
+                    "localtime": "2025-06-23 17:30",
+                    "localtime_epoch": 1719161400,
+                    "utc_offset": "-4.0",
+                },
+                "current": {
+                    "observation_time": "09:30 PM",
+                    "temperature": 25,
+                    "weather_code": 116,
+                    "weather_icons": [
+                        "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0002_sunny_intervals.png"
+                    ],
+                    "weather_descriptions": ["Partly cloudy"],
+                    "wind_speed": 12,
+                    "wind_degree": 270,
+                    "wind_dir": "W",
+                    "pressure": 1013,
+                    "precip": 0,
+                    "humidity": 60,
+                    "cloudcover": 25,
+                    "feelslike": 26,
+                    "uv_index": 6,
+                    "visibility": 16,
+                },
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
         with patch("builtins.print") as mock_print:
-            get_weather(lat=40.7128, lon=-74.0060)
+            result = get_weather(lat=40.7128, lon=-74.0060)
 
             # Verify the API was called correctly
             mock_get.assert_called_once()
@@ -190,244 +200,240 @@ class TestWeatherFunctions(unittest.TestCase):
             self.assertIn("-74.006", query_param)
             self.assertIn(",", query_param)
 
-            # Verify output was printed
-            mock_print.assert_called()
+            self.assertEqual(result.location.name, "New York")
+            mock_print.assert_not_called()
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_city_not_found(self, mock_get):
         """Test weather fetch for non-existent city"""
         # Mock error response
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "success": False,
-            "error": {
-                "code": 615,
-                "type": "request_failed",
-                "info": "API request failed.",
-            },
-        }
+        mock_response.content = json.dumps(
+            {
+                "success": False,
+                "error": {
+                    "code": 615,
+                    "type": "request_failed",
+                    "info": "API request failed.",
+                },
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
-        with patch("builtins.print") as mock_print:
-            get_weather(city="NonExistentCity")
+        result = get_weather(city="NonExistentCity")
 
-            # Verify error message was printed
-            mock_print.assert_called_with("Error: API request failed.")
+        # Verify the error was returned
+        self.assertIsInstance(result, WeatherstackErrorResponse)
+        self.assertEqual(result.error.code, 615)
+        self.assertEqual(format_weather_result(result), "Error: API request failed.")
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_api_unavailable(self, mock_get):
         """Test weather fetch when API is unavailable"""
         # Mock HTTP error
         mock_get.side_effect = Exception("Connection failed")
 
-        with patch("builtins.print") as mock_print:
+        with self.assertRaisesRegex(Exception, "Connection failed"):
             get_weather(city="London")
 
-            # Verify error message was printed
-            mock_print.assert_called_with("Error: Connection failed")
-
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_missing_api_key(self, mock_get):
         """Test weather fetch with missing API key"""
         # Remove API key from environment
         if "WEATHERSTACK_API_KEY" in os.environ:
             del os.environ["WEATHERSTACK_API_KEY"]
 
-        with patch("builtins.print") as mock_print:
+        with self.assertRaisesRegex(ValueError, "Missing WEATHERSTACK_API_KEY"):
             get_weather(city="London")
 
-            # Verify error message was printed
-            mock_print.assert_called_with("Missing WEATHERSTACK_API_KEY in .env file.")
-
-            # Verify API was not called
-            mock_get.assert_not_called()
+        # Verify API was not called
+        mock_get.assert_not_called()
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_http_error(self, mock_get):
         """Test weather fetch with HTTP error"""
         # Mock HTTP error
         mock_get.side_effect = Exception("HTTP 500 Internal Server Error")
 
-        with patch("builtins.print") as mock_print:
+        with self.assertRaisesRegex(Exception, "HTTP 500 Internal Server Error"):
             get_weather(city="London")
 
-            # Verify error message was printed
-            mock_print.assert_called_with("Error: HTTP 500 Internal Server Error")
-
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_invalid_response(self, mock_get):
         """Test weather fetch with invalid JSON response"""
         # Mock invalid response
         mock_response = Mock()
-        mock_response.json.side_effect = ValueError("Invalid JSON")
+        mock_response.content = b"Invalid JSON"
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
-        with patch("builtins.print") as mock_print:
+        with self.assertRaisesRegex(ValueError, "Invalid JSON"):
             get_weather(city="London")
 
-            # Verify error message was printed
-            mock_print.assert_called_with("Error: Invalid JSON")
-
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_multiple_cities(self, mock_get):
         """Test successful weather fetch for multiple cities in one request"""
         # Mock successful response for multiple cities
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "location": [
-                {
-                    "name": "London",
-                    "country": "United Kingdom",
-                    "region": "City of London, Greater London",
-                    "lat": "51.517",
-                    "lon": "-0.106",
-                    "timezone_id": "Europe/London",
-                    "localtime": "2025-06-23 22:30",
-                    "localtime_epoch": 1719179400,
-                    "utc_offset": "1.0",
-                },
-                {
-                    "name": "Paris",
-                    "country": "France",
-                    "region": "Ile-de-France",
-                    "lat": "48.853",
-                    "lon": "2.349",
-                    "timezone_id": "Europe/Paris",
-                    "localtime": "2025-06-23 23:30",
-                    "localtime_epoch": 1719183000,
-                    "utc_offset": "2.0",
-                },
-            ],
-            "current": [
-                {
-                    "observation_time": "09:30 PM",
-                    "temperature": 18,
-                    "weather_code": 113,
-                    "weather_icons": [
-                        "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0001_sunny.png"
-                    ],
-                    "weather_descriptions": ["Clear"],
-                    "wind_speed": 15,
-                    "wind_degree": 280,
-                    "wind_dir": "W",
-                    "pressure": 1015,
-                    "precip": 0,
-                    "humidity": 65,
-                    "cloudcover": 0,
-                    "feelslike": 18,
-                    "uv_index": 5,
-                    "visibility": 10,
-                },
-                {
-                    "observation_time": "10:30 PM",
-                    "temperature": 20,
-                    "weather_code": 116,
-                    "weather_icons": [
-                        "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0002_sunny_intervals.png"
-                    ],
-                    "weather_descriptions": ["Partly cloudy"],
-                    "wind_speed": 10,
-                    "wind_degree": 250,
-                    "wind_dir": "WSW",
-                    "pressure": 1012,
-                    "precip": 0,
-                    "humidity": 60,
-                    "cloudcover": 20,
-                    "feelslike": 21,
-                    "uv_index": 6,
-                    "visibility": 12,
-                },
-            ],
-        }
+        mock_response.content = json.dumps(
+            {
+                "location": [
+                    {
+                        "name": "London",
+                        "country": "United Kingdom",
+                        "region": "City of London, Greater London",
+                        "lat": "51.517",
+                        "lon": "-0.106",
+                        "timezone_id": "Europe/London",
+                        "localtime": "2025-06-23 22:30",
+                        "localtime_epoch": 1719179400,
+                        "utc_offset": "1.0",
+                    },
+                    {
+                        "name": "Paris",
+                        "country": "France",
+                        "region": "Ile-de-France",
+                        "lat": "48.853",
+                        "lon": "2.349",
+                        "timezone_id": "Europe/Paris",
+                        "localtime": "2025-06-23 23:30",
+                        "localtime_epoch": 1719183000,
+                        "utc_offset": "2.0",
+                    },
+                ],
+                "current": [
+                    {
+                        "observation_time": "09:30 PM",
+                        "temperature": 18,
+                        "weather_code": 113,
+                        "weather_icons": [
+                            "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0001_sunny.png"
+                        ],
+                        "weather_descriptions": ["Clear"],
+                        "wind_speed": 15,
+                        "wind_degree": 280,
+                        "wind_dir": "W",
+                        "pressure": 1015,
+                        "precip": 0,
+                        "humidity": 65,
+                        "cloudcover": 0,
+                        "feelslike": 18,
+                        "uv_index": 5,
+                        "visibility": 10,
+                    },
+                    {
+                        "observation_time": "10:30 PM",
+                        "temperature": 20,
+                        "weather_code": 116,
+                        "weather_icons": [
+                            "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0002_sunny_intervals.png"
+                        ],
+                        "weather_descriptions": ["Partly cloudy"],
+                        "wind_speed": 10,
+                        "wind_degree": 250,
+                        "wind_dir": "WSW",
+                        "pressure": 1012,
+                        "precip": 0,
+                        "humidity": 60,
+                        "cloudcover": 20,
+                        "feelslike": 21,
+                        "uv_index": 6,
+                        "visibility": 12,
+                    },
+                ],
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
-        with patch("builtins.print") as mock_print:
-            get_weather(city="London,Paris")
-            # Verify the API was called with semicolon-separated cities
-            call_args = mock_get.call_args
-            self.assertEqual(call_args[1]["params"]["query"], "London;Paris")
-            # Verify output was printed for both cities
-            self.assertTrue(mock_print.call_count > 1)
+        result = get_weather(city="London,Paris")
+        # Verify the API was called with semicolon-separated cities
+        call_args = mock_get.call_args
+        self.assertEqual(call_args[1]["params"]["query"], "London;Paris")
+        # Verify one response per city, in query order
+        self.assertEqual([r.location.name for r in result], ["London", "Paris"])
+        self.assertEqual([r.current.temperature for r in result], [18, 20])
+        self.assertEqual(format_weather_result(result).count("Location:"), 2)
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_city_and_coordinates(self, mock_get):
         """Test successful weather fetch for both city and coordinates"""
         # Mock successful response for city + coordinates
         mock_response = Mock()
-        mock_response.json.return_value = {
-            "location": [
-                {
-                    "name": "London",
-                    "country": "United Kingdom",
-                    "region": "City of London, Greater London",
-                    "lat": "51.517",
-                    "lon": "-0.106",
-                    "timezone_id": "Europe/London",
-                    "localtime": "2025-06-23 22:30",
-                    "localtime_epoch": 1719179400,
-                    "utc_offset": "1.0",
-                },
-                {
-                    "name": "New York",
-                    "country": "United States of America",
-                    "region": "New York",
-                    "lat": "40.714",
-                    "lon": "-74.006",
-                    "timezone_id": "America/New_York",
-                    "localtime": "2025-06-23 17:30",
-                    "localtime_epoch": 1719161400,
-                    "utc_offset": "-4.0",
-                },
-            ],
-            "current": [
-                {
-                    "observation_time": "09:30 PM",
-                    "temperature": 18,
-                    "weather_code": 113,
-                    "weather_icons": [
-                        "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0001_sunny.png"
-                    ],
-                    "weather_descriptions": ["Clear"],
-                    "wind_speed": 15,
-                    "wind_degree": 280,
-                    "wind_dir": "W",
-                    "pressure": 1015,
-                    "precip": 0,
-                    "humidity": 65,
-                    "cloudcover": 0,
-                    "feelslike": 18,
-                    "uv_index": 5,
-                    "visibility": 10,
-                },
-                {
-                    "observation_time": "09:30 PM",
-                    "temperature": 25,
-                    "weather_code": 116,
-                    "weather_icons": [
-                        "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0002_sunny_intervals.png"
-                    ],
-                    "weather_descriptions": ["Partly cloudy"],
-                    "wind_speed": 12,
-                    "wind_degree": 270,
-                    "wind_dir": "W",
-                    "pressure": 1013,
-                    "precip": 0,
-                    "humidity": 60,
-                    "cloudcover": 25,
-                    "feelslike": 26,
-                    "uv_index": 6,
-                    "visibility": 16,
-                },
-            ],
-        }
+        mock_response.content = json.dumps(
+            {
+                "location": [
+                    {
+                        "name": "London",
+                        "country": "United Kingdom",
+                        "region": "City of London, Greater London",
+                        "lat": "51.517",
+                        "lon": "-0.106",
+                        "timezone_id": "Europe/London",
+                        "localtime": "2025-06-23 22:30",
+                        "localtime_epoch": 1719179400,
+                        "utc_offset": "1.0",
+                    },
+                    {
+                        "name": "New York",
+                        "country": "United States of America",
+                        "region": "New York",
+                        "lat": "40.714",
+                        "lon": "-74.006",
+                        "timezone_id": "America/New_York",
+                        "localtime": "2025-06-23 17:30",
+                        "localtime_epoch": 1719161400,
+                        "utc_offset": "-4.0",
+                    },
+                ],
+                "current": [
+                    {
+                        "observation_time": "09:30 PM",
+                        "temperature": 18,
+                        "weather_code": 113,
+                        "weather_icons": [
+                            "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0001_sunny.png"
+                        ],
+                        "weather_descriptions": ["Clear"],
+                        "wind_speed": 15,
+                        "wind_degree": 280,
+                        "wind_dir": "W",
+                        "pressure": 1015,
+                        "precip": 0,
+                        "humidity": 65,
+                        "cloudcover": 0,
+                        "feelslike": 18,
+                        "uv_index": 5,
+                        "visibility": 10,
+                    },
+                    {
+                        "observation_time": "09:30 PM",
+                        "temperature": 25,
+                        "weather_code": 116,
+                        "weather_icons": [
+                            "https://assets.weatherstack.com/images/wsymbols01_png_64/wsymbol_0002_sunny_intervals.png"
+                        ],
+                        "weather_descriptions": ["Partly cloudy"],
+                        "wind_speed": 12,
+                        "wind_degree": 270,
+                        "wind_dir": "W",
+                        "pressure": 1013,
+                        "precip": 0,
+                        "humidity": 60,
+                        "cloudcover": 25,
+                        "feelslike": 26,
+                        "uv_index": 6,
+                        "visibility": 16,
+                    },
+                ],
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
         with patch("builtins.print") as mock_print:
-            get_weather(city="London", lat=40.7128, lon=-74.0060)
+            result = get_weather(city="London", lat=40.7128, lon=-74.0060)
 
             # Verify the API was called with both city and coordinates
             mock_get.assert_called_once()
@@ -438,10 +444,11 @@ class TestWeatherFunctions(unittest.TestCase):
             self.assertIn("-74.006", query_param)
             self.assertIn(";", query_param)
 
-            # Verify output was printed for both locations
-            self.assertTrue(mock_print.call_count > 1)
+            # Verify a response was returned for both locations
+            self.assertEqual([r.location.name for r in result], ["London", "New York"])
+            mock_print.assert_not_called()
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_garbage_city_input(self, mock_get):
         """Test weather fetch with garbage/invalid city names"""
         # Test inputs that should raise ValueError (empty/whitespace)
@@ -472,31 +479,31 @@ class TestWeatherFunctions(unittest.TestCase):
             with self.subTest(garbage_input=garbage_input):
                 # Mock error response for invalid city
                 mock_response = Mock()
-                mock_response.json.return_value = {
-                    "success": False,
-                    "error": {
-                        "code": 615,
-                        "type": "request_failed",
-                        "info": "API request failed.",
-                    },
-                }
+                mock_response.content = json.dumps(
+                    {
+                        "success": False,
+                        "error": {
+                            "code": 615,
+                            "type": "request_failed",
+                            "info": "API request failed.",
+                        },
+                    }
+                ).encode()
                 mock_response.raise_for_status.return_value = None
                 mock_get.return_value = mock_response
 
-                with patch("builtins.print") as mock_print:
-                    get_weather(city=garbage_input)
+                result = get_weather(city=garbage_input)
 
-                    # Verify the API was called (even with garbage input)
-                    mock_get.assert_called()
+                # Verify the API was called (even with garbage input)
+                mock_get.assert_called()
 
-                    # Verify error message was printed
-                    mock_print.assert_called_with("Error: API request failed.")
+                # Verify the error was returned
+                self.assertEqual(result.error.info, "API request failed.")
 
-                    # Reset mock for next iteration
-                    mock_get.reset_mock()
-                    mock_print.reset_mock()
+                # Reset mock for next iteration
+                mock_get.reset_mock()
 
-    @patch("main.requests.get")
+    @patch("backends.requests.Session.get")
     def test_get_weather_malformed_city_input(self, mock_get):
         """
         Test weather fetch with malformed city input that
@@ -518,31 +525,34 @@ class TestWeatherFunctions(unittest.TestCase):
             with self.subTest(malformed_input=malformed_input):
                 # Mock error response for malformed input
                 mock_response = Mock()
-                mock_response.json.return_value = {
-                    "success": False,
-                    "error": {
-                        "code": 601,
-                        "type": "missing_query",
-                        "info": "An invalid (or missing) query value was specified.",
-                    },
-                }
+                mock_response.content = json.dumps(
+                    {
+                        "success": False,
+                        "error": {
+                            "code": 601,
+                            "type": "missing_query",
+                            "info": (
+                                "An invalid (or missing) query value was specified."
+                            ),
+                        },
+                    }
+                ).encode()
                 mock_response.raise_for_status.return_value = None
                 mock_get.return_value = mock_response
 
-                with patch("builtins.print") as mock_print:
-                    get_weather(city=malformed_input)
+                result = get_weather(city=malformed_input)
 
-                    # Verify the API was called
-                    mock_get.assert_called()
+                # Verify the API was called
+                mock_get.assert_called()
 
-                    # Verify error message was printed
-                    mock_print.assert_called_with(
-                        "Error: An invalid (or missing) query value was specified."
-                    )
+                # Verify the error was returned
+                self.assertEqual(
+                    format_weather_result(result),
+                    "Error: An invalid (or missing) query value was specified.",
+                )
 
-                    # Reset mock for next iteration
-                    mock_get.reset_mock()
-                    mock_print.reset_mock()
+                # Reset mock for next iteration
+                mock_get.reset_mock()
 
 
 class TestWeatherAPI(unittest.TestCase):
@@ -550,24 +560,14 @@ class TestWeatherAPI(unittest.TestCase):
     def test_koln(self):
         """Test Koln"""
         # This test requires a real API key and makes an actual API call
-        # Capture the printed output
-        import sys
-        from io import StringIO
-
-        captured_output = StringIO()
-        sys.stdout = captured_output
-
         try:
             # Make the actual API call with "Köln"
-            get_weather(city="Köln")
+            result = get_weather(city="Köln")
         except Exception as e:
             # If API key is missing or other issues, skip the test
             self.skipTest(f"API test skipped due to: {e}")
-        finally:
-            sys.stdout = sys.__stdout__
 
-        # Get the captured output
-        output = captured_output.getvalue()
+        output = format_weather_result(result)
 
         # Verify the API returned Kolno, Poland (the expected result for "Koln")
         self.assertIn("Kolno", output)
@@ -584,11 +584,14 @@ class TestWeatherIntegration(unittest.TestCase):
         if not os.getenv("WEATHERSTACK_API_KEY"):
             self.skipTest("No API key provided for integration test")
 
-        with patch("builtins.print") as mock_print:
-            get_weather(city="London")
-            get_weather(city="London, Paris, Berlin")
-            # Verify that some output was printed (indicating success)
-            self.assertTrue(mock_print.called)
+        try:
+            single = get_weather(city="London")
+            multiple = get_weather(city="London, Paris, Berlin")
+        except requests.RequestException as e:
+            self.skipTest(f"API test skipped due to: {e}")
+
+        self.assertIsInstance(single, WeatherstackResponse)
+        self.assertEqual(len(multiple), 3)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,355 @@
+import asyncio
+import json
+import time
+from collections import deque
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+from urllib.parse import urljoin
+
+import httpx
+from app.cache import CacheEntry, ResponseCache, cache_key, revalidation_headers
+from app.models.pokemon import LazyPokemon, Move, Pokemon, PokemonBase
+from app.models.projection import projection
+from app.models.request_params import PaginationParams
+from app.models.response_lists import (
+    NamedResource,
+    ResourceList,
+    T,
+    UnnamedResource,
+)
+from app.pokeapi import BASE_URL, DEFAULT_PAGE_SIZE, ENDPOINTS, M
+from app.throttle import THROTTLED_STATUSES, RateLimiter, backoff_delay
+from app.transport import TransportConfig, build_async_client
+from pydantic import BaseModel, ValidationError
+
+DEFAULT_CONCURRENCY: Final = 10
+
+
+class AsyncPokeAPI:
+    """
+    asyncio counterpart of PokeAPI. All requests share a single connection pool,
+    so use it as an async context manager (or call aclose) when done.
+
+    Without an explicit `config`, the pool is sized to match `concurrency`.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        config: Optional[TransportConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        lazy_moves: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = concurrency
+        self.cache = cache
+        self.limiter = limiter or RateLimiter()
+        self.pokemon_model = LazyPokemon if lazy_moves else Pokemon
+        self.config = config or TransportConfig(pool_size=concurrency)
+        self._client = build_async_client(self.config, transport)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def __aenter__(self) -> "AsyncPokeAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def get_pokemon(
+        self, name, fields: Optional[Sequence[str]] = None
+    ) -> Pokemon | LazyPokemon | tuple:
+        """
+        Returns the pokemon, or with `fields` only those fields as a compact
+        namedtuple (see projection)
+        """
+        url = urljoin(BASE_URL, ENDPOINTS.get_pokemon(name))
+        model = projection(Pokemon, fields) if fields else self.pokemon_model
+        return await self._get_model(url, model)
+
+    async def get_move(self, pokemon: PokemonBase) -> Move:
+        return await self.resolve(pokemon.moves[0].move, Move)
+
+    async def resolve(self, ref: UnnamedResource, model: Type[M]) -> M:
+        """
+        Fetches the resource behind a name/url reference, e.g.
+        `await resolve(pokemon.moves[3].move, Move)`. Concurrent resolutions of the
+        same url share a single request.
+        """
+        return await self._get_model(ref.url, model)
+
+    async def resolve_all(
+        self,
+        pokemon: PokemonBase | Iterable[PokemonBase],
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Move]:
+        """
+        Resolves every move of one or more pokemon, keyed by move name. Moves
+        shared between pokemon (or listed twice) are only fetched once.
+        """
+        team = [pokemon] if isinstance(pokemon, PokemonBase) else pokemon
+        refs = {wrapper.move.url: wrapper.move for p in team for wrapper in p.moves}
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def fetch(ref: UnnamedResource) -> Move:
+            async with semaphore:
+                return await self.resolve(ref, Move)
+
+        moves = await asyncio.gather(*(fetch(ref) for ref in refs.values()))
+        return {move.name: move for move in moves}
+
+    async def list_pokemon(self, count: int = 20, parallel: bool = False) -> List:
+        """
+        Returns the first n pokemon. With `parallel`, every page after the first is
+        fetched concurrently instead of following `next` links one at a time.
+        """
+        if parallel:
+            return await self.list_resources(ENDPOINTS.list_pokemon, count=count)
+
+        url = urljoin(BASE_URL, ENDPOINTS.list_pokemon)
+        params = PaginationParams(limit=count)
+        results = []
+
+        while url and len(results) < count:
+            response_dict = await self._make_get_request(url, params)
+            pokemon_list = ResourceList[NamedResource](**response_dict)
+            url = pokemon_list.next
+            results += pokemon_list.results
+            params = None  # Only needed for first request
+
+        return results
+
+    def stream_pokemon(
+        self, count: Optional[int] = None
+    ) -> AsyncIterator[NamedResource]:
+        """
+        Yields the first n pokemon (or all of them) as their pages arrive
+        """
+        return self.stream_resources(ENDPOINTS.list_pokemon, count=count)
+
+    async def list_resources(
+        self,
+        endpoint: str,
+        model: Type[T] = NamedResource,
+        count: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: Optional[int] = None,
+    ) -> List[T]:
+        """
+        Returns the first n resources of any list endpoint, in API order
+        """
+        return [
+            resource
+            async for resource in self.stream_resources(
+                endpoint, model, count, page_size, concurrency
+            )
+        ]
+
+    def iter_resources(
+        self,
+        endpoint: str,
+        model: Type[T] = NamedResource,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: int = 1,
+    ) -> AsyncIterator[T]:
+        """
+        Lazily walks every resource of a list endpoint, e.g.
+        `iter_resources(ENDPOINTS.list_moves)` or
+        `iter_resources(ENDPOINTS.list_evolution_chains, UnnamedResource)`.
+
+        Only `prefetch` pages are held or in flight at once, so memory stays flat
+        however many resources are walked, while the next page downloads as the
+        current one is consumed.
+        """
+        return self.stream_resources(
+            endpoint, model, page_size=page_size, concurrency=prefetch
+        )
+
+    async def stream_resources(
+        self,
+        endpoint: str,
+        model: Type[T] = NamedResource,
+        count: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Yields the first n resources (or all of them) of any list endpoint.
+
+        The first page reports the total `count`, so every remaining
+        PaginationParams window is known up front and fetched concurrently,
+        keeping at most `concurrency` pages in flight. Items are still yielded in
+        API order.
+        """
+        url = urljoin(BASE_URL, endpoint)
+        limit = page_size if count is None else min(count, page_size)
+        first_page = await self._get_page(url, PaginationParams(limit=limit), model)
+
+        total = first_page.count if count is None else min(count, first_page.count)
+        windows = iter(
+            PaginationParams.windows(total, page_size, start=len(first_page.results))
+        )
+        concurrency = concurrency or self.concurrency
+
+        def schedule(params: PaginationParams) -> asyncio.Task:
+            return asyncio.create_task(self._get_page(url, params, model))
+
+        pending = deque(schedule(params) for params in islice(windows, concurrency))
+        try:
+            for resource in first_page.results[:total]:
+                yield resource
+            while pending:
+                page = await pending.popleft()
+                pending.extend(schedule(params) for params in islice(windows, 1))
+                for resource in page.results:
+                    yield resource
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_many(
+        self,
+        names: Iterable[str],
+        concurrency: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Pokemon | LazyPokemon | tuple]:
+        """
+        Fetches every named pokemon with at most `concurrency` requests in flight.
+        Results are returned in the same order as `names`, projected to `fields`
+        if given.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def fetch(name: str) -> Pokemon | LazyPokemon | tuple:
+            async with semaphore:
+                return await self.get_pokemon(name, fields)
+
+        return list(await asyncio.gather(*(fetch(name) for name in names)))
+
+    async def _get_page(
+        self, url: str, params: PaginationParams, model: Type[T]
+    ) -> ResourceList[T]:
+        return await self._get_model(url, ResourceList[model], params)
+
+    async def _get_model(
+        self, url: str, model: Type[M], params: dict | BaseModel = None
+    ) -> M:
+        """
+        Validates the response body straight from bytes, so fields the model
+        doesn't declare are never turned into Python objects
+        """
+        if isinstance(params, BaseModel):
+            params = params.model_dump(exclude_none=True)
+
+        body = await self._fetch(url, params)
+
+        try:
+            return model.model_validate_json(body)
+        except ValidationError:
+            print(f"Failed to parse response from {url}")
+            raise
+
+    async def _make_get_request(
+        self, url: str, params: dict | BaseModel = None
+    ) -> dict:
+        if isinstance(params, BaseModel):
+            params = params.model_dump(exclude_none=True)
+
+        body = await self._fetch(url, params)
+
+        try:
+            response_dict = json.loads(body)
+        except ValueError:
+            print(f"Failed to parse response JSON: {body.decode(errors='replace')}")
+            raise
+
+        return response_dict
+
+    async def _fetch(self, url: str, params: Optional[dict] = None) -> bytes:
+        """
+        Returns the raw response body. If the same url+params is already being
+        fetched, awaits that request instead of issuing a second one.
+        """
+        key = cache_key(url, params)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_cached(key, url, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shielded so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_cached(self, key: str, url: str, params: Optional[dict]) -> bytes:
+        """
+        Returns the raw response body, serving it from the cache when possible
+        """
+        entry = await self._cache_call("get", key) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.body
+
+        response = await self._send(url, params, revalidation_headers(entry))
+        if response.status_code == 304 and entry is not None:
+            entry = entry.refreshed()
+        else:
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError:
+                print(f"HTTP request failed: {url}")
+                raise
+            entry = CacheEntry(
+                body=response.content,
+                etag=response.headers.get("ETag"),
+                stored_at=time.time(),
+            )
+
+        if self.cache is not None:
+            await self._cache_call("set", key, entry)
+        return entry.body
+
+    async def _cache_call(self, method: str, *args):
+        """
+        Calls a cache method, in a worker thread if the cache blocks on I/O
+        """
+        call = getattr(self.cache, method)
+        if self.cache.blocking:
+            return await asyncio.to_thread(call, *args)
+        return call(*args)
+
+    async def _send(
+        self, url: str, params: Optional[dict], headers: dict
+    ) -> httpx.Response:
+        """
+        Issues the GET through the rate limiter, backing off on 429/503
+        """
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            response = await self._client.get(url=url, params=params, headers=headers)
+            if (
+                response.status_code not in THROTTLED_STATUSES
+                or attempt >= self.config.throttled_retries
+            ):
+                return response
+
+            self.limiter.pause(
+                backoff_delay(
+                    attempt,
+                    response.headers.get("Retry-After"),
+                    self.config.backoff_factor,
+                    self.config.max_backoff,
+                )
+            )
+            attempt += 1
@@ -0,0 +1,279 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Final, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_MAX_ENTRIES: Final = 1024
+DEFAULT_MAX_BYTES: Final = 256 * 1024 * 1024
+# Access times of SQLite hits are written in batches of this many
+ACCESS_FLUSH_SIZE: Final = 256
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    body: bytes
+    etag: Optional[str]
+    stored_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def refreshed(self) -> "CacheEntry":
+        """
+        Copy of this entry marked as freshly validated, e.g. after a 304
+        """
+        return replace(self, stored_at=time.time())
+
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    """
+    Normalizes a request into a stable key, so `pokemon/1/` with
+    `?limit=20&offset=0` and `pokemon/1?offset=0&limit=20` share an entry.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(k), str(v)) for k, v in (params or {}).items()]
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+def revalidation_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+    if entry is None or entry.etag is None:
+        return {}
+    return {"If-None-Match": entry.etag}
+
+
+class ResponseCache(ABC):
+    """
+    Stores raw response bodies by cache_key. Entries older than `ttl` seconds are
+    revalidated with their ETag before being served again; `ttl=None` means
+    entries never go stale, which suits PokeAPI's effectively immutable data.
+
+    Caches whose calls block on I/O set `blocking`, so async callers know to run
+    them off the event loop.
+    """
+
+    blocking: bool = False
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.ttl is None or time.time() - entry.stored_at < self.ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCache(ResponseCache):
+    """
+    In-process LRU bounded by both entry count and total body size
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SQLiteCache(ResponseCache):
+    """
+    On-disk cache in a single SQLite file. When the stored bodies exceed
+    `max_bytes`, the least recently accessed entries are evicted first.
+
+    The total size is tracked in memory, so eviction only scans the table when
+    the limit is actually exceeded. Hits don't write: their access times are
+    buffered and stored together on the next `set`, every ACCESS_FLUSH_SIZE
+    hits, or on close.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: Optional[float] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        super().__init__(ttl)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+                " ON responses (accessed_at)"
+            )
+        (self._size,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._accessed: Dict[str, float] = {}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                with self._conn:
+                    self._flush_accessed()
+        return CacheEntry(body=row[0], etag=row[1], stored_at=row[2])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.body, entry.etag, entry.stored_at, time.time(), entry.size),
+            )
+            self._accessed.pop(key, None)
+            self._size += entry.size - (old[0] if old is not None else 0)
+            self._flush_accessed()
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._accessed.clear()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            with self._conn:
+                self._flush_accessed()
+            self._conn.close()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        # The cursor is read lazily, so only the evicted rows are scanned
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        )
+        evicted = []
+        for key, size in rows:
+            if self._size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+
+class TieredCache(ResponseCache):
+    """
+    Memory LRU in front of a persistent cache. Disk hits are promoted into memory
+    so hot entries are served without touching SQLite.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: ResponseCache):
+        super().__init__(disk.ttl)
+        self.memory = memory
+        self.disk = disk
+        self.blocking = disk.blocking
+
+    @classmethod
+    def at(cls, path: str | Path, ttl: Optional[float] = None) -> "TieredCache":
+        return cls(MemoryCache(ttl=ttl), SQLiteCache(path, ttl=ttl))
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.memory.set(key, entry)
+        self.disk.set(key, entry)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+    def close(self) -> None:
+        self.disk.close()
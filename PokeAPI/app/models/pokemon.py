@@ -1,11 +1,11 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, Final, Iterator, List, Optional, Sequence
 
-from pydantic import BaseModel, Field
+from app.models.response_lists import NamedResource
+from pydantic import BaseModel, Field, PlainSerializer, PlainValidator, TypeAdapter
 
 
-class VersionGroupRef(BaseModel):
-    name: str
-    url: str
+class VersionGroupRef(NamedResource):
+    pass
 
 
 class MoveVersionGroupDetails(BaseModel):
@@ -14,9 +14,8 @@ class MoveVersionGroupDetails(BaseModel):
     version_group: VersionGroupRef
 
 
-class MoveRef(BaseModel):
-    name: str
-    url: str
+class MoveRef(NamedResource):
+    pass
 
 
 class MoveRefWrapper(BaseModel):
@@ -24,19 +23,115 @@ class MoveRefWrapper(BaseModel):
     version_group_details: List[MoveVersionGroupDetails]
 
 
-class Pokemon(BaseModel):
+class PokemonBase(BaseModel):
     id: int
     name: str
-    base_experience: int
+    base_experience: Optional[int] = None  # Null for some alternate forms
     height: int
     weight: int
+
+
+class Pokemon(PokemonBase):
     moves: List[MoveRefWrapper]
 
 
+_MOVES: Final = TypeAdapter(List[MoveRefWrapper])
+
+
+class _MovesOnly(BaseModel):
+    moves: List[MoveRefWrapper]
+
+
+class LazyMoves(Sequence[MoveRefWrapper]):
+    """
+    A pokemon's moves, kept as the undecoded response body until first read.
+    Behaves like the validated list: indexing, iteration, len and equality all
+    decode it, after which the body is dropped.
+    """
+
+    __slots__ = ("_raw", "_moves")
+
+    def __init__(
+        self, raw: str | bytes = b"", moves: Optional[List[MoveRefWrapper]] = None
+    ):
+        self._raw = raw
+        self._moves = moves
+
+    @classmethod
+    def validate(cls, value: Any) -> "LazyMoves":
+        if isinstance(value, LazyMoves):
+            return value
+        # Anything other than a body from LazyPokemon.model_validate_json has
+        # already been parsed into Python, so validating it now costs little
+        return cls(moves=_MOVES.validate_python(value))
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._moves is not None
+
+    def decoded(self) -> List[MoveRefWrapper]:
+        if self._moves is None:
+            # Only the moves are turned into Python objects; the parser skips
+            # over every other field of the body
+            self._moves = _MovesOnly.model_validate_json(self._raw).moves
+            self._raw = b""
+        return self._moves
+
+    def __getitem__(self, index):
+        return self.decoded()[index]
+
+    def __len__(self) -> int:
+        return len(self.decoded())
+
+    def __iter__(self) -> Iterator[MoveRefWrapper]:
+        return iter(self.decoded())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyMoves):
+            if self._raw and self._raw == other._raw:
+                return True
+            other = other.decoded()
+        return self.decoded() == other
+
+    def __repr__(self) -> str:
+        if self._moves is None:
+            return f"LazyMoves(<{len(self._raw)} bytes>)"
+        return f"LazyMoves({self._moves!r})"
+
+
+class LazyPokemon(PokemonBase):
+    """
+    Pokemon whose moves are only validated the first time they are read.
+
+    Decoding from JSON validates just the scalar fields and keeps a reference
+    to the body for the moves, so no Python objects are built for the moves
+    list, which is most of the work and memory for large payloads. The body is
+    released once moves are read; it is mostly moves, so holding it until then
+    costs little more than the moves alone. Errors in the moves are raised on
+    first access. Dumping and comparing work as for Pokemon.
+    """
+
+    moves: Annotated[
+        LazyMoves,
+        PlainValidator(LazyMoves.validate),
+        PlainSerializer(LazyMoves.decoded, return_type=List[MoveRefWrapper]),
+    ]
+
+    @classmethod
+    def model_validate_json(
+        cls, json_data: str | bytes | bytearray, **kwargs: Any
+    ) -> "LazyPokemon":
+        base = PokemonBase.model_validate_json(json_data, **kwargs)
+        if isinstance(json_data, bytearray):
+            json_data = bytes(json_data)
+        return cls(**dict(base), moves=LazyMoves(raw=json_data))
+
+
 class Move(BaseModel):
     id: int
     name: str
-    accuracy: Annotated[int, Field(ge=0, le=100)]
-    pp: int
+    # Status moves have no accuracy or power, shadow moves have no pp
+    accuracy: Annotated[Optional[int], Field(ge=0, le=100)] = None
+    pp: Optional[int] = None
     priority: int
-    power: int
+    power: Optional[int] = None
@@ -0,0 +1,48 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterable, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+
+def projection(model: Type[BaseModel], fields: Iterable[str]) -> Type[tuple]:
+    """
+    Returns a namedtuple type holding only `fields` of `model`, e.g.
+    `projection(Pokemon, ["id", "name"])`.
+
+    Like a model, it is decoded with `model_validate_json`: only the requested
+    fields are validated, everything else in the payload is skipped, and the result
+    is a slotted tuple rather than a full model instance. Types are cached, so
+    repeated projections of the same fields share one class.
+    """
+    return _projection(model, tuple(fields))
+
+
+@lru_cache(maxsize=None)
+def _projection(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[tuple]:
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise ValueError(
+            f"{model.__name__} has no field(s) {', '.join(unknown)}; "
+            f"choose from {', '.join(model.model_fields)}"
+        )
+
+    name = f"{model.__name__}Projection"
+    validator = create_model(
+        name,
+        **{
+            field: (model.model_fields[field].annotation, model.model_fields[field])
+            for field in fields
+        },
+    )
+
+    class Projection(namedtuple(name, fields)):
+        __slots__ = ()
+
+        @classmethod
+        def model_validate_json(cls, json_data: str | bytes) -> "Projection":
+            validated = validator.model_validate_json(json_data)
+            return cls._make(getattr(validated, field) for field in fields)
+
+    Projection.__name__ = Projection.__qualname__ = name
+    return Projection
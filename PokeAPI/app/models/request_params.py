@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -6,3 +6,15 @@ from pydantic import BaseModel
 class PaginationParams(BaseModel):
     limit: Optional[int] = None
     offset: Optional[int] = None
+
+    @classmethod
+    def windows(
+        cls, total: int, page_size: int, start: int = 0
+    ) -> List["PaginationParams"]:
+        """
+        Every limit/offset window needed to cover items [start, total)
+        """
+        return [
+            cls(limit=min(page_size, total - offset), offset=offset)
+            for offset in range(start, total, page_size)
+        ]
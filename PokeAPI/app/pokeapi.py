@@ -1,51 +1,146 @@
 import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Final, List
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 from urllib.parse import urljoin
 
 import requests
-from app.models.pokemon import Move, Pokemon
+from app.cache import CacheEntry, ResponseCache, cache_key, revalidation_headers
+from app.models.pokemon import LazyPokemon, Move, Pokemon, PokemonBase
+from app.models.projection import projection
 from app.models.request_params import PaginationParams
-from app.models.response_lists import NamedResource, ResourceList
+from app.models.response_lists import (
+    NamedResource,
+    ResourceList,
+    T,
+    UnnamedResource,
+)
+from app.throttle import THROTTLED_STATUSES, RateLimiter, backoff_delay
+from app.transport import DEFAULT_TRANSPORT, TransportConfig, build_session
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 load_dotenv()
 
+M = TypeVar("M", bound=BaseModel)
+
 BASE_URL: Final = "https://pokeapi.co/api/v2/"
+DEFAULT_PAGE_SIZE: Final = 100
 
 
 @dataclass(frozen=True)
 class Endpoints:
     get_pokemon: Callable[[str], str]
     list_pokemon: str
+    list_moves: str
+    list_abilities: str
+    list_types: str
+    list_items: str
+    list_evolution_chains: str
 
 
 ENDPOINTS: Final = Endpoints(
-    get_pokemon=lambda name: f"pokemon/{name}", list_pokemon="pokemon"
+    get_pokemon=lambda name: f"pokemon/{name}",
+    list_pokemon="pokemon",
+    list_moves="move",
+    list_abilities="ability",
+    list_types="type",
+    list_items="item",
+    list_evolution_chains="evolution-chain",  # Unnamed resources
 )
 
 
 class PokeAPI:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        config: TransportConfig = DEFAULT_TRANSPORT,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        lazy_moves: bool = False,
+    ):
+        self.config = config
+        self.cache = cache
+        self.limiter = limiter or RateLimiter()
+        self.pokemon_model = LazyPokemon if lazy_moves else Pokemon
+        self._session = build_session(config)
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+
+    def __enter__(self) -> "PokeAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
-    def get_pokemon(self, name) -> Pokemon:
+    def close(self) -> None:
+        self._session.close()
+
+    def get_pokemon(
+        self, name, fields: Optional[Sequence[str]] = None
+    ) -> Pokemon | LazyPokemon | tuple:
+        """
+        Returns the pokemon, or with `fields` only those fields as a compact
+        namedtuple (see projection)
+        """
         url = urljoin(BASE_URL, ENDPOINTS.get_pokemon(name))
-        response_dict = self._make_get_request(url)
-        pokemon = Pokemon(**response_dict)
-        return pokemon
+        model = projection(Pokemon, fields) if fields else self.pokemon_model
+        return self._get_model(url, model)
+
+    def get_move(self, pokemon: PokemonBase) -> Move:
+        return self.resolve(pokemon.moves[0].move, Move)
 
-    def get_move(self, pokemon: Pokemon) -> Move:
-        url = pokemon.moves[0].move.url
-        response_dict = self._make_get_request(url)
-        move = Move(**response_dict)
-        return move
+    def resolve(self, ref: UnnamedResource, model: Type[M]) -> M:
+        """
+        Fetches the resource behind a name/url reference, e.g.
+        `resolve(pokemon.moves[3].move, Move)`. Concurrent resolutions of the same
+        url share a single request.
+        """
+        return self._get_model(ref.url, model)
 
-    def list_pokemon(self, count: int = 20) -> List:
+    def resolve_all(
+        self,
+        pokemon: PokemonBase | Iterable[PokemonBase],
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Move]:
+        """
+        Resolves every move of one or more pokemon, keyed by move name. Moves
+        shared between pokemon (or listed twice) are only fetched once.
         """
-        Returns the first n pokemon
+        team = [pokemon] if isinstance(pokemon, PokemonBase) else pokemon
+        refs = {wrapper.move.url: wrapper.move for p in team for wrapper in p.moves}
+        if not refs:
+            return {}
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency or self.config.pool_size
+        ) as executor:
+            moves = executor.map(lambda ref: self.resolve(ref, Move), refs.values())
+            return {move.name: move for move in moves}
+
+    def list_pokemon(self, count: int = 20, parallel: bool = False) -> List:
         """
+        Returns the first n pokemon. With `parallel`, every page after the first is
+        fetched concurrently instead of following `next` links one at a time.
+        """
+        if parallel:
+            return self.list_resources(ENDPOINTS.list_pokemon, count=count)
+
         url = urljoin(BASE_URL, ENDPOINTS.list_pokemon)
         params = PaginationParams(limit=count)
         results = []
@@ -59,25 +154,209 @@ class PokeAPI:
 
         return results
 
-    def _make_get_request(self, url: str, params: dict | BaseModel = None) -> dict:
+    def stream_pokemon(self, count: Optional[int] = None) -> Iterator[NamedResource]:
+        """
+        Yields the first n pokemon (or all of them) as their pages arrive
+        """
+        return self.stream_resources(ENDPOINTS.list_pokemon, count=count)
+
+    def list_resources(
+        self,
+        endpoint: str,
+        model: Type[T] = NamedResource,
+        count: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: Optional[int] = None,
+    ) -> List[T]:
+        """
+        Returns the first n resources of any list endpoint, in API order
+        """
+        return list(
+            self.stream_resources(endpoint, model, count, page_size, concurrency)
+        )
+
+    def iter_resources(
+        self,
+        endpoint: str,
+        model: Type[T] = NamedResource,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: int = 1,
+    ) -> Iterator[T]:
+        """
+        Lazily walks every resource of a list endpoint, e.g.
+        `iter_resources(ENDPOINTS.list_moves)` or
+        `iter_resources(ENDPOINTS.list_evolution_chains, UnnamedResource)`.
+
+        Only `prefetch` pages are held or in flight at once, so memory stays flat
+        however many resources are walked, while the next page downloads as the
+        current one is consumed.
+        """
+        return self.stream_resources(
+            endpoint, model, page_size=page_size, concurrency=prefetch
+        )
+
+    def stream_resources(
+        self,
+        endpoint: str,
+        model: Type[T] = NamedResource,
+        count: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        concurrency: Optional[int] = None,
+    ) -> Iterator[T]:
+        """
+        Yields the first n resources (or all of them) of any list endpoint.
+
+        The first page reports the total `count`, so every remaining
+        PaginationParams window is known up front and fetched on a thread pool,
+        keeping at most `concurrency` pages in flight. Items are still yielded in
+        API order.
+        """
+        url = urljoin(BASE_URL, endpoint)
+        limit = page_size if count is None else min(count, page_size)
+        first_page = self._get_page(url, PaginationParams(limit=limit), model)
+
+        total = first_page.count if count is None else min(count, first_page.count)
+        windows = iter(
+            PaginationParams.windows(total, page_size, start=len(first_page.results))
+        )
+        concurrency = concurrency or self.config.pool_size
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+            def submit(params: PaginationParams) -> Future:
+                return executor.submit(self._get_page, url, params, model)
+
+            pending = deque(submit(params) for params in islice(windows, concurrency))
+            try:
+                yield from first_page.results[:total]
+                while pending:
+                    page = pending.popleft().result()
+                    pending.extend(submit(params) for params in islice(windows, 1))
+                    yield from page.results
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _get_page(
+        self, url: str, params: PaginationParams, model: Type[T]
+    ) -> ResourceList[T]:
+        return self._get_model(url, ResourceList[model], params)
+
+    def _get_model(
+        self, url: str, model: Type[M], params: dict | BaseModel = None
+    ) -> M:
+        """
+        Validates the response body straight from bytes, so fields the model
+        doesn't declare are never turned into Python objects
+        """
         if isinstance(params, BaseModel):
             params = params.model_dump(exclude_none=True)
 
+        body = self._fetch(url, params)
+
         try:
-            response = requests.get(url=url, params=params)
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(f"HTTP request failed: {url}")
+            return model.model_validate_json(body)
+        except ValidationError:
+            print(f"Failed to parse response from {url}")
             raise
 
+    def _make_get_request(self, url: str, params: dict | BaseModel = None) -> dict:
+        if isinstance(params, BaseModel):
+            params = params.model_dump(exclude_none=True)
+
+        body = self._fetch(url, params)
+
         try:
-            response_dict = response.json()
+            response_dict = json.loads(body)
         except ValueError:
-            print(f"Failed to parse response JSON: {response.text}")
+            print(f"Failed to parse response JSON: {body.decode(errors='replace')}")
             raise
 
         return response_dict
 
+    def _fetch(self, url: str, params: Optional[dict] = None) -> bytes:
+        """
+        Returns the raw response body. If another thread is already fetching the
+        same url+params, waits for its result instead of issuing a second request.
+        """
+        key = cache_key(url, params)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            body = self._fetch_cached(key, url, params)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(body)
+            return body
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _fetch_cached(self, key: str, url: str, params: Optional[dict]) -> bytes:
+        """
+        Returns the raw response body, serving it from the cache when possible
+        """
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.body
+
+        try:
+            response = self._send(url, params, revalidation_headers(entry))
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            print(f"HTTP request failed: {url}")
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            entry = entry.refreshed()
+        else:
+            entry = CacheEntry(
+                body=response.content,
+                etag=response.headers.get("ETag"),
+                stored_at=time.time(),
+            )
+
+        if self.cache is not None:
+            self.cache.set(key, entry)
+        return entry.body
+
+    def _send(
+        self, url: str, params: Optional[dict], headers: dict
+    ) -> requests.Response:
+        """
+        Issues the GET through the rate limiter, backing off on 429/503
+        """
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            response = self._session.get(
+                url=url, params=params, headers=headers, timeout=self.config.timeout
+            )
+            if (
+                response.status_code not in THROTTLED_STATUSES
+                or attempt >= self.config.throttled_retries
+            ):
+                return response
+
+            self.limiter.pause(
+                backoff_delay(
+                    attempt,
+                    response.headers.get("Retry-After"),
+                    self.config.backoff_factor,
+                    self.config.max_backoff,
+                )
+            )
+            attempt += 1
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser("Get a pokemon, along with a list of their moves")
@@ -85,10 +364,10 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
     name = args.name
-    client = PokeAPI()
-    # pokemon = client.get_pokemon(name)
-    # if pokemon:
-    #     move = client.get_move(pokemon)
-    pokemon_list = client.list_pokemon(5)
+    with PokeAPI() as client:
+        # pokemon = client.get_pokemon(name)
+        # if pokemon:
+        #     move = client.get_move(pokemon)
+        pokemon_list = client.list_pokemon(5)
     for p in pokemon_list:
         print(f"Name: {p.name}; URL: {p.url}")
@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Final, Iterable, List, Optional, Sequence, Type
+from urllib.parse import urljoin
+
+import httpx
+from app.async_pokeapi import AsyncPokeAPI
+from app.models.pokemon import LazyPokemon, Move, Pokemon, PokemonBase
+from app.models.projection import projection
+from app.models.response_lists import NamedResource, UnnamedResource
+from app.pokeapi import BASE_URL, ENDPOINTS, M
+from pydantic import ValidationError
+
+SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS pokemon (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS move (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL UNIQUE,
+    body BLOB NOT NULL
+);
+"""
+DEFAULT_MODEL_CACHE_SIZE: Final = 4096
+DEFAULT_COMMIT_EVERY: Final = 100
+
+
+async def build_snapshot(
+    path: str | Path,
+    client: AsyncPokeAPI,
+    count: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    commit_every: int = DEFAULT_COMMIT_EVERY,
+) -> Dict[str, str]:
+    """
+    Crawls the first n pokemon (or all of them) and every move they reference into
+    a SQLite snapshot that LocalPokeAPI can serve without any network access.
+
+    Pokemon are written as they arrive, so only move references are kept in memory
+    during the crawl. Models are stored as their validated JSON, which drops every
+    field we don't model and keeps the snapshot compact.
+
+    Progress is committed every `commit_every` rows. A pokemon or move that fails
+    to fetch or validate is skipped and returned in the name/url -> error map, and
+    running the crawl again against the same file only fetches what is missing.
+    """
+    semaphore = asyncio.Semaphore(concurrency or client.concurrency)
+    move_refs: Dict[str, UnnamedResource] = {}
+    failures: Dict[str, str] = {}
+    uncommitted = 0
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        stored_pokemon = {name for (name,) in conn.execute("SELECT name FROM pokemon")}
+        stored_moves = {url for (url,) in conn.execute("SELECT url FROM move")}
+        # Moves of pokemon stored by an earlier run still need to be crawled
+        for (body,) in conn.execute("SELECT body FROM pokemon"):
+            for wrapper in Pokemon.model_validate_json(body).moves:
+                move_refs.setdefault(wrapper.move.url, wrapper.move)
+
+        def written() -> None:
+            nonlocal uncommitted
+            uncommitted += 1
+            if uncommitted >= commit_every:
+                conn.commit()
+                uncommitted = 0
+
+        async def store_pokemon(name: str) -> None:
+            try:
+                async with semaphore:
+                    fetched = await client.get_pokemon(name)
+                # Lazily decoded pokemon still need their moves in the snapshot
+                pokemon = Pokemon.model_validate(fetched, from_attributes=True)
+            except (httpx.HTTPError, ValidationError) as e:
+                failures[name] = repr(e)
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO pokemon VALUES (?, ?, ?, ?)",
+                (
+                    pokemon.id,
+                    pokemon.name,
+                    urljoin(BASE_URL, f"{ENDPOINTS.list_pokemon}/{pokemon.id}/"),
+                    pokemon.model_dump_json().encode(),
+                ),
+            )
+            written()
+            for wrapper in pokemon.moves:
+                move_refs.setdefault(wrapper.move.url, wrapper.move)
+
+        async def store_move(ref: UnnamedResource) -> None:
+            try:
+                async with semaphore:
+                    move = await client.resolve(ref, Move)
+            except (httpx.HTTPError, ValidationError) as e:
+                failures[ref.url] = repr(e)
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO move VALUES (?, ?, ?, ?)",
+                (move.id, move.name, ref.url, move.model_dump_json().encode()),
+            )
+            written()
+
+        names = [
+            resource.name
+            async for resource in client.stream_resources(
+                ENDPOINTS.list_pokemon, count=count
+            )
+            if resource.name not in stored_pokemon
+        ]
+        await asyncio.gather(*(store_pokemon(name) for name in names))
+        await asyncio.gather(
+            *(
+                store_move(ref)
+                for url, ref in move_refs.items()
+                if url not in stored_moves
+            )
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return failures
+
+
+class LocalPokeAPI:
+    """
+    Serves Pokemon and Move models from a snapshot written by build_snapshot,
+    through the same interface as PokeAPI. Lookups go through SQLite's primary key
+    and name indexes, and recently used models are kept parsed in memory.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        model_cache_size: int = DEFAULT_MODEL_CACHE_SIZE,
+        lazy_moves: bool = False,
+    ):
+        self.path = Path(path)
+        self.pokemon_model = LazyPokemon if lazy_moves else Pokemon
+        if not self.path.exists():
+            raise FileNotFoundError(f"No snapshot at {self.path}")
+
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._load_pokemon = lru_cache(maxsize=model_cache_size)(self._load_pokemon)
+        self._load_move = lru_cache(maxsize=model_cache_size)(self._load_move)
+
+    def __enter__(self) -> "LocalPokeAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_pokemon(
+        self, name, fields: Optional[Sequence[str]] = None
+    ) -> Pokemon | LazyPokemon | tuple:
+        """
+        Looks a pokemon up by name or by id, as the API does. With `fields`, only
+        those fields are decoded into a compact namedtuple (see projection).
+        """
+        key = str(name).lower()
+        if fields:
+            return projection(Pokemon, fields).model_validate_json(
+                self._pokemon_body(key)
+            )
+        return self._load_pokemon(key)
+
+    def get_move(self, pokemon: PokemonBase) -> Move:
+        return self.resolve(pokemon.moves[0].move, Move)
+
+    def resolve(self, ref: UnnamedResource, model: Type[M]) -> M:
+        if model is not Move:
+            raise TypeError(f"Snapshots only store Move references, not {model}")
+        return self._load_move(ref.url)
+
+    def resolve_all(
+        self, pokemon: PokemonBase | Iterable[PokemonBase]
+    ) -> Dict[str, Move]:
+        team = [pokemon] if isinstance(pokemon, PokemonBase) else pokemon
+        urls = {wrapper.move.url for p in team for wrapper in p.moves}
+        moves = (self._load_move(url) for url in urls)
+        return {move.name: move for move in moves}
+
+    def list_pokemon(self, count: int = 20) -> List:
+        """
+        Returns the first n pokemon
+        """
+        rows = self._conn.execute(
+            "SELECT name, url FROM pokemon ORDER BY id LIMIT ?", (count,)
+        )
+        return [NamedResource(name=name, url=url) for name, url in rows]
+
+    def _load_pokemon(self, key: str) -> Pokemon | LazyPokemon:
+        return self.pokemon_model.model_validate_json(self._pokemon_body(key))
+
+    def _pokemon_body(self, key: str) -> bytes:
+        if key.isdigit():
+            query, param = "SELECT body FROM pokemon WHERE id = ?", int(key)
+        else:
+            query, param = "SELECT body FROM pokemon WHERE name = ?", key
+        row = self._conn.execute(query, (param,)).fetchone()
+        if row is None:
+            raise KeyError(f"Pokemon {key!r} is not in the snapshot")
+        return row[0]
+
+    def _load_move(self, url: str) -> Move:
+        row = self._conn.execute(
+            "SELECT body FROM move WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Move {url!r} is not in the snapshot")
+        return Move.model_validate_json(row[0])
+
+
+async def _main(args: argparse.Namespace) -> None:
+    async with AsyncPokeAPI(concurrency=args.concurrency) as client:
+        failures = await build_snapshot(args.path, client, count=args.count)
+    for item, error in failures.items():
+        print(f"Skipped {item}: {error}")
+    if failures:
+        print(f"{len(failures)} items failed; run again to retry them")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        "Crawl PokeAPI into a local snapshot for LocalPokeAPI"
+    )
+    parser.add_argument("path", help="SQLite file to write the snapshot to")
+    parser.add_argument(
+        "--count", type=int, help="Only crawl the first n pokemon (default: all)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=20, help="Requests kept in flight"
+    )
+
+    asyncio.run(_main(parser.parse_args()))
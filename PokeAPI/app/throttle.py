@@ -0,0 +1,101 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Final, Optional
+
+# Statuses that mean "slow down" rather than "this request is wrong"
+THROTTLED_STATUSES: Final = frozenset({429, 503})
+
+
+class RateLimiter:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `burst`.
+
+    One instance can be shared by PokeAPI and AsyncPokeAPI (and across threads):
+    callers reserve a token under a lock and then sleep with whichever primitive
+    suits them. `rate=None` disables throttling but still honors `pause`, so a
+    429 seen by one caller backs off every other caller too.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every caller for at least `seconds`, e.g. after a 429
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _reserve(self) -> float:
+        """
+        Takes a token and returns how long the caller must wait before using it.
+        The balance may go negative, which queues callers behind each other
+        instead of letting them all wake up and race for the same token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._paused_until - now)
+            if self.rate is None:
+                return delay
+
+            elapsed = now - self._updated_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either a number of seconds or an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(
+    attempt: int, retry_after: Optional[str], base: float, cap: float
+) -> float:
+    """
+    Full-jitter exponential backoff. A server-provided Retry-After (capped at `cap`)
+    takes precedence, with a little jitter so callers don't retry in lockstep.
+    """
+    delay = random.uniform(0, min(cap, base * 2**attempt))
+    server_delay = parse_retry_after(retry_after)
+    if server_delay is not None:
+        delay = min(cap, server_delay) + delay * 0.1
+    return delay
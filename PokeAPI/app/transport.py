@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Final, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# HTTP/2 in httpx is only available when the optional `h2` package is installed
+HTTP2_AVAILABLE: Final = find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """
+    Connection settings shared by the sync and async clients.
+
+    `retries` only applies to failures establishing a connection, which are always
+    safe to retry. `throttled_retries` covers 429/503 responses, which are retried
+    with jittered exponential backoff (starting at `backoff_factor` seconds and
+    capped at `max_backoff`); any other HTTP error is surfaced to the caller.
+    """
+
+    pool_size: int = 10
+    keep_alive: bool = True
+    keep_alive_expiry: float = 30.0
+    retries: int = 3
+    throttled_retries: int = 5
+    backoff_factor: float = 0.2
+    max_backoff: float = 60.0
+    timeout: float = 10.0
+    http2: bool = True
+
+
+DEFAULT_TRANSPORT: Final = TransportConfig()
+
+
+def build_session(config: TransportConfig = DEFAULT_TRANSPORT) -> requests.Session:
+    """
+    Builds a requests.Session whose connection pool is reused across calls.
+    requests has no HTTP/2 support, so `config.http2` only affects the async client.
+    """
+    retry = Retry(
+        total=config.retries,
+        connect=config.retries,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=config.backoff_factor,
+        # 429/503 are retried by the client itself so the limiter sees them
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_size,
+        pool_maxsize=config.pool_size,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def build_async_client(
+    config: TransportConfig = DEFAULT_TRANSPORT,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """
+    Builds an httpx.AsyncClient with a single shared connection pool. A custom
+    `transport` (e.g. httpx.MockTransport) replaces the pooled one entirely.
+    """
+    limits = httpx.Limits(
+        max_connections=config.pool_size,
+        max_keepalive_connections=config.pool_size if config.keep_alive else 0,
+        keepalive_expiry=config.keep_alive_expiry,
+    )
+    http2 = config.http2 and HTTP2_AVAILABLE
+
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            limits=limits, http2=http2, retries=config.retries
+        )
+
+    return httpx.AsyncClient(
+        transport=transport, http2=http2, limits=limits, timeout=config.timeout
+    )
@@ -0,0 +1,172 @@
+import asyncio
+
+import httpx
+from app.async_pokeapi import AsyncPokeAPI
+from app.models.pokemon import Move, Pokemon
+from app.pokeapi import ENDPOINTS
+
+
+def make_pokemon_payload(name: str, id: int = 1) -> dict:
+    return {
+        "id": id,
+        "name": name,
+        "base_experience": 15,
+        "height": 10,
+        "weight": 100,
+        "moves": [
+            {"move": {"name": "tackle", "url": "foo"}, "version_group_details": []}
+        ],
+    }
+
+
+class TestAsyncGetPokemon:
+    def test_get_pokemon(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url == "https://pokeapi.co/api/v2/pokemon/bulbasaur"
+            return httpx.Response(200, json=make_pokemon_payload("bulbasaur"))
+
+        async def run():
+            async with AsyncPokeAPI(transport=httpx.MockTransport(handler)) as client:
+                return await client.get_pokemon("bulbasaur")
+
+        pokemon = asyncio.run(run())
+        assert pokemon.name == "bulbasaur"
+        assert pokemon.base_experience == 15
+
+
+class TestAsyncGetMany:
+    def test_get_many_preserves_order_and_bounds_concurrency(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            name = request.url.path.rstrip("/").split("/")[-1]
+            return httpx.Response(200, json=make_pokemon_payload(name))
+
+        names = [f"pokemon-{i}" for i in range(12)]
+
+        async def run():
+            async with AsyncPokeAPI(transport=httpx.MockTransport(handler)) as client:
+                return await client.get_many(names, concurrency=3)
+
+        results = asyncio.run(run())
+        assert [p.name for p in results] == names
+        assert max_in_flight == 3
+
+
+class TestAsyncListResources:
+    def test_parallel_list_pokemon_is_in_order(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            limit = int(request.url.params["limit"])
+            offset = int(request.url.params.get("offset", 0))
+            results = [
+                {
+                    "name": f"pokemon-{i}",
+                    "url": f"https://pokeapi.co/api/v2/pokemon/{i}/",
+                }
+                for i in range(offset, min(offset + limit, 250))
+            ]
+            return httpx.Response(
+                200,
+                json={"count": 250, "next": None, "previous": None, "results": results},
+            )
+
+        async def run():
+            async with AsyncPokeAPI(transport=httpx.MockTransport(handler)) as client:
+                return await client.list_pokemon(count=230, parallel=True)
+
+        results = asyncio.run(run())
+        assert [p.name for p in results] == [f"pokemon-{i}" for i in range(230)]
+
+    def test_iter_resources_bounds_pages_in_flight(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            limit = int(request.url.params["limit"])
+            offset = int(request.url.params.get("offset", 0))
+            results = [
+                {"name": f"move-{i}", "url": f"https://pokeapi.co/api/v2/move/{i}/"}
+                for i in range(offset, min(offset + limit, 100))
+            ]
+            return httpx.Response(
+                200,
+                json={"count": 100, "next": None, "previous": None, "results": results},
+            )
+
+        async def run():
+            async with AsyncPokeAPI(transport=httpx.MockTransport(handler)) as client:
+                return [
+                    move.name
+                    async for move in client.iter_resources(
+                        ENDPOINTS.list_moves, page_size=10, prefetch=2
+                    )
+                ]
+
+        assert asyncio.run(run()) == [f"move-{i}" for i in range(100)]
+        assert max_in_flight == 2
+
+
+class TestAsyncResolve:
+    def test_resolve_all_dedups_and_coalesces(self):
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(str(request.url))
+            await asyncio.sleep(0.01)
+            move_id = int(request.url.path.rstrip("/").split("/")[-1])
+            return httpx.Response(
+                200,
+                json={
+                    "id": move_id,
+                    "name": f"move-{move_id}",
+                    "accuracy": 100,
+                    "pp": 35,
+                    "priority": 0,
+                    "power": 40,
+                },
+            )
+
+        def make_team_member(name: str, move_ids: list) -> Pokemon:
+            payload = make_pokemon_payload(name)
+            payload["moves"] = [
+                {
+                    "move": {
+                        "name": f"move-{i}",
+                        "url": f"https://pokeapi.co/api/v2/move/{i}/",
+                    },
+                    "version_group_details": [],
+                }
+                for i in move_ids
+            ]
+            return Pokemon(**payload)
+
+        team = [
+            make_team_member("bulbasaur", [1, 2, 3]),
+            make_team_member("charmander", [1, 3, 4]),
+        ]
+
+        async def run():
+            async with AsyncPokeAPI(transport=httpx.MockTransport(handler)) as client:
+                moves = await client.resolve_all(team)
+                ref = team[0].moves[0].move
+                duplicates = await asyncio.gather(
+                    *(client.resolve(ref, Move) for _ in range(5))
+                )
+                return moves, duplicates
+
+        moves, duplicates = asyncio.run(run())
+        assert sorted(moves) == ["move-1", "move-2", "move-3", "move-4"]
+        assert {move.name for move in duplicates} == {"move-1"}
+        # 4 unique moves, then one coalesced request for the 5 concurrent resolves
+        assert len(calls) == 5
@@ -0,0 +1,101 @@
+import responses
+from app import pokeapi
+from app.cache import (
+    CacheEntry,
+    MemoryCache,
+    SQLiteCache,
+    TieredCache,
+    cache_key,
+)
+
+POKEMON_URL = "https://pokeapi.co/api/v2/pokemon/bulbasaur"
+POKEMON_PAYLOAD = {
+    "id": 1,
+    "name": "bulbasaur",
+    "base_experience": 64,
+    "height": 7,
+    "weight": 69,
+    "moves": [],
+}
+
+
+class TestCacheKey:
+    def test_normalizes_params_and_trailing_slash(self):
+        assert cache_key(
+            "https://PokeAPI.co/api/v2/pokemon/?offset=0", {"limit": 20}
+        ) == cache_key("https://pokeapi.co/api/v2/pokemon?limit=20&offset=0")
+
+
+class TestMemoryCache:
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.set(key, CacheEntry(body=b"{}", etag=None, stored_at=0))
+        cache.get("a")
+        cache.set("c", CacheEntry(body=b"{}", etag=None, stored_at=0))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+
+class TestSQLiteCache:
+    def test_persists_and_evicts_by_size(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteCache(path, max_bytes=10)
+        cache.set("a", CacheEntry(body=b"123456", etag='"a"', stored_at=1))
+        cache.set("b", CacheEntry(body=b"123456", etag=None, stored_at=2))
+        cache.close()
+
+        reopened = SQLiteCache(path, max_bytes=10)
+        assert reopened.get("a") is None
+        assert reopened.get("b") == CacheEntry(body=b"123456", etag=None, stored_at=2)
+        reopened.close()
+
+    def test_buffered_hits_protect_entries_from_eviction(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        cache = SQLiteCache(path, max_bytes=12)
+        cache.set("a", CacheEntry(body=b"1234", etag=None, stored_at=1))
+        cache.set("b", CacheEntry(body=b"1234", etag=None, stored_at=1))
+        cache.close()
+
+        # The running size is restored on open
+        reopened = SQLiteCache(path, max_bytes=12)
+        assert reopened.get("a") is not None
+        reopened.set("c", CacheEntry(body=b"1234", etag=None, stored_at=1))
+        reopened.set("d", CacheEntry(body=b"1234", etag=None, stored_at=1))
+        assert reopened.get("b") is None
+        assert reopened.get("a") is not None
+        reopened.close()
+
+
+class TestClientCache:
+    @responses.activate
+    def test_warm_cache_makes_no_requests(self, tmp_path):
+        responses.add(responses.GET, POKEMON_URL, json=POKEMON_PAYLOAD)
+
+        cache = TieredCache.at(tmp_path / "cache.sqlite")
+        with pokeapi.PokeAPI(cache=cache) as client:
+            client.get_pokemon("bulbasaur")
+        cache.close()
+
+        warm_cache = TieredCache.at(tmp_path / "cache.sqlite")
+        with pokeapi.PokeAPI(cache=warm_cache) as client:
+            assert client.get_pokemon("bulbasaur").name == "bulbasaur"
+        warm_cache.close()
+
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_stale_entry_is_revalidated_with_etag(self):
+        responses.add(
+            responses.GET, POKEMON_URL, json=POKEMON_PAYLOAD, headers={"ETag": '"v1"'}
+        )
+        responses.add(responses.GET, POKEMON_URL, status=304)
+
+        with pokeapi.PokeAPI(cache=MemoryCache(ttl=0)) as client:
+            client.get_pokemon("bulbasaur")
+            assert client.get_pokemon("bulbasaur").name == "bulbasaur"
+
+        assert len(responses.calls) == 2
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
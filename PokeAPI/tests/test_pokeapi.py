@@ -1,5 +1,16 @@
+import json
+import re
+import tracemalloc
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
 import responses
 from app import pokeapi
+from app.models.pokemon import LazyPokemon
+from app.models.request_params import PaginationParams
+from app.models.response_lists import UnnamedResource
+from app.transport import TransportConfig
+from pydantic import ValidationError
 
 
 class TestGetPokemon:
@@ -26,3 +37,256 @@ class TestGetPokemon:
         response = pokeapi.get_pokemon("bulbasaur")
         assert response.name == "bulbasaur"
         assert response.base_experience == 15
+
+
+class TestSession:
+    @responses.activate
+    def test_session_is_reused_across_requests(self):
+        for name in ("bulbasaur", "ivysaur"):
+            responses.add(
+                method=responses.GET,
+                url=f"https://pokeapi.co/api/v2/pokemon/{name}",
+                json={
+                    "id": 1,
+                    "name": name,
+                    "base_experience": 15,
+                    "height": 10,
+                    "weight": 100,
+                    "moves": [],
+                },
+            )
+
+        with pokeapi.PokeAPI() as client:
+            session = client._session
+            assert client.get_pokemon("bulbasaur").name == "bulbasaur"
+            assert client.get_pokemon("ivysaur").name == "ivysaur"
+            assert client._session is session
+
+    def test_session_uses_configured_pool(self):
+        config = TransportConfig(pool_size=4, retries=2, keep_alive=False)
+        with pokeapi.PokeAPI(config) as client:
+            adapter = client._session.get_adapter("https://pokeapi.co")
+            assert adapter._pool_maxsize == 4
+            assert adapter.max_retries.connect == 2
+            assert adapter.max_retries.read == 0
+            assert client._session.headers["Connection"] == "close"
+
+
+def paginated_callback(total: int):
+    """
+    responses callback that serves `total` fake pokemon using limit/offset
+    """
+
+    def callback(request):
+        query = parse_qs(urlsplit(request.url).query)
+        limit = int(query.get("limit", ["20"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        results = [
+            {"name": f"pokemon-{i}", "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"}
+            for i in range(offset, min(offset + limit, total))
+        ]
+        body = {"count": total, "next": None, "previous": None, "results": results}
+        return 200, {}, json.dumps(body)
+
+    return callback
+
+
+class TestListPokemon:
+    def test_pagination_windows(self):
+        windows = PaginationParams.windows(250, 100, start=20)
+        assert [(w.limit, w.offset) for w in windows] == [
+            (100, 20),
+            (100, 120),
+            (30, 220),
+        ]
+
+    @responses.activate
+    def test_parallel_list_is_in_order(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://pokeapi.co/api/v2/pokemon.*"),
+            callback=paginated_callback(total=45),
+        )
+
+        with pokeapi.PokeAPI() as client:
+            results = client.list_resources("pokemon", page_size=10)
+
+        assert [p.name for p in results] == [f"pokemon-{i}" for i in range(45)]
+        assert len(responses.calls) == 5
+
+    @responses.activate
+    def test_stream_pokemon_respects_count(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://pokeapi.co/api/v2/pokemon.*"),
+            callback=paginated_callback(total=1000),
+        )
+
+        with pokeapi.PokeAPI() as client:
+            names = [p.name for p in client.stream_pokemon(count=150)]
+
+        assert names == [f"pokemon-{i}" for i in range(150)]
+
+
+class TestIterResources:
+    @responses.activate
+    def test_iter_unnamed_resources_lazily(self):
+        def callback(request):
+            query = parse_qs(urlsplit(request.url).query)
+            limit = int(query["limit"][0])
+            offset = int(query.get("offset", ["0"])[0])
+            results = [
+                {"url": f"https://pokeapi.co/api/v2/evolution-chain/{i}/"}
+                for i in range(offset, min(offset + limit, 30))
+            ]
+            body = {"count": 30, "next": None, "previous": None, "results": results}
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://pokeapi.co/api/v2/evolution-chain.*"),
+            callback=callback,
+        )
+
+        with pokeapi.PokeAPI() as client:
+            chains = client.iter_resources(
+                pokeapi.ENDPOINTS.list_evolution_chains,
+                UnnamedResource,
+                page_size=10,
+            )
+            first = next(chains)
+            # The first page plus at most one prefetched page
+            assert len(responses.calls) <= 2
+            rest = list(chains)
+
+        assert type(first) is UnnamedResource
+        assert len(rest) == 29
+        assert len(responses.calls) == 3
+
+
+class TestResolve:
+    @responses.activate
+    def test_resolve_all_fetches_each_move_once(self):
+        for move_id in (1, 2):
+            responses.add(
+                responses.GET,
+                f"https://pokeapi.co/api/v2/move/{move_id}/",
+                json={
+                    "id": move_id,
+                    "name": f"move-{move_id}",
+                    "accuracy": 100,
+                    "pp": 35,
+                    "priority": 0,
+                    "power": 40,
+                },
+            )
+
+        moves = [
+            {
+                "move": {
+                    "name": f"move-{i}",
+                    "url": f"https://pokeapi.co/api/v2/move/{i}/",
+                },
+                "version_group_details": [],
+            }
+            for i in (1, 2, 1)
+        ]
+        pokemon = pokeapi.Pokemon(
+            id=1, name="bulbasaur", base_experience=64, height=7, weight=69, moves=moves
+        )
+
+        with pokeapi.PokeAPI() as client:
+            resolved = client.resolve_all([pokemon, pokemon])
+
+        assert sorted(resolved) == ["move-1", "move-2"]
+        assert len(responses.calls) == 2
+
+
+class TestLazyPokemon:
+    payload = {
+        "id": 1,
+        "name": "bulbasaur",
+        "base_experience": 64,
+        "height": 7,
+        "weight": 69,
+        "sprites": {"front_default": "https://example.com/1.png"},
+        "moves": [
+            {
+                "move": {"name": f"move-{i}", "url": f"https://pokeapi.co/move/{i}/"},
+                "version_group_details": [
+                    {
+                        "level_learned_at": 1,
+                        "move_learn_method": {"name": "level-up", "url": "mlm/1/"},
+                        "order": None,
+                        "version_group": {"name": "red-blue", "url": "vg/1/"},
+                    }
+                ],
+            }
+            for i in range(3)
+        ],
+    }
+
+    def test_moves_are_validated_on_first_access(self):
+        raw = json.dumps(self.payload).encode()
+        lazy = LazyPokemon.model_validate_json(raw)
+        eager = pokeapi.Pokemon.model_validate_json(raw)
+
+        assert not lazy.moves.is_decoded
+        assert lazy.moves == eager.moves
+        assert lazy.moves.is_decoded
+
+        invalid = json.dumps({**self.payload, "moves": [{"move": {}}]})
+        with pytest.raises(ValidationError):
+            len(LazyPokemon.model_validate_json(invalid).moves)
+
+    def test_decoding_builds_no_move_objects(self):
+        # Real-shaped payload: every detail carries move_learn_method, which
+        # isn't modelled
+        detail = self.payload["moves"][0]["version_group_details"][0]
+        moves = [
+            {**self.payload["moves"][0], "version_group_details": [detail] * 20}
+        ] * 120
+        raw = json.dumps({**self.payload, "moves": moves}).encode()
+
+        def peak_memory(model):
+            tracemalloc.start()
+            try:
+                model.model_validate_json(raw)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        assert peak_memory(LazyPokemon) * 20 < peak_memory(pokeapi.Pokemon)
+        lazy = LazyPokemon.model_validate_json(raw)
+        assert len(lazy.moves) == 120
+        assert lazy.moves[0].version_group_details[19].level_learned_at == 1
+
+    def test_behaves_like_an_eager_model(self):
+        raw = json.dumps(self.payload).encode()
+        lazy = LazyPokemon.model_validate_json(raw)
+        eager = pokeapi.Pokemon.model_validate_json(raw)
+
+        assert lazy == LazyPokemon.model_validate_json(raw)
+        assert lazy.model_dump() == eager.model_dump()
+        assert json.loads(lazy.model_dump_json()) == json.loads(eager.model_dump_json())
+        assert pokeapi.Pokemon.model_validate(lazy, from_attributes=True) == eager
+
+    def test_keyword_construction_validates_moves_immediately(self):
+        data = {k: v for k, v in self.payload.items() if k != "sprites"}
+        assert LazyPokemon(**data).moves[2].move.name == "move-2"
+        with pytest.raises(ValidationError):
+            LazyPokemon(**{**data, "moves": [{"move": {}}]})
+
+    @responses.activate
+    def test_client_lazy_moves(self):
+        responses.add(
+            responses.GET,
+            "https://pokeapi.co/api/v2/pokemon/bulbasaur",
+            json=self.payload,
+        )
+
+        with pokeapi.PokeAPI(lazy_moves=True) as client:
+            pokemon = client.get_pokemon("bulbasaur")
+
+        assert isinstance(pokemon, LazyPokemon)
+        assert [m.move.name for m in pokemon.moves] == ["move-0", "move-1", "move-2"]
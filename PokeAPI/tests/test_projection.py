@@ -0,0 +1,51 @@
+import sys
+
+import pytest
+import responses
+from app import pokeapi
+from app.models.pokemon import Move, Pokemon
+from app.models.projection import projection
+
+PAYLOAD = {
+    "id": 1,
+    "name": "bulbasaur",
+    "base_experience": 64,
+    "height": 7,
+    "weight": 69,
+    "moves": [
+        {
+            "move": {"name": "tackle", "url": "https://pokeapi.co/api/v2/move/33/"},
+            "version_group_details": [],
+        }
+    ],
+}
+
+
+class TestProjection:
+    def test_only_requested_fields_are_kept(self):
+        summary = projection(Pokemon, ["id", "name"]).model_validate_json(
+            b'{"id": 1, "name": "bulbasaur", "height": 7, "moves": "not validated"}'
+        )
+        assert summary == (1, "bulbasaur")
+        assert summary.name == "bulbasaur"
+        assert not hasattr(summary, "__dict__")
+        assert sys.getsizeof(summary) < sys.getsizeof(summary._asdict())
+
+    def test_types_are_cached_and_validated(self):
+        assert projection(Move, ("id", "power")) is projection(Move, ["id", "power"])
+        with pytest.raises(ValueError, match="sprites"):
+            projection(Pokemon, ["sprites"])
+        with pytest.raises(ValueError):
+            projection(Move, ["accuracy"]).model_validate_json(b'{"accuracy": 101}')
+
+    @responses.activate
+    def test_get_pokemon_fields(self):
+        responses.add(
+            responses.GET, "https://pokeapi.co/api/v2/pokemon/bulbasaur", json=PAYLOAD
+        )
+
+        with pokeapi.PokeAPI() as client:
+            pokemon = client.get_pokemon("bulbasaur", fields=["id", "weight"])
+
+        assert pokemon.id == 1
+        assert pokemon.weight == 69
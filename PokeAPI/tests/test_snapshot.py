@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import pytest
+from app.async_pokeapi import AsyncPokeAPI
+from app.models.pokemon import Move
+from app.snapshot import LocalPokeAPI, build_snapshot
+
+NAMES = ["bulbasaur", "ivysaur", "venusaur"]
+
+
+def handler(request: httpx.Request, missing=()) -> httpx.Response:
+    parts = request.url.path.strip("/").split("/")
+    if parts[-1] in missing:
+        return httpx.Response(404)
+    if parts[-1] == "pokemon":
+        results = [
+            {"name": name, "url": f"https://pokeapi.co/api/v2/pokemon/{i + 1}/"}
+            for i, name in enumerate(NAMES)
+        ]
+        return httpx.Response(
+            200, json={"count": 3, "next": None, "previous": None, "results": results}
+        )
+    if parts[-2] == "pokemon":
+        return httpx.Response(
+            200,
+            json={
+                "id": NAMES.index(parts[-1]) + 1,
+                "name": parts[-1],
+                "base_experience": 64,
+                "height": 7,
+                "weight": 69,
+                "moves": [
+                    {
+                        "move": {
+                            "name": "tackle",
+                            "url": "https://pokeapi.co/api/v2/move/33/",
+                        },
+                        "version_group_details": [],
+                    },
+                    {
+                        "move": {
+                            "name": "growl",
+                            "url": "https://pokeapi.co/api/v2/move/45/",
+                        },
+                        "version_group_details": [],
+                    },
+                ],
+            },
+        )
+
+    move_id = int(parts[-1])
+    return httpx.Response(
+        200,
+        json={
+            "id": move_id,
+            "name": "tackle" if move_id == 33 else "growl",
+            "accuracy": 100,
+            "pp": 35,
+            "priority": 0,
+            "power": 40 if move_id == 33 else None,
+        },
+    )
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "snapshot.sqlite"
+
+    async def run():
+        async with AsyncPokeAPI(transport=httpx.MockTransport(handler)) as client:
+            await build_snapshot(path, client)
+
+    asyncio.run(run())
+    return path
+
+
+class TestLocalPokeAPI:
+    def test_lookup_by_name_and_id(self, snapshot_path):
+        with LocalPokeAPI(snapshot_path) as local:
+            assert local.get_pokemon("Ivysaur").id == 2
+            assert local.get_pokemon(3).name == "venusaur"
+            assert local.get_pokemon("ivysaur", fields=["id", "name"]) == (2, "ivysaur")
+            with pytest.raises(KeyError):
+                local.get_pokemon("mew")
+
+    def test_moves_and_listing(self, snapshot_path):
+        with LocalPokeAPI(snapshot_path) as local:
+            bulbasaur = local.get_pokemon("bulbasaur")
+            assert local.get_move(bulbasaur).name == "tackle"
+            moves = local.resolve_all(bulbasaur)
+            assert moves["growl"] == Move(
+                id=45, name="growl", accuracy=100, pp=35, priority=0
+            )
+            assert [p.name for p in local.list_pokemon(2)] == NAMES[:2]
+
+
+class TestBuildSnapshot:
+    def test_skips_failures_and_resumes(self, tmp_path):
+        path = tmp_path / "snapshot.sqlite"
+        requested = []
+
+        missing = ["ivysaur", "45"]
+
+        def flaky(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            return handler(request, missing=missing)
+
+        async def run(transport):
+            async with AsyncPokeAPI(transport=transport) as client:
+                return await build_snapshot(path, client, commit_every=1)
+
+        failures = asyncio.run(run(httpx.MockTransport(flaky)))
+        assert set(failures) == {"ivysaur", "https://pokeapi.co/api/v2/move/45/"}
+        with LocalPokeAPI(path) as local:
+            assert local.get_pokemon("bulbasaur").id == 1
+            with pytest.raises(KeyError):
+                local.get_pokemon("ivysaur")
+
+        requested.clear()
+        missing.clear()
+        assert asyncio.run(run(httpx.MockTransport(flaky))) == {}
+        # Only the listing and the previously failed items are fetched again
+        assert sorted(requested) == [
+            "/api/v2/move/45/",
+            "/api/v2/pokemon",
+            "/api/v2/pokemon/ivysaur",
+        ]
+        with LocalPokeAPI(path) as local:
+            assert local.get_pokemon("ivysaur").id == 2
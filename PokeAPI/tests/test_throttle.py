@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import httpx
+import responses
+from app import pokeapi
+from app.async_pokeapi import AsyncPokeAPI
+from app.throttle import RateLimiter, backoff_delay, parse_retry_after
+
+MOVE_URL = "https://pokeapi.co/api/v2/move/33/"
+MOVE_PAYLOAD = {
+    "id": 33,
+    "name": "tackle",
+    "accuracy": 100,
+    "pp": 35,
+    "priority": 0,
+    "power": 40,
+}
+
+
+def make_pokemon(move_url: str = MOVE_URL):
+    return pokeapi.Pokemon(
+        id=1,
+        name="bulbasaur",
+        base_experience=64,
+        height=7,
+        weight=69,
+        moves=[
+            {"move": {"name": "tackle", "url": move_url}, "version_group_details": []}
+        ],
+    )
+
+
+class TestRateLimiter:
+    def test_paces_requests_after_burst(self):
+        limiter = RateLimiter(rate=100, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # 2 tokens are available immediately, the remaining 4 arrive every 10ms
+        assert time.monotonic() - start >= 0.035
+
+    def test_pause_applies_to_async_callers(self):
+        limiter = RateLimiter()
+        limiter.pause(0.05)
+        start = time.monotonic()
+        asyncio.run(limiter.acquire_async())
+        assert time.monotonic() - start >= 0.045
+
+
+class TestBackoff:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_retry_after_takes_precedence(self):
+        delay = backoff_delay(0, "2", base=0.1, cap=60)
+        assert 2.0 <= delay <= 2.01
+        assert backoff_delay(10, "120", base=0.1, cap=30) <= 30 * 1.1
+
+
+class TestClientThrottling:
+    @responses.activate
+    def test_retries_after_429(self):
+        responses.add(responses.GET, MOVE_URL, status=429, headers={"Retry-After": "0"})
+        responses.add(responses.GET, MOVE_URL, json=MOVE_PAYLOAD)
+
+        with pokeapi.PokeAPI() as client:
+            assert client.get_move(make_pokemon()).name == "tackle"
+        assert len(responses.calls) == 2
+
+    def test_async_client_shares_limiter_backoff(self):
+        limiter = RateLimiter()
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json=MOVE_PAYLOAD)
+
+        async def run():
+            async with AsyncPokeAPI(
+                limiter=limiter, transport=httpx.MockTransport(handler)
+            ) as client:
+                return await client.get_move(make_pokemon())
+
+        assert asyncio.run(run()).name == "tackle"
+        assert calls == 2
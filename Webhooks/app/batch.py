@@ -0,0 +1,288 @@
+import codecs
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Dict, Final, Iterator, List, Optional, Tuple
+
+from models.payload import WebhookPayload
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.dedup import DedupStore
+from app.event_queue import EventQueue
+
+NDJSON_TYPES: Final = frozenset(
+    {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+)
+JSON_TYPES: Final = frozenset({"application/json", ""})
+# Largest single payload accepted; also the most a parser ever buffers
+DEFAULT_MAX_ITEM_BYTES: Final = 1024 * 1024
+# Valid payloads are appended to the queue in transactions of this many
+DEFAULT_CHUNK_SIZE: Final = 500
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class BatchError(ValueError):
+    """
+    The body as a whole can't be parsed any further, e.g. a JSON array with a
+    syntax error. Items before the error have already been handled.
+    """
+
+
+@dataclass(frozen=True)
+class Malformed:
+    """
+    An NDJSON line that isn't JSON. The rest of the stream is still read.
+    """
+
+    message: str
+
+
+class NDJSONParser:
+    """
+    Incremental parser for newline-delimited JSON. Only the current, incomplete
+    line is buffered; a line longer than `max_item_bytes` is reported as
+    Malformed and skipped without being kept in memory. Blank lines are ignored.
+    """
+
+    def __init__(self, max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES):
+        self.max_item_bytes = max_item_bytes
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._skipping = False
+
+    def feed(self, data: bytes) -> Iterator[Any]:
+        text = self._decode(data)
+        start = 0
+        while (newline := text.find("\n", start)) != -1:
+            line = self._buffer + text[start:newline]
+            start = newline + 1
+            self._buffer = ""
+            if self._skipping:
+                self._skipping = False
+                yield self._too_large()
+            else:
+                yield from self._parse(line)
+
+        if not self._skipping:
+            self._buffer += text[start:]
+            if len(self._buffer) > self.max_item_bytes:
+                self._buffer = ""
+                self._skipping = True
+
+    def close(self) -> Iterator[Any]:
+        line = self._buffer + self._decode(b"", final=True)
+        self._buffer = ""
+        if self._skipping:
+            yield self._too_large()
+        else:
+            yield from self._parse(line)
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            raise BatchError("Body is not valid UTF-8") from e
+
+    def _parse(self, line: str) -> Iterator[Any]:
+        if not line.strip():
+            return
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield Malformed(f"Invalid JSON: {e.msg}")
+
+    def _too_large(self) -> Malformed:
+        return Malformed(f"Item exceeds {self.max_item_bytes} bytes")
+
+
+class JSONArrayParser:
+    """
+    Incremental parser for a top-level JSON array, yielding each element as soon
+    as it's complete. Only the element being read is buffered, so memory is
+    bounded by `max_item_bytes` rather than by the size of the body.
+    """
+
+    _START, _ITEM_OR_END, _ITEM, _AFTER_ITEM, _DONE = range(5)
+
+    def __init__(self, max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES):
+        self.max_item_bytes = max_item_bytes
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._state = self._START
+
+    def feed(self, data: bytes) -> Iterator[Any]:
+        self._buffer += self._decode(data)
+        yield from self._drain(final=False)
+
+    def close(self) -> Iterator[Any]:
+        self._buffer += self._decode(b"", final=True)
+        yield from self._drain(final=True)
+        if self._state != self._DONE:
+            raise BatchError("Body ended before the JSON array was closed")
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            raise BatchError("Body is not valid UTF-8") from e
+
+    def _drain(self, final: bool) -> Iterator[Any]:
+        buffer = self._buffer
+        pos = 0
+        try:
+            while (pos := _WHITESPACE.match(buffer, pos).end()) < len(buffer):
+                char = buffer[pos]
+                if self._state == self._START:
+                    if char != "[":
+                        raise BatchError("Expected a JSON array or NDJSON")
+                    pos += 1
+                    self._state = self._ITEM_OR_END
+                elif self._state == self._ITEM_OR_END and char == "]":
+                    pos += 1
+                    self._state = self._DONE
+                elif self._state in (self._ITEM_OR_END, self._ITEM):
+                    item, end = self._decode_item(buffer, pos, final)
+                    if end is None:
+                        break
+                    yield item
+                    pos = end
+                    self._state = self._AFTER_ITEM
+                elif self._state == self._AFTER_ITEM and char in ",]":
+                    pos += 1
+                    self._state = self._ITEM if char == "," else self._DONE
+                else:
+                    raise BatchError(f"Unexpected {char!r} in the JSON array")
+        finally:
+            self._buffer = buffer[pos:]
+
+    def _decode_item(
+        self, buffer: str, pos: int, final: bool
+    ) -> Tuple[Any, Optional[int]]:
+        try:
+            item, end = self._json.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise BatchError(f"Invalid JSON: {e.msg}") from e
+            if len(buffer) - pos > self.max_item_bytes:
+                raise BatchError(f"Item exceeds {self.max_item_bytes} bytes") from e
+            return None, None
+        # A number cut off by the chunk boundary still decodes; wait until the
+        # following separator has arrived
+        if end == len(buffer) and not final:
+            return None, None
+        return item, end
+
+
+@dataclass
+class BatchResult:
+    accepted: int = 0
+    rejected: int = 0
+    # One entry per item, in order: {"index", "id"} or {"index", "errors"}
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+    def content(self) -> Dict[str, Any]:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "results": sorted(self.results, key=lambda result: result["index"]),
+        }
+
+
+async def ingest(
+    chunks: AsyncIterable[bytes],
+    queue: EventQueue,
+    ndjson: bool = False,
+    max_item_bytes: int = DEFAULT_MAX_ITEM_BYTES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    result: BatchResult | None = None,
+    dedup: Optional[DedupStore] = None,
+) -> BatchResult:
+    """
+    Validates payloads as the body streams in and appends the valid ones to
+    `queue`, `chunk_size` at a time. Invalid items are reported per index and
+    don't affect the others. Raises BatchError if the body itself is malformed;
+    pass in `result` to still see what was handled up to that point.
+
+    With a `dedup` store, items whose idempotency key was already seen are
+    rejected as duplicates without being queued.
+    """
+    parser_class = NDJSONParser if ndjson else JSONArrayParser
+    parser = parser_class(max_item_bytes)
+    result = result if result is not None else BatchResult()
+    pending: List[Tuple[int, WebhookPayload]] = []
+    index = 0
+
+    def reject(i: int, errors: List[Dict[str, Any]]) -> None:
+        result.results.append({"index": i, "errors": errors})
+        result.rejected += 1
+
+    def keys_of(items: List[Tuple[int, WebhookPayload]]) -> List[str]:
+        return [p.idempotency_key for _, p in items if p.idempotency_key is not None]
+
+    async def flush() -> None:
+        batch = list(pending)
+        pending.clear()
+        keys = keys_of(batch)
+        if dedup is not None and keys:
+            # Reserved now and persisted only once the chunk is queued, so a
+            # crash in between lets the sender's retry through
+            added = iter(await run_in_threadpool(dedup.reserve_many, keys))
+            fresh = []
+            for i, payload in batch:
+                if payload.idempotency_key is None or next(added):
+                    fresh.append((i, payload))
+                else:
+                    reject(i, [{"type": "duplicate", "msg": "Already received"}])
+            batch = fresh
+            keys = keys_of(batch)
+        if not batch:
+            return
+
+        try:
+            ids = await run_in_threadpool(queue.put_many, [p for _, p in batch])
+        except Exception:
+            # Let the sender's retry through, these were never queued
+            if dedup is not None and keys:
+                await run_in_threadpool(dedup.discard_many, keys)
+            raise
+        if dedup is not None and keys:
+            await run_in_threadpool(dedup.commit_many, keys)
+        result.results.extend(
+            {"index": i, "id": event_id} for (i, _), event_id in zip(batch, ids)
+        )
+        result.accepted += len(ids)
+
+    def handle(item: Any) -> None:
+        nonlocal index
+        if isinstance(item, Malformed):
+            reject(index, [{"type": "json_invalid", "msg": item.message}])
+        else:
+            try:
+                payload = WebhookPayload.model_validate(item)
+            except ValidationError as e:
+                reject(
+                    index,
+                    e.errors(
+                        include_url=False, include_context=False, include_input=False
+                    ),
+                )
+            else:
+                pending.append((index, payload))
+        index += 1
+
+    try:
+        async for chunk in chunks:
+            for item in parser.feed(chunk):
+                handle(item)
+                if len(pending) >= chunk_size:
+                    await flush()
+        for item in parser.close():
+            handle(item)
+    finally:
+        # Items validated before a BatchError are still queued and reported
+        if pending:
+            await flush()
+    return result
@@ -0,0 +1,234 @@
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Final, Iterable, List, Optional
+
+IDEMPOTENCY_HEADER: Final = "Idempotency-Key"
+# How long a key is remembered; senders retrying later than this are not caught.
+# Without a SQLite path only the DEFAULT_MAX_ENTRIES most recent keys are kept,
+# so past 100,000 keys a day older keys are forgotten before the window ends.
+DEFAULT_WINDOW: Final = 24 * 60 * 60
+# Keys expected per window. The filter keeps working past this, with more
+# false positives, each of which costs one exact lookup.
+DEFAULT_CAPACITY: Final = 1_000_000
+DEFAULT_ERROR_RATE: Final = 0.001
+DEFAULT_MAX_ENTRIES: Final = 100_000
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership with no false negatives and a false positive rate
+    of about `error_rate` once `capacity` items have been added
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE
+    ):
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[i >> 3] & (1 << (i & 7)) for i in self._positions(key))
+
+    def add(self, key: str) -> None:
+        for i in self._positions(key):
+            self._bits[i >> 3] |= 1 << (i & 7)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two independent 64-bit hashes
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+
+class DedupStore:
+    """
+    Remembers idempotency keys for `window` seconds. Two Bloom filter
+    generations, rotated every window, answer "never seen" in O(1) without
+    touching anything else, which is the common case. Only keys that may have
+    been seen are checked against an exact LRU of the `max_entries` most
+    recent keys and, with a `path`, a SQLite table that makes the store survive
+    restarts. Memory use is fixed by `capacity` and `max_entries`.
+
+    Without a `path`, a key evicted from the LRU is forgotten early.
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_WINDOW,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        path: Optional[str | Path] = None,
+    ):
+        self.window = window
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_entries = max_entries
+        self._recent: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.time()
+
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS idempotency_keys"
+                    " (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)"
+                )
+            self._load()
+
+    def __enter__(self) -> "DedupStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._seen_at(key, time.time()) is not None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+    def add(self, key: str) -> bool:
+        """
+        Records `key` and returns True, or returns False if it was already seen
+        within the window
+        """
+        return self.add_many([key])[0]
+
+    def add_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        `add` for each key, in order, with one SQLite transaction for all of
+        them. A key repeated within `keys` is a duplicate after its first use.
+        """
+        keys = list(keys)
+        added = self.reserve_many(keys)
+        self.commit_many(key for key, is_new in zip(keys, added) if is_new)
+        return added
+
+    def reserve(self, key: str) -> bool:
+        return self.reserve_many([key])[0]
+
+    def commit(self, key: str) -> None:
+        self.commit_many([key])
+
+    def reserve_many(self, keys: Iterable[str]) -> List[bool]:
+        """
+        Like `add_many`, but the new keys are only held in memory until they
+        are passed to `commit_many`, or to `discard_many` to release them.
+        Reserving before storing what a key guards and committing after means
+        a crash in between can let a retry through, but never loses it.
+        """
+        now = time.time()
+        added = []
+        with self._lock:
+            for key in keys:
+                is_new = self._seen_at(key, now) is None
+                if is_new:
+                    self._current.add(key)
+                    self._remember(key, now)
+                added.append(is_new)
+        return added
+
+    def commit_many(self, keys: Iterable[str]) -> None:
+        """
+        Persists reserved keys, in one SQLite transaction
+        """
+        if self._conn is None:
+            return
+        now = time.time()
+        with self._lock:
+            rows = [(key, self._recent.get(key, now)) for key in keys]
+            if rows:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO idempotency_keys VALUES (?, ?)", rows
+                    )
+
+    def discard(self, key: str) -> None:
+        """
+        Forgets `key`, e.g. when the delivery it guarded could not be stored.
+        It stays in the Bloom filters, which only costs an exact lookup later.
+        """
+        self.discard_many([key])
+
+    def discard_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        with self._lock:
+            for key in keys:
+                self._recent.pop(key, None)
+            if self._conn is not None and keys:
+                with self._conn:
+                    self._conn.executemany(
+                        "DELETE FROM idempotency_keys WHERE key = ?",
+                        ((key,) for key in keys),
+                    )
+
+    def _seen_at(self, key: str, now: float) -> Optional[float]:
+        self._rotate(now)
+        if key not in self._current and key not in self._previous:
+            return None
+
+        seen_at = self._recent.get(key)
+        if seen_at is not None:
+            self._recent.move_to_end(key)
+        elif self._conn is not None:
+            row = self._conn.execute(
+                "SELECT seen_at FROM idempotency_keys WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                seen_at = row[0]
+                self._remember(key, seen_at)
+
+        if seen_at is None or now - seen_at >= self.window:
+            return None
+        return seen_at
+
+    def _rotate(self, now: float) -> None:
+        # Keys live in the filters for one to two windows, always covering the
+        # full window; anything older is dropped with the previous generation
+        if now - self._rotated_at < self.window:
+            return
+        expired = now - self._rotated_at >= 2 * self.window
+        self._previous = (
+            BloomFilter(self.capacity, self.error_rate) if expired else self._current
+        )
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = now
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM idempotency_keys WHERE seen_at < ?",
+                    (now - self.window,),
+                )
+
+    def _remember(self, key: str, seen_at: float) -> None:
+        self._recent[key] = seen_at
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT key, seen_at FROM idempotency_keys WHERE seen_at >= ?"
+            " ORDER BY seen_at",
+            (time.time() - self.window,),
+        )
+        for key, seen_at in rows:
+            self._current.add(key)
+            self._remember(key, seen_at)
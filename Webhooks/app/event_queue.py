@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Iterable, List
+
+from models.payload import WebhookPayload
+
+DEFAULT_PATH: Final = "webhooks.db"
+# NORMAL keeps every committed event across a process crash or restart. Only a
+# power loss can drop the last transactions; use FULL if that matters too.
+DEFAULT_SYNCHRONOUS: Final = "NORMAL"
+
+
+@dataclass(frozen=True)
+class QueuedEvent:
+    id: int
+    payload: WebhookPayload
+    attempts: int
+
+
+class EventQueue:
+    """
+    Durable FIFO of webhook payloads in a SQLite database in WAL mode. Appends
+    are a single small insert, cheap enough to run inside the request handler.
+
+    Consumers `claim` events under a lease and `ack` them once handled. An
+    event whose lease runs out, e.g. because its worker died, is claimed
+    again, so events are delivered at least once and survive restarts.
+    """
+
+    def __init__(
+        self, path: str | Path = DEFAULT_PATH, synchronous: str = DEFAULT_SYNCHRONOUS
+    ):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={synchronous}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " payload TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " available_at REAL NOT NULL,"
+                " dead INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS events_available"
+                " ON events (dead, available_at)"
+            )
+
+    def __len__(self) -> int:
+        """
+        Events not yet acknowledged or dead-lettered, including claimed ones
+        """
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM events WHERE dead = 0"
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def put(self, payload: WebhookPayload) -> int:
+        return self.put_many([payload])[0]
+
+    def put_many(self, payloads: Iterable[WebhookPayload]) -> List[int]:
+        """
+        Appends payloads in one transaction and returns their ids
+        """
+        now = time.time()
+        with self._ready, self._conn:
+            ids = [
+                self._conn.execute(
+                    "INSERT INTO events (payload, available_at) VALUES (?, ?)",
+                    (payload.model_dump_json(), now),
+                ).lastrowid
+                for payload in payloads
+            ]
+            self._ready.notify_all()
+        return ids
+
+    def claim(
+        self, limit: int, lease: float, timeout: float = 0.0
+    ) -> List[QueuedEvent]:
+        """
+        Takes up to `limit` available events, hiding them from other consumers for
+        `lease` seconds. Waits up to `timeout` seconds for an event to arrive.
+        """
+        deadline = time.monotonic() + timeout
+        with self._ready:
+            while True:
+                now = time.time()
+                with self._conn:
+                    rows = self._conn.execute(
+                        "UPDATE events SET available_at = ?, attempts = attempts + 1"
+                        " WHERE id IN (SELECT id FROM events"
+                        "  WHERE dead = 0 AND available_at <= ? ORDER BY id LIMIT ?)"
+                        " RETURNING id, payload, attempts",
+                        (now + lease, now, limit),
+                    ).fetchall()
+                remaining = deadline - time.monotonic()
+                if rows or remaining <= 0:
+                    break
+                self._ready.wait(remaining)
+
+        events = [
+            QueuedEvent(
+                id=id,
+                payload=WebhookPayload.model_validate_json(payload),
+                attempts=attempts,
+            )
+            for id, payload, attempts in rows
+        ]
+        return sorted(events, key=lambda event: event.id)
+
+    def ack(self, ids: Iterable[int]) -> None:
+        ids = [(id,) for id in ids]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM events WHERE id = ?", ids)
+
+    def retry(self, id: int, delay: float) -> None:
+        """
+        Makes a claimed event available again after `delay` seconds
+        """
+        with self._ready, self._conn:
+            self._conn.execute(
+                "UPDATE events SET available_at = ? WHERE id = ?",
+                (time.time() + delay, id),
+            )
+
+    def bury(self, id: int) -> None:
+        """
+        Dead-letters an event: it is kept for inspection but never claimed again
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE events SET dead = 1 WHERE id = ?", (id,))
+
+    def dead(self) -> List[QueuedEvent]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, attempts FROM events WHERE dead = 1 ORDER BY id"
+            ).fetchall()
+        return [
+            QueuedEvent(
+                id=id,
+                payload=WebhookPayload.model_validate_json(payload),
+                attempts=attempts,
+            )
+            for id, payload, attempts in rows
+        ]
@@ -1,15 +1,119 @@
-from fastapi import FastAPI, status
+import os
+from contextlib import asynccontextmanager
+from typing import Annotated, Optional
+
+from fastapi import FastAPI, Header, Request, status
 from fastapi.responses import JSONResponse
 from models.payload import WebhookPayload
+from starlette.concurrency import run_in_threadpool
 
-app = FastAPI()
+from app.batch import JSON_TYPES, NDJSON_TYPES, BatchError, BatchResult, ingest
+from app.dedup import DEFAULT_WINDOW, IDEMPOTENCY_HEADER, DedupStore
+from app.event_queue import DEFAULT_PATH, EventQueue
+from app.workers import ANY_EVENT, DEFAULT_WORKERS, WorkerPool
 
 
-@app.post("/webhook")
-async def webhook(payload: WebhookPayload):
+def log_payload(payload: WebhookPayload) -> None:
     print("Payload: ", payload.model_dump())
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Opened per run rather than at import, so importing the app touches no files
+    queue = EventQueue(os.getenv("WEBHOOK_QUEUE_PATH", DEFAULT_PATH))
+    dedup = DedupStore(
+        window=float(os.getenv("WEBHOOK_DEDUP_WINDOW", DEFAULT_WINDOW)),
+        path=os.getenv("WEBHOOK_DEDUP_PATH"),
+    )
+    workers = WorkerPool(
+        queue, workers=int(os.getenv("WEBHOOK_WORKERS", DEFAULT_WORKERS))
+    )
+    workers.on(ANY_EVENT)(log_payload)
+    app.state.queue = queue
+    app.state.dedup = dedup
+    app.state.workers = workers
+
+    # Events left over from a previous run are picked up as soon as workers start
+    workers.start()
+    try:
+        yield
+    finally:
+        workers.stop()
+        dedup.close()
+        queue.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.post("/webhook")
+async def webhook(
+    request: Request,
+    payload: WebhookPayload,
+    idempotency_key: Annotated[Optional[str], Header(alias=IDEMPOTENCY_HEADER)] = None,
+):
+    # The Idempotency-Key header takes precedence over the payload field
+    if idempotency_key is not None:
+        payload.idempotency_key = idempotency_key
+    queue, dedup = request.app.state.queue, request.app.state.dedup
+    key = payload.idempotency_key
+    # The key is only persisted once the event is, so if the process dies in
+    # between the sender's retry is accepted rather than lost as a duplicate
+    if key is not None and not await run_in_threadpool(dedup.reserve, key):
+        return JSONResponse(
+            content={"status": "duplicate", "data": "already received"},
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+    # Handlers run on the worker pool; the request only waits for the durable append
+    try:
+        event_id = await run_in_threadpool(queue.put, payload)
+    except Exception:
+        if key is not None:
+            await run_in_threadpool(dedup.discard, key)
+        raise
+    if key is not None:
+        await run_in_threadpool(dedup.commit, key)
+
     return JSONResponse(
-        content={"status": "ok", "data": "received request"},
+        content={"status": "ok", "data": "received request", "id": event_id},
         status_code=status.HTTP_200_OK,
     )
+
+
+@app.post("/webhooks/batch")
+async def webhook_batch(request: Request):
+    """
+    Accepts a JSON array or an NDJSON stream of payloads. The body is validated
+    and queued as it arrives, so it is never held in memory as a whole.
+    Duplicates are detected per item, by the `idempotency_key` field.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in NDJSON_TYPES | JSON_TYPES:
+        return JSONResponse(
+            content={"status": "error", "data": "expected JSON or NDJSON"},
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+    result = BatchResult()
+    try:
+        await ingest(
+            request.stream(),
+            request.app.state.queue,
+            ndjson=content_type in NDJSON_TYPES,
+            result=result,
+            dedup=request.app.state.dedup,
+        )
+    except BatchError as e:
+        # Items before the error were queued; report them alongside the error
+        return JSONResponse(
+            content={"status": "error", "data": str(e), **result.content()},
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return JSONResponse(
+        content={"status": "ok", "data": "received batch", **result.content()},
+        status_code=(
+            status.HTTP_200_OK if not result.rejected else status.HTTP_207_MULTI_STATUS
+        ),
+    )
@@ -0,0 +1,112 @@
+import logging
+import random
+import threading
+from typing import Callable, Dict, Final, List, Optional
+
+from models.payload import WebhookPayload
+
+from app.event_queue import EventQueue, QueuedEvent
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[WebhookPayload], None]
+
+# Registered with `on(ANY_EVENT)`, handles events without a handler of their own
+ANY_EVENT: Final = "*"
+DEFAULT_WORKERS: Final = 4
+DEFAULT_BATCH_SIZE: Final = 32
+DEFAULT_LEASE: Final = 30.0
+DEFAULT_MAX_ATTEMPTS: Final = 5
+
+
+class WorkerPool:
+    """
+    Threads that drain an EventQueue, dispatching each payload to the handler
+    registered for its `event`. A handler that raises is retried with jittered
+    exponential backoff; after `max_attempts` the event is dead-lettered.
+    Events without a handler (and no ANY_EVENT fallback) are dead-lettered.
+    """
+
+    def __init__(
+        self,
+        queue: EventQueue,
+        workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        lease: float = DEFAULT_LEASE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = 1.0,
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.handlers: Dict[str, Handler] = {}
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def on(self, event: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator registering a handler for `event`
+        """
+
+        def register(handler: Handler) -> Handler:
+            self.handlers[event] = handler
+            return handler
+
+        return register
+
+    def handler_for(self, event: str) -> Optional[Handler]:
+        return self.handlers.get(event, self.handlers.get(ANY_EVENT))
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"webhook-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Lets workers finish their current batch. Unclaimed events stay queued.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def process(self, events: List[QueuedEvent]) -> None:
+        done = []
+        for event in events:
+            handler = self.handler_for(event.payload.event)
+            if handler is None:
+                logger.warning(
+                    "No handler for %r, burying event %d", event.payload.event, event.id
+                )
+                self.queue.bury(event.id)
+                continue
+            try:
+                handler(event.payload)
+            except Exception:
+                logger.exception("Handler for event %d failed", event.id)
+                self._retry_or_bury(event)
+            else:
+                done.append(event.id)
+        self.queue.ack(done)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            # A short timeout keeps stop() responsive while waiting for events
+            events = self.queue.claim(self.batch_size, self.lease, timeout=0.5)
+            if events:
+                self.process(events)
+
+    def _retry_or_bury(self, event: QueuedEvent) -> None:
+        if event.attempts >= self.max_attempts:
+            self.queue.bury(event.id)
+            return
+        delay = random.uniform(0, self.backoff * 2 ** (event.attempts - 1))
+        self.queue.retry(event.id, delay)
@@ -7,20 +7,30 @@
 # for p in sys.path:
 #     print(p)
 
-import requests
+import asyncio
+import sys
+
 from models.payload import WebhookPayload
 
-URL = "http://localhost:8000/webhook"
+from client.sender import BATCH_URL, WebhookSender
+
 
+async def send_webhook_requests(count: int = 1, url: str = BATCH_URL) -> WebhookSender:
+    async with WebhookSender(url=url) as sender:
+        for i in range(count):
+            await sender.send(
+                WebhookPayload(
+                    event="test_event", data={"message": "hello from script", "n": i}
+                )
+            )
+    return sender
 
-def send_webhook_request():
 
-    payload = WebhookPayload(event="test_event", data={"message": "hello from script"})
-    response = requests.post(url=URL, json=payload.model_dump())
-    response_payload = response.json()
-    print("status: ", response.status_code)
-    print("data: ", response_payload["data"])
+def send_webhook_request(count: int = 1):
+    sender = asyncio.run(send_webhook_requests(count))
+    print("sent: ", sender.sent)
+    print("failed: ", sender.failed)
 
 
 if __name__ == "__main__":
-    send_webhook_request()
+    send_webhook_request(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import random
+import uuid
+from typing import Callable, Final, List, Optional
+
+import httpx
+from models.payload import WebhookPayload
+
+logger = logging.getLogger(__name__)
+
+BATCH_URL: Final = "http://localhost:8000/webhooks/batch"
+DEFAULT_BATCH_SIZE: Final = 500
+# How long a partial batch waits for more payloads before it is sent anyway
+DEFAULT_LINGER: Final = 0.05
+DEFAULT_MAX_PENDING: Final = 10_000
+DEFAULT_CONCURRENCY: Final = 4
+DEFAULT_MAX_RETRIES: Final = 5
+RETRY_STATUSES: Final = frozenset({429, 500, 502, 503, 504})
+
+FailureHandler = Callable[[List[WebhookPayload], str], None]
+
+
+def log_failure(payloads: List[WebhookPayload], reason: str) -> None:
+    logger.warning("Dropped %d webhook payloads: %s", len(payloads), reason)
+
+
+class WebhookSender:
+    """
+    Sends payloads to the receiver's batch endpoint over a pooled async client.
+    Payloads are grouped into NDJSON batches of up to `batch_size`, or whatever
+    arrived within `linger` seconds, and `concurrency` batches are in flight at
+    once. Batches failing with a connection error, 429 or 5xx are retried with
+    jittered exponential backoff, waiting no longer than `max_backoff` even if
+    the receiver's Retry-After asks for more. Payloads the receiver didn't get
+    to before a 400 are retried the same way; payloads that still fail go to
+    `on_failure`.
+
+    At most `max_pending` payloads wait to be sent. Beyond that `send` blocks
+    and `send_nowait` raises asyncio.QueueFull, so a slow receiver slows the
+    producer down instead of growing memory.
+
+    Payloads without an idempotency key are given one, so a retried batch that
+    partly reached the receiver is not processed twice.
+    """
+
+    def __init__(
+        self,
+        url: str = BATCH_URL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        linger: float = DEFAULT_LINGER,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        timeout: float = 10.0,
+        on_failure: FailureHandler = log_failure,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.url = url
+        self.batch_size = batch_size
+        self.linger = linger
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_failure = on_failure
+        self.sent = 0
+        self.failed = 0
+
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=concurrency,
+                    max_keepalive_connections=concurrency,
+                ),
+            )
+        self.client = client
+        self._queue: asyncio.Queue[WebhookPayload] = asyncio.Queue(max_pending)
+        self._dispatchers: List[asyncio.Task] = []
+        self._closed = False
+
+    async def __aenter__(self) -> "WebhookSender":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def pending(self) -> int:
+        """
+        Payloads queued by `send` and not yet taken into a batch
+        """
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if not self._dispatchers:
+            self._dispatchers = [
+                asyncio.create_task(self._dispatch()) for _ in range(self.concurrency)
+            ]
+
+    async def send(self, payload: WebhookPayload) -> None:
+        """
+        Queues `payload`, waiting while `max_pending` payloads are already queued
+        """
+        self.start()
+        await self._queue.put(self._prepare(payload))
+
+    def send_nowait(self, payload: WebhookPayload) -> None:
+        self.start()
+        self._queue.put_nowait(self._prepare(payload))
+
+    async def flush(self) -> None:
+        """
+        Waits until every queued payload has been delivered or dropped
+        """
+        await self._queue.join()
+
+    async def close(self) -> None:
+        """
+        Flushes, then stops the dispatchers and closes the client
+        """
+        self._closed = True
+        if self._dispatchers:
+            await self.flush()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _prepare(self, payload: WebhookPayload) -> WebhookPayload:
+        if self._closed:
+            raise RuntimeError("WebhookSender is closed")
+        if payload.idempotency_key is None:
+            payload = payload.model_copy(update={"idempotency_key": uuid.uuid4().hex})
+        return payload
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.linger
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._deliver(batch)
+            except Exception as e:
+                logger.exception("Unexpected error delivering a batch")
+                self._fail(batch, repr(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver(self, batch: List[WebhookPayload]) -> None:
+        for attempt in range(self.max_retries + 1):
+            body = "\n".join(payload.model_dump_json() for payload in batch).encode()
+            retry_after = None
+            try:
+                response = await self.client.post(
+                    self.url,
+                    content=body,
+                    headers={"content-type": "application/x-ndjson"},
+                )
+            except httpx.TransportError as e:
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    batch = self._settle(batch, response)
+                    if not batch:
+                        return
+                    reason = f"HTTP {response.status_code}: not reached by the receiver"
+                else:
+                    reason = f"HTTP {response.status_code}"
+                    retry_after = response.headers.get("retry-after")
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._delay(attempt, retry_after))
+        self._fail(batch, reason)
+
+    def _delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _settle(
+        self, batch: List[WebhookPayload], response: httpx.Response
+    ) -> List[WebhookPayload]:
+        """
+        Counts the payloads the receiver queued or rejected and returns the ones
+        it never got to, e.g. those after a 400 that stopped reading the body
+        """
+        if response.status_code == 200:
+            self.sent += len(batch)
+            return []
+        results = None
+        if response.status_code in (207, 400):
+            try:
+                results = response.json()["results"]
+            except (ValueError, KeyError, TypeError):
+                pass
+        if results is None:
+            self._fail(batch, f"HTTP {response.status_code}: {response.text[:200]}")
+            return []
+
+        # Duplicates were delivered by an earlier attempt; other errors won't
+        # go away by retrying
+        settled = set()
+        rejected = []
+        for result in results:
+            settled.add(result["index"])
+            errors = result.get("errors")
+            if errors and any(error["type"] != "duplicate" for error in errors):
+                rejected.append(batch[result["index"]])
+        self.sent += len(settled) - len(rejected)
+        if rejected:
+            self._fail(rejected, "rejected by the receiver")
+        return [payload for i, payload in enumerate(batch) if i not in settled]
+
+    def _fail(self, payloads: List[WebhookPayload], reason: str) -> None:
+        self.failed += len(payloads)
+        try:
+            self.on_failure(payloads, reason)
+        except Exception:
+            logger.exception("on_failure handler raised")
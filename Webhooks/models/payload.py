@@ -1,6 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class WebhookPayload(BaseModel):
     event: str
     data: dict
+    # Deliveries sharing a key are processed once; see app.dedup
+    idempotency_key: Optional[str] = None
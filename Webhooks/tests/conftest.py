@@ -0,0 +1,32 @@
+import pytest
+from app.event_queue import EventQueue
+from app.main import app
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = EventQueue(tmp_path / "events.db")
+    yield queue
+    queue.close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """
+    TestClient with the app's lifespan running against a temporary queue. No
+    workers are started, so queued events stay put for the test to inspect.
+    Leaving the lifespan on teardown stops the workers and closes the stores.
+    """
+    monkeypatch.setenv("WEBHOOK_QUEUE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setenv("WEBHOOK_WORKERS", "0")
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def app_queue(client):
+    """
+    The queue the running app appends to
+    """
+    return client.app.state.queue
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+from app.batch import BatchError, JSONArrayParser, Malformed, NDJSONParser, ingest
+
+
+def parse(parser, body: bytes, chunk: int = 1) -> list:
+    items = []
+    for i in range(0, len(body), chunk):
+        items.extend(parser.feed(body[i : i + chunk]))
+    items.extend(parser.close())
+    return items
+
+
+async def stream(body: bytes, chunk: int):
+    for i in range(0, len(body), chunk):
+        yield body[i : i + chunk]
+
+
+class TestParsers:
+    @pytest.mark.parametrize("chunk", [1, 3, 1000])
+    def test_json_array_across_chunk_boundaries(self, chunk):
+        items = [{"event": "é", "data": {"n": 12345}}, [1, 2], "x,]", 1234, None]
+        body = json.dumps(items, ensure_ascii=False).encode()
+        assert parse(JSONArrayParser(), body, chunk) == items
+
+    def test_empty_array(self):
+        assert parse(JSONArrayParser(), b" [ ] ") == []
+
+    @pytest.mark.parametrize(
+        "body", [b"", b'{"event": "a"}', b"[1,,2]", b"[1, 2", b"[1] 2", b"[1 2]"]
+    )
+    def test_json_array_rejects_malformed_bodies(self, body):
+        with pytest.raises(BatchError):
+            parse(JSONArrayParser(), body)
+
+    def test_json_array_bounds_item_size(self):
+        parser = JSONArrayParser(max_item_bytes=10)
+        body = b'[{"a": 1}, {"padding": "' + b"x" * 100 + b'"}]'
+        items = []
+        with pytest.raises(BatchError, match="exceeds"):
+            for i in range(0, len(body), 4):
+                items.extend(parser.feed(body[i : i + 4]))
+        assert items == [{"a": 1}]
+
+    def test_ndjson_reports_bad_lines_and_continues(self):
+        parser = NDJSONParser(max_item_bytes=20)
+        body = b'{"a": 1}\n\nnot json\n{"b": "' + b"x" * 50 + b'"}\r\n[2]'
+        items = parse(parser, body, chunk=7)
+        assert items[0] == {"a": 1}
+        assert isinstance(items[1], Malformed)
+        assert items[2] == Malformed("Item exceeds 20 bytes")
+        assert items[3] == [2]
+
+
+class TestIngest:
+    def test_queues_valid_items_in_chunks(self, queue):
+        lines = [json.dumps({"event": "e", "data": {"n": i}}) for i in range(25)]
+        lines[10] = json.dumps({"event": "e"})
+        body = "\n".join(lines).encode()
+
+        result = asyncio.run(ingest(stream(body, 64), queue, ndjson=True, chunk_size=4))
+
+        assert (result.accepted, result.rejected) == (24, 1)
+        results = result.content()["results"]
+        assert [r["index"] for r in results] == list(range(25))
+        assert results[10]["errors"][0]["loc"] == ("data",)
+        events = queue.claim(limit=100, lease=30)
+        assert [event.payload.data["n"] for event in events] == [
+            i for i in range(25) if i != 10
+        ]
+
+
+class TestBatchEndpoint:
+    def test_json_array(self, client):
+        items = [
+            {"event": "a", "data": {}},
+            {"event": "b"},
+            {"event": "c", "data": {}},
+        ]
+        response = client.post("/webhooks/batch", json=items)
+
+        assert response.status_code == 207
+        body = response.json()
+        assert (body["accepted"], body["rejected"]) == (2, 1)
+        assert "id" in body["results"][0] and "errors" in body["results"][1]
+
+    def test_ndjson(self, client):
+        body = "\n".join(
+            json.dumps({"event": "e", "data": {"n": i}}) for i in range(1000)
+        )
+        response = client.post(
+            "/webhooks/batch",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        ids = [result["id"] for result in response.json()["results"]]
+        assert len(set(ids)) == 1000
+
+    def test_malformed_body_reports_items_already_queued(self, client):
+        response = client.post(
+            "/webhooks/batch",
+            content=b'[{"event": "a", "data": {}}, oops]',
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["accepted"] == 1
+
+    def test_unsupported_media_type(self, client):
+        response = client.post(
+            "/webhooks/batch", content=b"a,b", headers={"content-type": "text/csv"}
+        )
+        assert response.status_code == 415
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+
+from app.batch import ingest
+from app.dedup import BloomFilter, DedupStore
+
+
+class TestBloomFilter:
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"key-{i}")
+
+        assert all(f"key-{i}" in bloom for i in range(10_000))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        assert false_positives < 200
+
+
+class TestDedupStore:
+    def test_rejects_keys_seen_within_the_window(self):
+        store = DedupStore(window=0.1, capacity=100)
+        assert store.add("a")
+        assert not store.add("a")
+        assert "a" in store and "b" not in store
+
+        time.sleep(0.15)
+        assert "a" not in store
+        assert store.add("a")
+
+    def test_discard(self):
+        store = DedupStore(capacity=100)
+        store.add("a")
+        store.discard("a")
+        assert store.add("a")
+
+    def test_evicted_keys_are_found_in_sqlite(self, tmp_path):
+        path = tmp_path / "keys.db"
+        with DedupStore(capacity=100, max_entries=2, path=path) as store:
+            for key in "abcd":
+                store.add(key)
+            assert not store.add("a")
+
+        # The filters are rebuilt from the table on restart
+        with DedupStore(capacity=100, path=path) as reopened:
+            assert not reopened.add("d")
+            assert reopened.add("e")
+
+    def test_add_many_in_one_transaction(self, tmp_path):
+        path = tmp_path / "keys.db"
+        with DedupStore(capacity=100, path=path) as store:
+            store.add("a")
+            assert store.add_many(["a", "b", "c", "b"]) == [False, True, True, False]
+            store.discard_many(["a", "c"])
+
+        with DedupStore(capacity=100, path=path) as reopened:
+            assert reopened.add_many("abc") == [True, False, True]
+
+    def test_only_committed_keys_survive_restart(self, tmp_path):
+        path = tmp_path / "keys.db"
+        with DedupStore(capacity=100, path=path) as store:
+            assert store.reserve_many(["a", "b"]) == [True, True]
+            assert not store.add("a")
+            store.commit("b")
+
+        # "a" was never committed, as if the process died before queueing it
+        with DedupStore(capacity=100, path=path) as reopened:
+            assert reopened.add_many(["a", "b"]) == [True, False]
+
+    def test_forgets_evicted_keys_without_sqlite(self):
+        store = DedupStore(capacity=100, max_entries=2)
+        for key in "abc":
+            store.add(key)
+        assert store.add("a")
+
+
+class TestIdempotentWebhook:
+    def test_duplicate_deliveries_are_rejected_before_queueing(self, client, app_queue):
+        payload = {"event": "e", "data": {}}
+
+        first = client.post("/webhook", json=payload, headers={"Idempotency-Key": "1"})
+        retry = client.post("/webhook", json=payload, headers={"Idempotency-Key": "1"})
+        in_body = {**payload, "idempotency_key": "1"}
+        assert first.status_code == 200
+        assert retry.status_code == 409
+        assert client.post("/webhook", json=in_body).status_code == 409
+        assert client.post("/webhook", json=payload).status_code == 200
+        assert len(app_queue) == 2
+
+    def test_batch_rejects_duplicate_items(self, client, app_queue):
+        items = [{"event": "e", "data": {}, "idempotency_key": key} for key in "abab"]
+        response = client.post("/webhooks/batch", json=items)
+
+        assert response.status_code == 207
+        body = response.json()
+        assert (body["accepted"], body["rejected"]) == (2, 2)
+        assert body["results"][2]["errors"][0]["type"] == "duplicate"
+        assert len(app_queue) == 2
+
+    def test_ingest_dedups_across_chunks(self, queue, tmp_path):
+        keys = "abcadbe"
+        body = json.dumps(
+            [{"event": "e", "data": {}, "idempotency_key": key} for key in keys]
+        ).encode()
+
+        async def chunks():
+            yield body
+
+        with DedupStore(capacity=100, path=tmp_path / "keys.db") as store:
+            result = asyncio.run(ingest(chunks(), queue, chunk_size=2, dedup=store))
+
+        assert (result.accepted, result.rejected) == (5, 2)
+        errors = [i for i, r in enumerate(result.content()["results"]) if "errors" in r]
+        assert errors == [3, 5]
+        assert len(queue) == 5
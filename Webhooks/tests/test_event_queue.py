@@ -0,0 +1,99 @@
+import threading
+import time
+
+from app.event_queue import EventQueue
+from app.main import app
+from app.workers import ANY_EVENT, WorkerPool
+from fastapi.testclient import TestClient
+from models.payload import WebhookPayload
+
+
+def make_payload(i: int = 0, event: str = "order.created") -> WebhookPayload:
+    return WebhookPayload(event=event, data={"n": i})
+
+
+class TestEventQueue:
+    def test_claim_and_ack_in_order(self, queue):
+        ids = queue.put_many(make_payload(i) for i in range(5))
+        events = queue.claim(limit=3, lease=30)
+        assert [e.id for e in events] == ids[:3]
+        assert [e.payload.data["n"] for e in events] == [0, 1, 2]
+        # Claimed events are hidden from other consumers until acked or expired
+        assert [e.id for e in queue.claim(limit=10, lease=30)] == ids[3:]
+
+        queue.ack(ids)
+        assert len(queue) == 0
+
+    def test_events_survive_restart(self, tmp_path):
+        path = tmp_path / "events.db"
+        queue = EventQueue(path)
+        queue.put(make_payload(1))
+        queue.claim(limit=1, lease=0)  # claimed by a worker that then died
+        queue.close()
+
+        reopened = EventQueue(path)
+        [event] = reopened.claim(limit=1, lease=30)
+        assert event.payload == make_payload(1)
+        assert event.attempts == 2
+        reopened.close()
+
+    def test_claim_waits_for_new_events(self, queue):
+        threading.Timer(0.05, queue.put, args=(make_payload(),)).start()
+        start = time.monotonic()
+        events = queue.claim(limit=1, lease=30, timeout=2)
+        assert len(events) == 1
+        assert time.monotonic() - start < 1
+
+
+class TestWorkerPool:
+    def test_dispatches_by_event_and_buries_failures(self, queue):
+        handled = []
+        workers = WorkerPool(queue, workers=2, max_attempts=2, backoff=0)
+
+        @workers.on("order.created")
+        def created(payload):
+            handled.append(payload.data["n"])
+
+        @workers.on("order.broken")
+        def broken(payload):
+            raise RuntimeError("boom")
+
+        queue.put_many(make_payload(i) for i in range(10))
+        queue.put(make_payload(event="order.broken"))
+        queue.put(make_payload(event="order.unknown"))
+
+        workers.start()
+        deadline = time.monotonic() + 5
+        while (len(queue) or len(queue.dead()) < 2) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        workers.stop()
+
+        assert sorted(handled) == list(range(10))
+        dead = {event.payload.event: event.attempts for event in queue.dead()}
+        assert dead == {"order.broken": 2, "order.unknown": 1}
+
+    def test_fallback_handler(self, queue):
+        workers = WorkerPool(queue)
+        seen = []
+        workers.on(ANY_EVENT)(seen.append)
+        workers.process(queue.claim(limit=1, lease=30) or [])
+        queue.put(make_payload(event="anything"))
+        workers.process(queue.claim(limit=1, lease=30))
+        assert [payload.event for payload in seen] == ["anything"]
+        assert len(queue) == 0
+
+
+class TestWebhookEndpoint:
+    def test_acknowledges_and_processes_in_background(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("WEBHOOK_QUEUE_PATH", str(tmp_path / "events.db"))
+        received = threading.Event()
+
+        with TestClient(app) as client:
+            app.state.workers.on("ping")(lambda payload: received.set())
+            response = client.post("/webhook", json={"event": "ping", "data": {}})
+            assert response.status_code == 200
+            assert response.json()["data"] == "received request"
+            assert received.wait(5)
+
+            rejected = client.post("/webhook", json={"event": "ping"})
+            assert rejected.status_code == 422
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from app.main import app
+from client.sender import WebhookSender
+from models.payload import WebhookPayload
+
+URL = "http://receiver/webhooks/batch"
+
+
+def make_payload(i: int = 0) -> WebhookPayload:
+    return WebhookPayload(event="e", data={"n": i})
+
+
+def receiver(fail_first: int = 0) -> httpx.AsyncClient:
+    """
+    Client talking to the app in-process; the first `fail_first` requests get a
+    503 after the app has already queued their payloads
+    """
+    transport = httpx.ASGITransport(app=app)
+    requests = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = await transport.handle_async_request(request)
+        if len(requests) <= fail_first:
+            return httpx.Response(503)
+        return response
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    client.requests = requests
+    return client
+
+
+class TestWebhookSender:
+    def test_batches_payloads(self, app_queue):
+        async def run():
+            client = receiver()
+            async with WebhookSender(URL, batch_size=100, client=client) as sender:
+                for i in range(1000):
+                    await sender.send(make_payload(i))
+            await client.aclose()
+            return sender, client.requests
+
+        sender, requests = asyncio.run(run())
+
+        assert (sender.sent, sender.failed) == (1000, 0)
+        assert len(requests) <= 20
+        assert len(app_queue) == 1000
+        events = app_queue.claim(limit=1000, lease=30)
+        assert sorted(event.payload.data["n"] for event in events) == list(range(1000))
+
+    def test_retries_without_duplicating(self, app_queue):
+        async def run():
+            client = receiver(fail_first=2)
+            sender = WebhookSender(URL, concurrency=1, backoff=0.01, client=client)
+            for i in range(10):
+                await sender.send(make_payload(i))
+            await sender.close()
+            await client.aclose()
+            return sender, client.requests
+
+        sender, requests = asyncio.run(run())
+
+        assert (sender.sent, sender.failed) == (10, 0)
+        assert len(requests) == 3
+        # The failed attempts did reach the receiver; idempotency keys kept
+        # the retries from queueing the same payloads again
+        assert len(app_queue) == 10
+
+    def test_reports_rejected_payloads(self):
+        failures = []
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            lines = request.content.decode().splitlines()
+            results = [{"index": i, "id": i} for i in range(len(lines))]
+            results[1] = {"index": 1, "errors": [{"type": "missing"}]}
+            results[2] = {"index": 2, "errors": [{"type": "duplicate"}]}
+            return httpx.Response(207, json={"results": results})
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+            sender = WebhookSender(
+                URL,
+                client=client,
+                on_failure=lambda payloads, reason: failures.extend(payloads),
+            )
+            for i in range(3):
+                sender.send_nowait(make_payload(i))
+            await sender.close()
+            return sender
+
+        sender = asyncio.run(run())
+
+        assert (sender.sent, sender.failed) == (2, 1)
+        assert [payload.data["n"] for payload in failures] == [1]
+
+    def test_retries_items_a_400_did_not_reach(self):
+        bodies = []
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            lines = request.content.decode().splitlines()
+            bodies.append([json.loads(line)["data"]["n"] for line in lines])
+            if len(bodies) == 1:
+                # The receiver stopped reading after the first two items
+                errors = [{"type": "missing"}]
+                results = [{"index": 0, "id": 0}, {"index": 1, "errors": errors}]
+                return httpx.Response(400, json={"results": results})
+            results = [{"index": i, "id": i} for i in range(len(lines))]
+            return httpx.Response(200, json={"results": results})
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+            sender = WebhookSender(URL, backoff=0.001, client=client)
+            for i in range(4):
+                sender.send_nowait(make_payload(i))
+            await sender.close()
+            return sender
+
+        sender = asyncio.run(run())
+
+        assert bodies == [[0, 1, 2, 3], [2, 3]]
+        assert (sender.sent, sender.failed) == (3, 1)
+
+    def test_retry_after_is_capped(self):
+        sender = WebhookSender(URL, max_backoff=2.0, client=httpx.AsyncClient())
+        assert sender._delay(0, "3600") == 2.0
+        assert sender._delay(0, "1") == 1.0
+
+    def test_gives_up_after_max_retries(self):
+        async def handle(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+            async with WebhookSender(
+                URL, max_retries=2, backoff=0.001, client=client
+            ) as sender:
+                await sender.send(make_payload())
+            return sender
+
+        sender = asyncio.run(run())
+        assert (sender.sent, sender.failed) == (0, 1)
+
+    def test_backpressure(self):
+        async def run():
+            release = asyncio.Event()
+
+            async def handle(request: httpx.Request) -> httpx.Response:
+                await release.wait()
+                lines = request.content.decode().splitlines()
+                results = [{"index": i, "id": i} for i in range(len(lines))]
+                return httpx.Response(200, content=json.dumps({"results": results}))
+
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+            sender = WebhookSender(
+                URL, batch_size=1, max_pending=2, concurrency=1, client=client
+            )
+            sender.send_nowait(make_payload(0))
+            await asyncio.sleep(0.01)  # taken by the (stuck) dispatcher
+            sender.send_nowait(make_payload(1))
+            sender.send_nowait(make_payload(2))
+            with pytest.raises(asyncio.QueueFull):
+                sender.send_nowait(make_payload(3))
+
+            blocked = asyncio.ensure_future(sender.send(make_payload(3)))
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+
+            release.set()
+            await blocked
+            await sender.close()
+            return sender
+
+        sender = asyncio.run(run())
+        assert sender.sent == 4